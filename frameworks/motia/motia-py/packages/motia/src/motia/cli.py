@@ -6,14 +6,17 @@ import importlib.util
 import json
 import logging
 import os
+import socket
 import sys
 import threading
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from pathlib import Path
 from typing import Any
 
 from dotenv import load_dotenv
 
+from .prefork import DRAIN_TIMEOUT, LOAD_REPORT_INTERVAL, AutoscaleConfig, Supervisor, parse_autoscale
+
 log = logging.getLogger("motia.cli")
 
 
@@ -28,20 +31,94 @@ def load_module_from_path(path: str) -> Any | None:
     return None
 
 
-def load_and_register_step(path: str) -> None:
-    """Load a step module and register using Motia.add_step()."""
-    from .runtime import Motia
-
-    motia = Motia()
+def load_step(path: str) -> tuple[Any, Callable[..., Any]] | None:
+    """Load a step module and return its ``(config, handler)``, or ``None`` if it is not a step."""
     module = load_module_from_path(path)
     if module is None:
-        return
+        return None
 
     config = getattr(module, "config", None)
     handler = getattr(module, "handler", None)
 
     if callable(handler) and (isinstance(config, Mapping) or hasattr(config, "model_dump")):
-        motia.add_step(config, path, handler)
+        return config, handler
+    return None
+
+
+def load_and_register_step(path: str) -> None:
+    """Load a step module and register using Motia.add_step()."""
+    from .runtime import Motia
+
+    motia = Motia()
+    step = load_step(path)
+    if step is not None:
+        motia.add_step(step[0], path, step[1])
+
+
+def serve_worker(
+    steps: list[tuple[str, Any, Callable[..., Any]]],
+) -> Callable[[str, threading.Event, Callable[[int], None]], None]:
+    """Build the ``run_worker`` callback that runs preloaded steps in a forked worker."""
+
+    def run_worker(worker_name: str, stop: threading.Event, report_load: Callable[[int], None]) -> None:
+        from .iii import get_instance, reset_after_fork
+        from .runtime import Motia
+
+        reset_after_fork(worker_name)
+        motia = Motia()
+        for path, config, handler in steps:
+            motia.add_step(config, path, handler)
+
+        iii = get_instance()
+        iii._wait_until_connected()
+        log.info("Worker %s connected. Waiting for events...", worker_name)
+        try:
+            while not stop.wait(LOAD_REPORT_INTERVAL):
+                report_load(iii.get_runtime_stats()["invocations"]["in_flight"])
+            # Stopped by SIGTERM (shutdown or scale-down): let running invocations finish first.
+            if not iii.drain(DRAIN_TIMEOUT):
+                log.warning("Worker %s stopped with invocations still running", worker_name)
+        finally:
+            iii.shutdown()
+
+    return run_worker
+
+
+def run_prefork(
+    step_files: list[str],
+    workers: int,
+    autoscale: tuple[int, int] | None = None,
+    target_in_flight: int = 16,
+) -> None:
+    """Load steps once, then run them in forked worker processes until stopped."""
+    from .iii import defer_otel_until_fork, shutdown_instance
+
+    # Workers set up OpenTelemetry after fork; the supervisor must leave it uninitialised.
+    defer_otel_until_fork()
+
+    steps: list[tuple[str, Any, Callable[..., Any]]] = []
+    for step_file in step_files:
+        log.debug("Loading step: %s", step_file)
+        step = load_step(step_file)
+        if step is not None:
+            steps.append((step_file, *step))
+
+    # Step modules may have created a client at import time; children must not inherit its connection.
+    shutdown_instance()
+
+    scaling = None
+    if autoscale is not None:
+        scaling = AutoscaleConfig(min_workers=autoscale[0], max_workers=autoscale[1], target_in_flight=target_in_flight)
+    supervisor = Supervisor(
+        serve_worker(steps),
+        workers=workers,
+        autoscale=scaling,
+        name_prefix=f"{socket.gethostname()}:{os.getpid()}",
+    )
+    log.info(
+        "All steps loaded. Starting %s worker processes...", f"{autoscale[0]}-{autoscale[1]}" if autoscale else workers
+    )
+    supervisor.run()
 
 
 def _discover_files(directories: list[str], pattern: str) -> list[str]:
@@ -201,6 +278,26 @@ def main() -> None:
         default="types.json",
         help="Output file for typegen",
     )
+    parser.add_argument(
+        "--workers",
+        "-n",
+        type=int,
+        default=1,
+        help="Number of worker processes for run (forked after step discovery)",
+    )
+    parser.add_argument(
+        "--autoscale",
+        metavar="MIN:MAX",
+        type=parse_autoscale,
+        default=None,
+        help="Scale run worker processes between MIN and MAX based on in-flight invocations",
+    )
+    parser.add_argument(
+        "--target-in-flight",
+        type=int,
+        default=16,
+        help="Average in-flight invocations per worker that --autoscale aims for",
+    )
 
     args = parser.parse_args()
     configure_logging(args.verbose)
@@ -215,6 +312,10 @@ def main() -> None:
             log.debug("Loading stream: %s", stream_file)
             load_module_from_path(stream_file)
 
+        if args.workers > 1 or args.autoscale:
+            run_prefork(step_files, args.workers, args.autoscale, args.target_in_flight)
+            return
+
         for step_file in step_files:
             log.debug("Loading step: %s", step_file)
             load_and_register_step(step_file)
@@ -14,6 +14,8 @@ from iii.iii_constants import InitOptions, TelemetryOptions
 
 _engine_ws_url = os.environ.get("III_URL", "ws://localhost:49134")
 _instance: IIIClient | None = None
+_worker_name: str | None = None
+_otel_deferred = False
 
 
 def _read_project_name() -> str | None:
@@ -43,7 +45,12 @@ def _create_iii(otel_config: dict[str, Any] | None = None) -> IIIClient:
         framework="motia",
         project_name=_read_project_name(),
     )
-    return register_worker(_engine_ws_url, InitOptions(telemetry=telemetry, otel=otel_config))
+    if _otel_deferred:
+        otel_config = {**(otel_config or {}), "enabled": False}
+    return register_worker(
+        _engine_ws_url,
+        InitOptions(worker_name=_worker_name, telemetry=telemetry, otel=otel_config),
+    )
 
 
 def get_instance() -> IIIClient:
@@ -69,3 +76,45 @@ def init_iii(otel_config: dict[str, Any] | None = None) -> IIIClient:
     global _instance
     _instance = _create_iii(otel_config)
     return _instance
+
+
+def shutdown_instance() -> None:
+    """Shut down and forget the singleton client, if one was created."""
+    global _instance
+    if _instance is not None:
+        _instance.shutdown()
+        _instance = None
+
+
+def defer_otel_until_fork() -> None:
+    """Create clients in this process without OpenTelemetry until ``reset_after_fork()``.
+
+    OpenTelemetry global providers can be set only once per process, so a
+    prefork supervisor keeps OTel uninitialised and each forked worker
+    initialises it with its own client.
+    """
+    global _otel_deferred
+    _otel_deferred = True
+
+
+def reset_after_fork(worker_name: str | None = None) -> None:
+    """Forget the client inherited from the parent in a forked child process.
+
+    The parent's event loop thread and engine connection do not survive
+    ``os.fork()``, so the inherited instance is dropped (not shut down) along
+    with OpenTelemetry state.  The next ``get_instance()`` creates a fresh
+    client with its own connection and OpenTelemetry providers.
+
+    Args:
+        worker_name: Worker name reported to the engine by the new client.
+    """
+    global _instance, _worker_name, _otel_deferred
+    from iii.telemetry import reset_after_fork as reset_otel_after_fork
+
+    from .tracing import reset_instrumented_bridges
+
+    _instance = None
+    _worker_name = worker_name
+    _otel_deferred = False
+    reset_otel_after_fork()
+    reset_instrumented_bridges()
@@ -0,0 +1,267 @@
+"""Prefork supervisor running a Motia app in several worker processes."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, NoReturn
+
+log = logging.getLogger("motia.prefork")
+
+#: ``run_worker(worker_name, stop_event, report_load)`` runs one worker in a
+#: forked child until ``stop_event`` is set, calling ``report_load`` with its
+#: current number of in-flight invocations.  Once stopped it should finish
+#: in-flight invocations within ``DRAIN_TIMEOUT`` seconds before returning.
+RunWorker = Callable[[str, threading.Event, Callable[[int], None]], None]
+
+LOAD_REPORT_INTERVAL = 1.0
+
+#: Seconds a stopping worker waits for in-flight invocations; shorter than the
+#: supervisor's default ``shutdown_timeout`` so workers exit before being killed.
+DRAIN_TIMEOUT = 8.0
+
+_LOAD_RECORD = struct.Struct("!I")
+_POLL_INTERVAL = 0.2
+_MAX_RESTART_DELAY = 30.0
+_CRASH_WINDOW = 5.0
+
+
+@dataclass
+class AutoscaleConfig:
+    """Bounds and thresholds for scaling the number of worker processes.
+
+    Attributes:
+        min_workers: Workers kept running at all times.
+        max_workers: Upper bound on worker processes.
+        target_in_flight: Average in-flight invocations per worker to aim for.
+            The supervisor adds a worker above it and removes one when the
+            average stays below half of it.
+        scale_down_delay: Seconds the load must stay low before a worker is stopped.
+    """
+
+    min_workers: int
+    max_workers: int
+    target_in_flight: int = 16
+    scale_down_delay: float = 30.0
+
+
+def parse_autoscale(value: str) -> tuple[int, int]:
+    """Parse a ``MIN:MAX`` worker range for ``--autoscale``."""
+    try:
+        low, high = (int(part) for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected MIN:MAX, got '{value}'") from None
+    if low < 1 or high < low:
+        raise argparse.ArgumentTypeError(f"expected 1 <= MIN <= MAX, got '{value}'")
+    return low, high
+
+
+class _Child:
+    __slots__ = ("pid", "index", "read_fd", "buffer", "in_flight", "started_at", "retiring")
+
+    def __init__(self, pid: int, index: int, read_fd: int) -> None:
+        self.pid = pid
+        self.index = index
+        self.read_fd = read_fd
+        self.buffer = b""
+        self.in_flight = 0
+        self.started_at = time.monotonic()
+        self.retiring = False
+
+
+class Supervisor:
+    """Forks worker processes, restarts crashed ones and optionally autoscales.
+
+    Everything done in the parent before ``run()`` (importing step modules,
+    validating configs) is shared copy-on-write by the children.  The parent
+    must not hold an engine connection or other threads when it forks; each
+    child creates its own client inside ``run_worker``.
+    """
+
+    def __init__(
+        self,
+        run_worker: RunWorker,
+        workers: int = 1,
+        autoscale: AutoscaleConfig | None = None,
+        name_prefix: str = "motia",
+        shutdown_timeout: float = 10.0,
+    ) -> None:
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Multi-process workers require os.fork(), which is unavailable on this platform")
+        self._run_worker = run_worker
+        self._autoscale = autoscale
+        self._desired = autoscale.min_workers if autoscale else workers
+        self._name_prefix = name_prefix
+        self._shutdown_timeout = shutdown_timeout
+        self._children: dict[int, _Child] = {}
+        self._stopping = False
+        self._restart_delay = 0.0
+        self._next_spawn_at = 0.0
+        self._low_load_since: float | None = None
+        self._last_scale_up = 0.0
+
+    @property
+    def worker_count(self) -> int:
+        return sum(1 for child in self._children.values() if not child.retiring)
+
+    def stop(self) -> None:
+        """Ask the supervisor loop to stop all workers and return."""
+        self._stopping = True
+
+    def run(self) -> None:
+        """Run until SIGINT/SIGTERM (or ``stop()``), then stop the workers."""
+        previous = {sig: signal.signal(sig, lambda *_: self.stop()) for sig in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            while not self._stopping:
+                self._poll()
+                time.sleep(_POLL_INTERVAL)
+        finally:
+            self._shutdown()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def _poll(self) -> None:
+        self._read_load()
+        self._reap()
+        if self._autoscale is not None:
+            self._scale(self._autoscale)
+        now = time.monotonic()
+        while not self._stopping and self.worker_count < self._desired and now >= self._next_spawn_at:
+            self._spawn()
+
+    def _free_index(self) -> int:
+        used = {child.index for child in self._children.values() if not child.retiring}
+        index = 0
+        while index in used:
+            index += 1
+        return index
+
+    def _spawn(self) -> None:
+        index = self._free_index()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            for child in self._children.values():
+                os.close(child.read_fd)
+            self._child_main(f"{self._name_prefix}-{index}", write_fd)
+        os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        self._children[pid] = _Child(pid, index, read_fd)
+        log.info("Started worker %d (pid %d)", index, pid)
+
+    def _child_main(self, worker_name: str, write_fd: int) -> NoReturn:
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+        def report_load(in_flight: int) -> None:
+            try:
+                os.write(write_fd, _LOAD_RECORD.pack(max(0, min(in_flight, 0xFFFFFFFF))))
+            except OSError:
+                stop.set()
+
+        code = 0
+        try:
+            self._run_worker(worker_name, stop, report_load)
+        except BaseException:
+            log.exception("Worker %s failed", worker_name)
+            code = 1
+        finally:
+            logging.shutdown()
+            os._exit(code)
+
+    def _read_load(self) -> None:
+        for child in self._children.values():
+            try:
+                data = os.read(child.read_fd, 4096)
+            except OSError:  # includes BlockingIOError when nothing was reported
+                continue
+            buffer = child.buffer + data
+            whole = len(buffer) - len(buffer) % _LOAD_RECORD.size
+            if whole:
+                (child.in_flight,) = _LOAD_RECORD.unpack_from(buffer, whole - _LOAD_RECORD.size)
+            child.buffer = buffer[whole:]
+
+    def _reap(self) -> None:
+        for pid, child in list(self._children.items()):
+            try:
+                done, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done, status = pid, 0
+            if done == 0:
+                continue
+            del self._children[pid]
+            os.close(child.read_fd)
+            if child.retiring or self._stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            log.warning("Worker %d (pid %d) exited with code %d, restarting", child.index, pid, code)
+            if time.monotonic() - child.started_at < _CRASH_WINDOW:
+                self._restart_delay = min(max(self._restart_delay * 2, 1.0), _MAX_RESTART_DELAY)
+            else:
+                self._restart_delay = 0.0
+            self._next_spawn_at = time.monotonic() + self._restart_delay
+
+    def _scale(self, config: AutoscaleConfig) -> None:
+        active = [child for child in self._children.values() if not child.retiring]
+        if not active:
+            return
+        now = time.monotonic()
+        average = sum(child.in_flight for child in active) / len(active)
+        if average > config.target_in_flight and self._desired < config.max_workers:
+            if now - self._last_scale_up >= LOAD_REPORT_INTERVAL:
+                self._desired += 1
+                self._last_scale_up = now
+                log.info("Load %.1f per worker, scaling up to %d workers", average, self._desired)
+            self._low_load_since = None
+        elif average < config.target_in_flight / 2 and self._desired > config.min_workers:
+            if self._low_load_since is None:
+                self._low_load_since = now
+            elif now - self._low_load_since >= config.scale_down_delay:
+                self._desired -= 1
+                self._low_load_since = None
+                newest = max(active, key=lambda child: child.index)
+                newest.retiring = True
+                os.kill(newest.pid, signal.SIGTERM)
+                log.info("Load %.1f per worker, scaling down to %d workers", average, self._desired)
+        else:
+            self._low_load_since = None
+
+    def _shutdown(self) -> None:
+        self._stopping = True
+        for child in self._children.values():
+            self._signal(child.pid, signal.SIGTERM)
+        deadline = time.monotonic() + self._shutdown_timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for child in list(self._children.values()):
+            log.warning("Worker %d (pid %d) did not stop in time, killing it", child.index, child.pid)
+            self._signal(child.pid, signal.SIGKILL)
+            try:
+                os.waitpid(child.pid, 0)
+            except ChildProcessError:
+                pass
+            os.close(child.read_fd)
+        self._children.clear()
+
+    @staticmethod
+    def _signal(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.worker_count,
+            "desired": self._desired,
+            "in_flight": {child.index: child.in_flight for child in self._children.values()},
+        }
@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from dataclasses import dataclass
 from typing import Any, Callable, Coroutine
 
+from iii.codec import Codec, resolve_codec
+
 log = logging.getLogger("motia.stream_client")
 
 
@@ -160,10 +161,18 @@ class StreamGroupSubscription(StreamSubscription):
 
 
 class StreamClient:
-    """Client for subscribing to Motia stream updates."""
+    """Client for subscribing to Motia stream updates.
+
+    Args:
+        url: WebSocket URL of the stream server.
+        reconnect_delay: Seconds to wait between reconnection attempts.
+        codec: Wire codec (``"json"``, ``"orjson"``, ``"msgspec"``, ``"auto"`` or a
+            ``Codec`` instance). Defaults to stdlib ``json``.
+    """
 
-    def __init__(self, url: str, reconnect_delay: float = 2.0) -> None:
+    def __init__(self, url: str, reconnect_delay: float = 2.0, codec: Codec | str | None = None) -> None:
         self.url = url
+        self._codec = resolve_codec(codec)
         self._ws: Any = None
         self._receive_task: asyncio.Task[None] | None = None
         self._listeners: dict[str, set[StreamSubscription]] = {}
@@ -216,13 +225,13 @@ class StreamClient:
     async def _send(self, message: dict[str, Any]) -> None:
         if not self._ws:
             raise RuntimeError("Not connected. Call connect() first.")
-        await self._ws.send(json.dumps(message))
+        await self._ws.send(self._codec.encode(message))
 
     async def _receive(self) -> dict[str, Any]:
         if not self._ws:
             raise RuntimeError("Not connected. Call connect() first.")
         data = await self._ws.recv()
-        result: dict[str, Any] = json.loads(data)
+        result: dict[str, Any] = self._codec.decode(data)
         return result
 
     async def _receive_loop(self) -> None:
@@ -7,11 +7,13 @@ and emit calls. When not installed, all functions are no-ops.
 """
 
 import contextvars
-import json
 import logging
 from contextlib import contextmanager
 from typing import Any, Generator
 
+from iii import MessageInterceptor
+from iii.wire import is_sampled_out
+
 log = logging.getLogger("motia.tracing")
 
 try:
@@ -77,16 +79,18 @@ def step_span(
     trigger_type: str,
     **attributes: Any,
 ) -> Generator[Any, None, None]:
-    """Create a SERVER span for step execution using incoming traceparent."""
+    """Create a SERVER span for step execution using incoming traceparent.
+
+    Yields ``None`` without creating a span when the incoming trace is
+    sampled out; the SDK already runs the step under that unsampled parent.
+    """
     tracer = get_tracer()
-    if not tracer:
+    traceparent = _incoming_traceparent.get()
+    if not tracer or is_sampled_out(traceparent):
         yield None
         return
 
-    parent_ctx = extract_parent_context(
-        _incoming_traceparent.get(),
-        _incoming_baggage.get(),
-    )
+    parent_ctx = extract_parent_context(traceparent, _incoming_baggage.get())
 
     with tracer.start_as_current_span(
         f"step:{step_name}",
@@ -133,12 +137,37 @@ def set_span_ok(span: Any) -> None:
         span.set_status(StatusCode.OK)
 
 
-def instrument_bridge(bridge_instance: Any) -> None:
-    """Monkey-patch the III bridge to propagate W3C trace context.
+def reset_instrumented_bridges() -> None:
+    """Forget which bridge instances were instrumented (e.g. after ``os.fork()``)."""
+    _instrumented_bridges.clear()
+
+
+class TraceContextInterceptor(MessageInterceptor):  # type: ignore[misc]
+    """Carries W3C trace context across the III bridge.
 
-    Patches:
-    - _to_dict: Injects traceparent/baggage into outgoing invokefunction messages
-    - _handle_message: Extracts traceparent/baggage from incoming invokefunction messages
+    Outgoing ``invokefunction`` messages get the current ``traceparent`` and
+    ``baggage`` unless the SDK already set them; incoming ones have theirs
+    stored for ``step_span``.  Both work on messages the client has already
+    built or decoded.
+    """
+
+    def on_send(self, message: dict[str, Any]) -> None:
+        if message.get("type") != "invokefunction" or "traceparent" in message:
+            return
+        headers = inject_context()
+        if "traceparent" in headers:
+            message["traceparent"] = headers["traceparent"]
+        if "baggage" in headers:
+            message.setdefault("baggage", headers["baggage"])
+
+    def on_receive(self, message: dict[str, Any]) -> None:
+        if message.get("type") == "invokefunction":
+            _incoming_traceparent.set(message.get("traceparent"))
+            _incoming_baggage.set(message.get("baggage"))
+
+
+def instrument_bridge(bridge_instance: Any) -> None:
+    """Install a ``TraceContextInterceptor`` on the III bridge to propagate W3C trace context.
 
     Safe to call multiple times - only instruments each bridge instance once.
     """
@@ -150,30 +179,5 @@ def instrument_bridge(bridge_instance: Any) -> None:
         return
     _instrumented_bridges.add(bridge_id)
 
-    original_to_dict = bridge_instance._to_dict
-    original_handle_message = bridge_instance._handle_message
-
-    def patched_to_dict(msg: Any) -> dict[str, Any]:
-        data: dict[str, Any] = original_to_dict(msg)
-        msg_type = data.get("type")
-        if msg_type is not None and hasattr(msg_type, "value"):
-            msg_type = msg_type.value
-        if msg_type == "invokefunction":
-            headers = inject_context()
-            if "traceparent" in headers:
-                data["traceparent"] = headers["traceparent"]
-            if "baggage" in headers:
-                data["baggage"] = headers["baggage"]
-        return data
-
-    async def patched_handle_message(raw: str | bytes) -> None:
-        data = json.loads(raw if isinstance(raw, str) else raw.decode())
-        msg_type = data.get("type")
-        if msg_type == "invokefunction":
-            _incoming_traceparent.set(data.get("traceparent"))
-            _incoming_baggage.set(data.get("baggage"))
-        await original_handle_message(raw)
-
-    bridge_instance._to_dict = patched_to_dict
-    bridge_instance._handle_message = patched_handle_message
+    bridge_instance.add_interceptor(TraceContextInterceptor())
     log.info("Bridge instrumented for OpenTelemetry trace context propagation")
@@ -8,7 +8,6 @@ These tests require a running III engine instance. Start the engine manually:
 Or set III_ENGINE_PATH and use the run_integration_tests.sh script.
 """
 
-import json
 import time
 from typing import Generator
 
@@ -23,8 +22,8 @@ TEST_API_URL = f"http://localhost:{TEST_API_PORT}"
 
 def flush_bridge_queue(bridge) -> None:
     """Flush the bridge queue."""
-    while bridge._queue and bridge._ws:
-        bridge._schedule_on_loop(bridge._ws.send(json.dumps(bridge._queue.pop(0))))
+    if bridge._ws:
+        bridge._run_on_loop(bridge._replay_backlog())
     time.sleep(0.05)
 
 
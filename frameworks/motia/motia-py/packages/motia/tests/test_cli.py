@@ -1,5 +1,6 @@
 import json
 import sys
+import threading
 from pathlib import Path
 from types import ModuleType, SimpleNamespace
 from unittest.mock import MagicMock
@@ -223,3 +224,88 @@ def test_main_dev_without_watchfiles_logs_warning_and_handles_keyboard_interrupt
     assert warnings == ["watchfiles not available; running without watch mode"]
     assert loaded_streams == ["streams/demo_stream.py"]
     assert loaded_steps == ["steps/demo_step.py"]
+
+
+def test_main_run_with_workers_uses_prefork_supervisor(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[object, ...]] = []
+
+    monkeypatch.setattr(cli, "discover_steps", lambda directory, include_src=True: ["steps/demo_step.py"])
+    monkeypatch.setattr(cli, "discover_streams", lambda directory, include_src=True: [])
+    monkeypatch.setattr(cli, "run_prefork", lambda *args: calls.append(args))
+    monkeypatch.setattr(cli, "load_and_register_step", MagicMock(side_effect=AssertionError("loaded in parent")))
+    monkeypatch.setattr(sys, "argv", ["motia", "run", "--autoscale", "2:6", "--target-in-flight", "8"])
+
+    cli.main()
+
+    assert calls == [(["steps/demo_step.py"], 1, (2, 6), 8)]
+
+
+def test_serve_worker_registers_preloaded_steps_with_fresh_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    added: list[tuple[object, ...]] = []
+    reset: list[str] = []
+    client = SimpleNamespace(
+        _wait_until_connected=MagicMock(),
+        drain=MagicMock(return_value=True),
+        shutdown=MagicMock(),
+        get_runtime_stats=lambda: {"invocations": {"in_flight": 5}},
+    )
+    monkeypatch.setattr("motia.iii.reset_after_fork", reset.append)
+    monkeypatch.setattr("motia.iii.get_instance", lambda: client)
+    monkeypatch.setattr("motia.runtime.Motia", lambda: SimpleNamespace(add_step=lambda *args: added.append(args)))
+    monkeypatch.setattr(cli, "LOAD_REPORT_INTERVAL", 0.01)
+
+    stop = threading.Event()
+    loads: list[int] = []
+
+    def report(in_flight: int) -> None:
+        loads.append(in_flight)
+        stop.set()
+
+    run_worker = cli.serve_worker([("steps/demo_step.py", {"name": "demo"}, len)])
+    run_worker("host:1-0", stop, report)
+
+    assert reset == ["host:1-0"]
+    assert added == [({"name": "demo"}, "steps/demo_step.py", len)]
+    assert loads == [5]
+    client.drain.assert_called_once_with(cli.DRAIN_TIMEOUT)
+    client.shutdown.assert_called_once()
+
+
+def test_serve_worker_drains_before_shutdown_when_stopped(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    calls: list[object] = []
+    client = SimpleNamespace(
+        _wait_until_connected=lambda: None,
+        drain=lambda timeout: calls.append(("drain", timeout)) or False,
+        shutdown=lambda: calls.append("shutdown"),
+        get_runtime_stats=lambda: {"invocations": {"in_flight": 1}},
+    )
+    monkeypatch.setattr("motia.iii.reset_after_fork", lambda name: None)
+    monkeypatch.setattr("motia.iii.get_instance", lambda: client)
+    monkeypatch.setattr("motia.runtime.Motia", lambda: SimpleNamespace(add_step=lambda *args: None))
+
+    stop = threading.Event()
+    stop.set()
+    cli.serve_worker([])("host:1-0", stop, lambda in_flight: None)
+
+    assert calls == [("drain", cli.DRAIN_TIMEOUT), "shutdown"]
+    assert "stopped with invocations still running" in caplog.text
+
+
+def test_prefork_parent_leaves_otel_uninitialised_until_fork(monkeypatch: pytest.MonkeyPatch) -> None:
+    import motia.iii as motia_iii
+
+    created: list[object] = []
+    monkeypatch.setattr(motia_iii, "_instance", None)
+    monkeypatch.setattr(motia_iii, "_otel_deferred", False)
+    monkeypatch.setattr(motia_iii, "register_worker", lambda url, options: created.append(options.otel) or MagicMock())
+    monkeypatch.setattr("iii.telemetry.reset_after_fork", lambda: None)
+    monkeypatch.setattr(cli, "load_step", lambda path: motia_iii.get_instance() and None)
+    monkeypatch.setattr(cli, "Supervisor", lambda *args, **kwargs: SimpleNamespace(run=lambda: None))
+
+    cli.run_prefork(["steps/demo_step.py"], workers=2)
+    motia_iii.reset_after_fork("host:1-0")
+    motia_iii.get_instance()
+
+    assert created == [{"enabled": False}, None]
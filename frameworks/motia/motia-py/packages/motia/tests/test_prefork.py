@@ -0,0 +1,86 @@
+"""Tests for the prefork worker supervisor."""
+
+import argparse
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from motia import prefork
+from motia.prefork import AutoscaleConfig, Supervisor, parse_autoscale
+
+
+def test_parse_autoscale_accepts_ranges_and_rejects_garbage() -> None:
+    assert parse_autoscale("2:8") == (2, 8)
+    assert parse_autoscale("3:3") == (3, 3)
+
+    for value in ("8", "a:b", "0:4", "5:2", "1:2:3"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_autoscale(value)
+
+
+def test_supervisor_forks_named_workers_and_restarts_crashed_ones(tmp_path: Path) -> None:
+    starts = tmp_path / "starts.log"
+    crashed = tmp_path / "crashed"
+
+    def run_worker(worker_name: str, stop: threading.Event, report_load: Callable[[int], None]) -> None:
+        with open(starts, "a") as f:
+            f.write(f"{worker_name} {os.getpid()}\n")
+        if worker_name.endswith("-0") and not crashed.exists():
+            crashed.touch()
+            raise RuntimeError("boom")
+        report_load(3)
+        stop.wait(10)
+
+    supervisor = Supervisor(run_worker, workers=2, name_prefix="test", shutdown_timeout=5)
+    timer = threading.Timer(2.5, supervisor.stop)
+    timer.start()
+    try:
+        supervisor.run()
+    finally:
+        timer.cancel()
+
+    lines = starts.read_text().splitlines()
+    names = [line.split()[0] for line in lines]
+    pids = {int(line.split()[1]) for line in lines}
+    assert names.count("test-0") == 2
+    assert names.count("test-1") == 1
+    assert os.getpid() not in pids
+    assert supervisor.worker_count == 0
+
+
+def _add_child(supervisor: Supervisor, pid: int, index: int, in_flight: int) -> None:
+    child = prefork._Child(pid, index, read_fd=-1)
+    child.in_flight = in_flight
+    supervisor._children[pid] = child
+
+
+def test_autoscale_adds_workers_under_load_and_retires_when_idle(monkeypatch: pytest.MonkeyPatch) -> None:
+    killed: list[int] = []
+    monkeypatch.setattr(prefork.os, "kill", lambda pid, sig: killed.append(pid))
+    config = AutoscaleConfig(min_workers=1, max_workers=3, target_in_flight=4, scale_down_delay=0)
+    supervisor = Supervisor(lambda *args: None, autoscale=config)
+
+    _add_child(supervisor, 100, 0, in_flight=10)
+    supervisor._scale(config)
+    assert supervisor._desired == 2
+
+    _add_child(supervisor, 101, 1, in_flight=9)
+    supervisor._last_scale_up = 0.0
+    supervisor._scale(config)
+    assert supervisor._desired == 3
+
+    supervisor._last_scale_up = 0.0
+    _add_child(supervisor, 102, 2, in_flight=20)
+    supervisor._scale(config)
+    assert supervisor._desired == 3  # capped at max_workers
+
+    for child in supervisor._children.values():
+        child.in_flight = 0
+    supervisor._scale(config)  # starts the low-load timer
+    supervisor._scale(config)
+    assert supervisor._desired == 2
+    assert killed == [102]
+    assert supervisor.worker_count == 2
@@ -141,6 +141,28 @@ async def test_stream_client_connect_send_receive_disconnect_and_rejoin(monkeypa
     assert received == {"hello": "world"}
 
 
+@pytest.mark.asyncio
+async def test_stream_client_uses_configured_codec(monkeypatch: pytest.MonkeyPatch) -> None:
+    ws = FakeWebSocket([b'{"hello":"world"}'])
+    client = StreamClient("ws://localhost:1234", codec="orjson")
+    client._rejoin_all = AsyncMock()
+
+    def fake_create_task(coro: Any) -> FakeTask:
+        coro.close()
+        return FakeTask()
+
+    monkeypatch.setattr(asyncio, "create_task", fake_create_task)
+    monkeypatch.setitem(sys.modules, "websockets", SimpleNamespace(connect=AsyncMock(return_value=ws)))
+
+    await client.connect()
+    await client._send({"type": "join"})
+    received = await client._receive()
+
+    assert isinstance(ws.sent[0], bytes)
+    assert json.loads(ws.sent[0]) == {"type": "join"}
+    assert received == {"hello": "world"}
+
+
 @pytest.mark.asyncio
 async def test_stream_client_connect_requires_websockets(monkeypatch: pytest.MonkeyPatch) -> None:
     client = StreamClient("ws://localhost:1234")
@@ -1,18 +1,15 @@
 """Tests for motia.tracing – core utilities and bridge instrumentation."""
 
-import json
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
 
 import pytest
+from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
-from opentelemetry import trace
 
 from motia.tracing import (
     HAS_OTEL,
-    _incoming_baggage,
     _incoming_traceparent,
     _instrumented_bridges,
     extract_parent_context,
@@ -52,10 +49,9 @@ def _reset_bridge_set():
 
 
 def _make_mock_bridge():
-    """Create a mock bridge with _to_dict and _handle_message."""
-    bridge = SimpleNamespace()
-    bridge._to_dict = lambda msg: dict(msg) if isinstance(msg, dict) else {"data": msg}
-    bridge._handle_message = AsyncMock()
+    """Create a mock bridge that records installed interceptors."""
+    bridge = SimpleNamespace(interceptors=[])
+    bridge.add_interceptor = bridge.interceptors.append
     return bridge
 
 
@@ -123,6 +119,18 @@ def test_step_span_creates_span(otel_exporter):
     assert s.attributes["custom"] == "val"
 
 
+def test_step_span_skips_sampled_out_traces(otel_exporter):
+    """step_span should not create a span under a sampled-out incoming trace."""
+    token = _incoming_traceparent.set("00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-00")
+    try:
+        with step_span("my-step", "event") as span:
+            assert span is None
+    finally:
+        _incoming_traceparent.reset(token)
+
+    assert otel_exporter.get_finished_spans() == ()
+
+
 def test_operation_span_creates_child_span(otel_exporter):
     """operation_span inside a step_span should create a CLIENT child span."""
     with step_span("parent-step", "event") as parent:
@@ -143,50 +151,63 @@ def test_operation_span_creates_child_span(otel_exporter):
 # -- Bridge instrumentation tests --
 
 
-def test_instrument_bridge_patches_to_dict(otel_exporter):
+def test_instrument_bridge_injects_into_outgoing_invocations(otel_exporter):
     """instrument_bridge should inject traceparent into invokefunction messages."""
     bridge = _make_mock_bridge()
     instrument_bridge(bridge)
+    (interceptor,) = bridge.interceptors
 
     tracer = get_tracer()
+    message = {"type": "invokefunction", "data": "hello"}
     with tracer.start_as_current_span("test-inject"):
-        result = bridge._to_dict({"type": "invokefunction", "data": "hello"})
+        interceptor.on_send(message)
+
+    assert message["traceparent"].startswith("00-")
+
+
+def test_instrument_bridge_keeps_traceparent_set_by_the_sdk(otel_exporter):
+    """Messages the SDK already stamped are not injected a second time."""
+    bridge = _make_mock_bridge()
+    instrument_bridge(bridge)
+    (interceptor,) = bridge.interceptors
+    tp = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+    message = {"type": "invokefunction", "data": "hello", "traceparent": tp}
+    with get_tracer().start_as_current_span("test-keep"):
+        interceptor.on_send(message)
 
-    assert "traceparent" in result
-    assert result["traceparent"].startswith("00-")
+    assert message["traceparent"] == tp
 
 
 def test_instrument_bridge_does_not_inject_for_other_messages(otel_exporter):
     """instrument_bridge should NOT inject traceparent for non-invokefunction messages."""
     bridge = _make_mock_bridge()
     instrument_bridge(bridge)
+    (interceptor,) = bridge.interceptors
 
-    tracer = get_tracer()
-    with tracer.start_as_current_span("test-no-inject"):
-        result = bridge._to_dict({"type": "registerfunction", "data": "hello"})
+    message = {"type": "registerfunction", "data": "hello"}
+    with get_tracer().start_as_current_span("test-no-inject"):
+        interceptor.on_send(message)
 
-    assert "traceparent" not in result
+    assert "traceparent" not in message
 
 
-@pytest.mark.asyncio
-async def test_instrument_bridge_extracts_traceparent(otel_exporter):
+def test_instrument_bridge_extracts_traceparent(otel_exporter):
     """instrument_bridge should extract traceparent from incoming invokefunction messages."""
     bridge = _make_mock_bridge()
     instrument_bridge(bridge)
+    (interceptor,) = bridge.interceptors
 
     tp = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
-    msg = json.dumps({"type": "invokefunction", "traceparent": tp, "function_id": "f1"})
-
-    await bridge._handle_message(msg)
+    interceptor.on_receive({"type": "invokefunction", "traceparent": tp, "function_id": "f1"})
 
     assert _incoming_traceparent.get() == tp
 
 
 def test_instrument_bridge_idempotent():
-    """Calling instrument_bridge twice on the same instance should only patch once."""
+    """Calling instrument_bridge twice on the same instance should only install one interceptor."""
     bridge = _make_mock_bridge()
     instrument_bridge(bridge)
-    first_to_dict = bridge._to_dict
-
     instrument_bridge(bridge)
-    assert bridge._to_dict is first_to_dict
+
+    assert len(bridge.interceptors) == 1
@@ -0,0 +1,84 @@
+"""Per-call overhead of building and encoding invocation messages.
+
+Compares the pydantic path the client used to take for every ``trigger()``
+and every invocation result (model construction, ``uuid4`` ids, two
+propagator passes, ``model_dump``) with the plain-dict builders in
+``iii.wire``.  No engine is needed::
+
+    python benches/hot_path_bench.py [--iterations N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import uuid
+from typing import Any, Callable
+
+from iii.codec import JsonCodec
+from iii.iii_types import InvocationResultMessage, InvokeFunctionMessage, TriggerActionEnqueue
+from iii.wire import InvocationIdGenerator, inject_trace_context, invocation_result_message, invoke_function_message
+
+PAYLOAD = {"user_id": 42, "items": [{"sku": "a-1", "qty": 2}, {"sku": "b-7", "qty": 1}], "note": None}
+codec = JsonCodec()
+next_id = InvocationIdGenerator()
+
+
+def _dump(model: Any) -> dict[str, Any]:
+    data: dict[str, Any] = model.model_dump(by_alias=True, exclude_none=True)
+    data["type"] = data["type"].value
+    return data
+
+
+def trigger_pydantic() -> Any:
+    action = TriggerActionEnqueue(queue="orders")
+    msg = InvokeFunctionMessage(
+        function_id="orders::create",
+        data=PAYLOAD,
+        invocation_id=str(uuid.uuid4()),
+        traceparent=inject_trace_context()[0],
+        baggage=inject_trace_context()[1],
+        action=action,
+    )
+    return codec.encode(_dump(msg))
+
+
+def trigger_dict() -> Any:
+    traceparent, baggage = inject_trace_context()
+    msg = invoke_function_message(
+        "orders::create", PAYLOAD, next_id(), traceparent, baggage, {"type": "enqueue", "queue": "orders"}
+    )
+    return codec.encode(msg)
+
+
+def result_pydantic() -> Any:
+    return codec.encode(
+        _dump(InvocationResultMessage(invocation_id="id", function_id="orders::create", result=PAYLOAD))
+    )
+
+
+def result_dict() -> Any:
+    return codec.encode(invocation_result_message("id", "orders::create", result=PAYLOAD))
+
+
+def _per_call_us(fn: Callable[[], Any], iterations: int) -> float:
+    best = min(timeit.repeat(fn, number=iterations, repeat=5))
+    return best / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for name, before, after in (
+        ("invokefunction", trigger_pydantic, trigger_dict),
+        ("invocationresult", result_pydantic, result_dict),
+    ):
+        b = _per_call_us(before, args.iterations)
+        a = _per_call_us(after, args.iterations)
+        print(f"{name:<18} pydantic {b:7.2f} us/call   dict {a:7.2f} us/call   ({b / a:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
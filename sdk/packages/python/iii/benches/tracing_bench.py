@@ -0,0 +1,86 @@
+"""Per-invocation tracing overhead of ``III._invoke_with_otel_context``.
+
+Runs a trivial handler through the invocation wrapper in four modes:
+
+* ``off``: no tracer provider installed (the no-op tracer)
+* ``on``: an SDK tracer provider recording a SERVER span per invocation
+* ``sampled-out``: the incoming ``traceparent`` has its sampled flag cleared
+* ``sampled-out (full path)``: the same, with the fast path disabled, which
+  is what every sampled-out invocation used to cost
+
+No engine is needed::
+
+    python benches/tracing_bench.py [--iterations N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any, Callable
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+
+import iii.iii as iii_module
+from iii.iii import III
+
+SAMPLED = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+SAMPLED_OUT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00"
+PAYLOAD = {"user_id": 42}
+
+client = III.__new__(III)
+noop_tracer = trace.NoOpTracer()
+sdk_provider = TracerProvider()
+
+
+async def handler(data: Any) -> Any:
+    return data
+
+
+def _invoke(traceparent: str | None) -> Callable[[], Any]:
+    def run() -> Any:
+        # The handler never suspends, so one send() runs the wrapper to completion.
+        coro = client._invoke_with_otel_context(handler, PAYLOAD, traceparent, None)
+        try:
+            coro.send(None)
+        except StopIteration as done:
+            return done.value
+        raise RuntimeError("handler suspended")
+
+    return run
+
+
+def _per_call_us(fn: Callable[[], Any], iterations: int) -> float:
+    best = min(timeit.repeat(fn, number=iterations, repeat=5))
+    return best / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    original_get_tracer = trace.get_tracer
+    original_is_sampled_out = iii_module.is_sampled_out
+    try:
+        trace.get_tracer = lambda name, *a, **kw: noop_tracer  # type: ignore[assignment]
+        rows = [("off", _per_call_us(_invoke(SAMPLED), args.iterations))]
+
+        trace.get_tracer = lambda name, *a, **kw: sdk_provider.get_tracer(name)  # type: ignore[assignment]
+        rows.append(("on", _per_call_us(_invoke(SAMPLED), args.iterations)))
+        rows.append(("sampled-out", _per_call_us(_invoke(SAMPLED_OUT), args.iterations)))
+
+        iii_module.is_sampled_out = lambda traceparent: False  # type: ignore[assignment]
+        rows.append(("sampled-out (full path)", _per_call_us(_invoke(SAMPLED_OUT), args.iterations)))
+    finally:
+        trace.get_tracer = original_get_tracer  # type: ignore[assignment]
+        iii_module.is_sampled_out = original_is_sampled_out
+        sdk_provider.shutdown()
+
+    for name, us in rows:
+        print(f"{name:<24} {us:7.2f} us/invocation")
+
+
+if __name__ == "__main__":
+    main()
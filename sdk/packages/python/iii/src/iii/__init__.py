@@ -1,8 +1,26 @@
 """III SDK for Python."""
 
+from .async_iii import AsyncIII
+from .batch import TriggerOutcome
 from .channels import ChannelReader, ChannelWriter
-from .iii import TriggerAction, register_worker
-from .iii_constants import FunctionRef, InitOptions, ReconnectionConfig, TelemetryOptions
+from .iii import InvocationDisconnectedError, TriggerAction, register_worker
+from .iii_constants import (
+    BatchConfig,
+    ChannelMuxConfig,
+    CompressionConfig,
+    ConcurrencyLimits,
+    ExecutorConfig,
+    FunctionRef,
+    InitOptions,
+    ReconnectionConfig,
+    RegistrationConfig,
+    ResultCacheConfig,
+    SchedulingConfig,
+    SendPipelineConfig,
+    SpillConfig,
+    SpoolConfig,
+    TelemetryOptions,
+)
 from .iii_types import (
     EnqueueResult,
     FunctionInfo,
@@ -22,7 +40,9 @@ from .iii_types import (
     TriggerInfo,
     TriggerRequest,
 )
+from .interceptors import MessageInterceptor
 from .logger import Logger
+from .spill import SpilledPayload
 from .stream import IStream, StreamContext
 from .telemetry_types import OtelConfig
 from .triggers import Trigger, TriggerConfig, TriggerHandler
@@ -42,14 +62,30 @@ __all__ = [
     # Channels
     "ChannelReader",
     "ChannelWriter",
+    "SpilledPayload",
     # Core
+    "AsyncIII",
+    "BatchConfig",
+    "ChannelMuxConfig",
+    "CompressionConfig",
+    "ConcurrencyLimits",
+    "ExecutorConfig",
     "FunctionRef",
     "InitOptions",
+    "InvocationDisconnectedError",
+    "MessageInterceptor",
     "OtelConfig",
     "ReconnectionConfig",
+    "RegistrationConfig",
+    "ResultCacheConfig",
+    "SchedulingConfig",
+    "SendPipelineConfig",
+    "SpillConfig",
+    "SpoolConfig",
     "register_worker",
     "TelemetryOptions",
     "TriggerAction",
+    "TriggerOutcome",
     # Message types
     "EnqueueResult",
     "FunctionInfo",
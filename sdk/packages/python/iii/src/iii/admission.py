@@ -0,0 +1,163 @@
+"""Admission control for incoming invocations."""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+from typing import Any, Callable
+
+from .iii_constants import ConcurrencyLimits, SchedulingConfig
+from .scheduler import FairScheduler, Waiter
+
+log = logging.getLogger("iii.admission")
+
+OVERLOADED_ERROR_CODE = "overloaded"
+
+
+class _Gate:
+    """Concurrency and wait-queue counters for one scope (the worker or a function)."""
+
+    __slots__ = ("limits", "priority", "in_flight", "queued", "admitted", "rejected")
+
+    def __init__(self, limits: ConcurrencyLimits | None, priority: int = 0) -> None:
+        self.limits = limits
+        self.priority = priority
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def has_capacity(self) -> bool:
+        limit = self.limits.max_concurrent if self.limits else None
+        return limit is None or self.in_flight < limit
+
+    def has_queue_room(self) -> bool:
+        if self.limits is None or self.limits.max_concurrent is None:
+            return True
+        return self.queued < self.limits.max_queued
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionController:
+    """Bounds concurrent invocations per worker and per function.
+
+    ``submit`` either starts the invocation immediately, parks it in a bounded
+    wait queue, or rejects it.  Parked invocations are plain records: no task
+    is created until a slot frees up, and the ``FairScheduler`` decides
+    which one starts next.  A parked invocation starts in the ``contextvars``
+    context it was submitted in.  Every started invocation must be paired
+    with exactly one ``release``.
+    """
+
+    def __init__(
+        self,
+        worker_limits: ConcurrencyLimits | None = None,
+        scheduling: SchedulingConfig | None = None,
+    ) -> None:
+        self._worker = _Gate(worker_limits)
+        self._functions: dict[str, _Gate] = {}
+        self._waiting = FairScheduler(scheduling)
+
+    def configure_function(self, function_id: str, limits: ConcurrencyLimits | None, priority: int = 0) -> None:
+        gate = self._functions.get(function_id)
+        if gate is None:
+            self._functions[function_id] = _Gate(limits, priority)
+        else:
+            gate.limits = limits
+            gate.priority = priority
+            self._waiting.unpark(function_id)
+            self._pump()
+
+    def flow_from_baggage(self, baggage: str | None) -> str | None:
+        """Return the fair-share flow for an invocation carrying ``baggage``."""
+        return self._waiting.flow_from_baggage(baggage)
+
+    def remove_function(self, function_id: str) -> None:
+        gate = self._functions.get(function_id)
+        if gate is not None and gate.in_flight == 0 and gate.queued == 0:
+            del self._functions[function_id]
+
+    def _gate(self, function_id: str) -> _Gate:
+        gate = self._functions.get(function_id)
+        if gate is None:
+            gate = self._functions[function_id] = _Gate(None)
+        return gate
+
+    def submit(self, function_id: str, start: Callable[[], None], flow: str | None = None) -> bool:
+        """Admit an invocation.
+
+        Args:
+            function_id: The invoked function.
+            start: Called (on the current thread) when the invocation may run.
+            flow: Fair-share flow of the invocation, e.g. its tenant.
+
+        Returns:
+            ``True`` if the invocation was started or queued, ``False`` if it
+            was rejected because the worker or function is overloaded.
+        """
+        gate = self._gate(function_id)
+        if not self._waiting and self._worker.has_capacity() and gate.has_capacity():
+            self._begin(gate)
+            start()
+            return True
+        if self._worker.has_queue_room() and gate.has_queue_room():
+            self._worker.queued += 1
+            gate.queued += 1
+            self._enqueue(Waiter(function_id, start, flow, gate.priority, contextvars.copy_context()))
+            # Capacity may be available for this function even though others are waiting.
+            self._pump()
+            return True
+        self._worker.rejected += 1
+        gate.rejected += 1
+        return False
+
+    def release(self, function_id: str) -> None:
+        """Return the slot held by a finished invocation and start waiters that now fit."""
+        self._worker.in_flight -= 1
+        gate = self._functions.get(function_id)
+        if gate is not None:
+            gate.in_flight -= 1
+        self._waiting.unpark(function_id)
+        self._pump()
+
+    def _begin(self, gate: _Gate) -> None:
+        self._worker.in_flight += 1
+        self._worker.admitted += 1
+        gate.in_flight += 1
+        gate.admitted += 1
+
+    def _enqueue(self, waiter: Waiter) -> None:
+        self._waiting.push(waiter)
+
+    def _take_next(self) -> Waiter | None:
+        """Remove and return the best-ranked waiter whose function has capacity."""
+        return self._waiting.pop(lambda waiter: self._gate(waiter.function_id).has_capacity())
+
+    def _pump(self) -> None:
+        while self._waiting and self._worker.has_capacity():
+            waiter = self._take_next()
+            if waiter is None:
+                return
+            gate = self._gate(waiter.function_id)
+            self._worker.queued -= 1
+            gate.queued -= 1
+            self._begin(gate)
+            try:
+                waiter.context.run(waiter.start)
+            except Exception:
+                log.exception("Failed to start queued invocation of %s", waiter.function_id)
+                self.release(waiter.function_id)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._worker.stats(),
+            **self._waiting.stats(),
+            "functions": {fid: gate.stats() for fid, gate in self._functions.items() if gate.admitted or gate.rejected},
+        }
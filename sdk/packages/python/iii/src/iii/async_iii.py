@@ -0,0 +1,123 @@
+"""Asyncio-native client surface for the III SDK."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Coroutine, Iterable, TypeVar
+
+from .batch import TriggerOutcome
+from .iii_types import FunctionInfo, TriggerInfo, TriggerRequest, WorkerInfo
+from .types import Channel
+
+if TYPE_CHECKING:
+    from .iii import III
+
+TResult = TypeVar("TResult")
+
+
+class AsyncIII:
+    """Awaitable counterpart of the blocking ``III`` request methods.
+
+    Obtain one through ``III.aio``.  Calls made from the SDK event loop
+    (e.g. inside an async function handler) run inline without any thread
+    hop.  Calls made from another event loop are scheduled on the SDK loop
+    and awaited without parking a thread.
+
+    Registration methods (``register_function``, ``register_trigger``, ...)
+    never block and remain available on the underlying ``client``.
+
+    Examples:
+        >>> async def handler(data):
+        ...     return await iii.aio.trigger({'function_id': 'greet', 'payload': data})
+        >>> iii.register_function({'id': 'proxy'}, handler)
+    """
+
+    def __init__(self, client: III) -> None:
+        self._client = client
+
+    @property
+    def client(self) -> III:
+        """The underlying ``III`` client."""
+        return self._client
+
+    async def _call(self, coro: Coroutine[Any, Any, TResult]) -> TResult:
+        loop = self._client._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def wait_until_connected(self) -> None:
+        """Wait until the WebSocket connection to the engine is established.
+
+        Raises:
+            ConnectionError: If the connection has failed permanently.
+        """
+        await self._call(self._client._async_wait_until_connected())
+
+    async def trigger(self, request: dict[str, Any] | TriggerRequest) -> Any:
+        """Invoke a remote function. Awaitable form of ``III.trigger``.
+
+        Args:
+            request: A ``TriggerRequest`` or dict with ``function_id``, ``payload``,
+                and optional ``action`` / ``timeout_ms``.
+
+        Returns:
+            The result of the function invocation, or ``None`` for void calls.
+
+        Raises:
+            TimeoutError: If the invocation times out.
+
+        Examples:
+            >>> result = await iii.aio.trigger({'function_id': 'greet', 'payload': {'name': 'World'}})
+        """
+        return await self._call(self._client._async_trigger(request))
+
+    async def trigger_many(
+        self,
+        requests: Iterable[dict[str, Any] | TriggerRequest],
+        *,
+        max_concurrency: int | None = None,
+        timeout_ms: int | None = None,
+        ordered: bool = True,
+        fail_fast: bool = False,
+    ) -> list[TriggerOutcome]:
+        """Invoke many functions concurrently. Awaitable form of ``III.trigger_many``.
+
+        Examples:
+            >>> outcomes = await iii.aio.trigger_many(requests, max_concurrency=32, fail_fast=True)
+        """
+        return await self._call(
+            self._client._async_trigger_many(
+                requests, max_concurrency=max_concurrency, timeout_ms=timeout_ms, ordered=ordered, fail_fast=fail_fast
+            )
+        )
+
+    async def list_functions(self) -> list[FunctionInfo]:
+        """List all functions registered with the engine across all workers."""
+        return await self._call(self._client._async_list_functions())
+
+    async def list_workers(self) -> list[WorkerInfo]:
+        """List all workers currently connected to the engine."""
+        return await self._call(self._client._async_list_workers())
+
+    async def list_triggers(self, include_internal: bool = False) -> list[TriggerInfo]:
+        """List all triggers registered with the engine.
+
+        Args:
+            include_internal: If ``True``, include engine-internal triggers.
+        """
+        return await self._call(self._client._async_list_triggers(include_internal))
+
+    async def create_channel(self, buffer_size: int | None = None, frame_size: int | None = None) -> Channel:
+        """Create a streaming channel pair for worker-to-worker data transfer.
+
+        Args:
+            buffer_size: Buffer capacity for the channel. Defaults to ``64``.
+            frame_size: Largest binary frame the local ``writer`` sends.
+                Defaults to 64 KiB.
+        """
+        return await self._call(self._client._async_create_channel(buffer_size, frame_size))
@@ -0,0 +1,127 @@
+"""Bounded-parallelism fan-out of many invocations."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .iii_types import TriggerRequest
+
+Request = dict[str, Any] | TriggerRequest
+
+
+@dataclass
+class TriggerOutcome:
+    """Result of one invocation made by ``trigger_many``.
+
+    Attributes:
+        index: Position of the request in the input sequence.
+        function_id: The invoked function.
+        result: The function's return value when the call succeeded.
+        error: The exception raised by the call, or ``None`` on success.
+    """
+
+    index: int
+    function_id: str
+    result: Any = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _with_timeout(request: Request, timeout_ms: int | None) -> Request:
+    if timeout_ms is None:
+        return request
+    if isinstance(request, TriggerRequest):
+        return request if request.timeout_ms is not None else request.model_copy(update={"timeout_ms": timeout_ms})
+    return request if request.get("timeout_ms") is not None else {**request, "timeout_ms": timeout_ms}
+
+
+def _function_id(request: Request) -> str:
+    return request.function_id if isinstance(request, TriggerRequest) else str(request.get("function_id", ""))
+
+
+async def _iter_trigger_many(
+    trigger: Callable[[Request], Awaitable[Any]],
+    requests: Iterable[Request],
+    *,
+    max_concurrency: int | None = None,
+    timeout_ms: int | None = None,
+    fail_fast: bool = False,
+) -> AsyncIterator[TriggerOutcome]:
+    """Run ``trigger`` over ``requests`` and yield outcomes as they complete.
+
+    At most ``max_concurrency`` invocations are outstanding at once; the
+    rest start as earlier ones finish, so each request's timeout covers only
+    its own round trip.  With ``fail_fast`` the first failure cancels the
+    remaining invocations and is raised.  A call that ends cancelled, such as
+    a local handler whose task was cancelled, is recorded as a failed outcome
+    with the ``CancelledError``; only cancelling the batch itself stops it.
+    """
+    pending = list(enumerate(requests))
+    if not pending:
+        return
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    completed: asyncio.Queue[TriggerOutcome] = asyncio.Queue()
+    queue = iter(pending)
+    failed = False
+    closing = False
+
+    async def worker() -> None:
+        nonlocal failed
+        # Workers share one iterator, so each request is taken exactly once.
+        for index, request in queue:
+            function_id = _function_id(request)
+            try:
+                result = await trigger(_with_timeout(request, timeout_ms))
+            except (Exception, asyncio.CancelledError) as exc:
+                if closing:
+                    raise
+                completed.put_nowait(TriggerOutcome(index, function_id, error=exc))
+                if fail_fast:
+                    failed = True
+            else:
+                completed.put_nowait(TriggerOutcome(index, function_id, result=result))
+            if failed:
+                return
+
+    workers = min(len(pending), max_concurrency or len(pending))
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        for _ in range(len(pending)):
+            outcome = await completed.get()
+            if fail_fast and outcome.error is not None:
+                raise outcome.error
+            yield outcome
+    finally:
+        closing = True
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def trigger_many(
+    trigger: Callable[[Request], Awaitable[Any]],
+    requests: Iterable[Request],
+    *,
+    max_concurrency: int | None = None,
+    timeout_ms: int | None = None,
+    ordered: bool = True,
+    fail_fast: bool = False,
+) -> list[TriggerOutcome]:
+    """Collect ``_iter_trigger_many`` into a list, in input order unless ``ordered`` is false."""
+    outcomes = [
+        outcome
+        async for outcome in _iter_trigger_many(
+            trigger, requests, max_concurrency=max_concurrency, timeout_ms=timeout_ms, fail_fast=fail_fast
+        )
+    ]
+    if ordered:
+        outcomes.sort(key=lambda outcome: outcome.index)
+    return outcomes
@@ -0,0 +1,98 @@
+"""Micro-batching of concurrent invocations of one function."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from .iii_constants import BatchConfig
+from .runtime_stats import Histogram
+
+log = logging.getLogger("iii.batching")
+
+BatchHandler = Callable[[list[Any]], Awaitable[Any]]
+
+
+class MicroBatcher:
+    """Collects concurrent invocations and runs the handler once per batch.
+
+    Each ``submit`` call adds one payload and waits for its own result.  A
+    batch is dispatched when it reaches ``max_batch_size`` or when its oldest
+    payload has waited ``max_wait_ms``.  The handler receives the list of
+    payloads and must return a list of the same length; an ``Exception``
+    instance in that list fails only the corresponding invocation, while an
+    exception raised by the handler fails the whole batch.
+    """
+
+    def __init__(self, function_id: str, handler: BatchHandler, config: BatchConfig) -> None:
+        self._function_id = function_id
+        self._handler = handler
+        self._config = config
+        self._items: list[tuple[Any, asyncio.Future[Any]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._batch_size = Histogram(max_bound=max(config.max_batch_size, 1))
+        self._flushed_full = 0
+        self._flushed_timeout = 0
+        self._failed_batches = 0
+
+    async def submit(self, payload: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._items.append((payload, future))
+        if len(self._items) >= self._config.max_batch_size:
+            self._flushed_full += 1
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._config.max_wait_ms / 1000, self._on_timer)
+        return await future
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if self._items:
+            self._flushed_timeout += 1
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._items = self._items, []
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[Any, asyncio.Future[Any]]]) -> None:
+        self._batch_size.observe(len(batch))
+        try:
+            results = await self._handler([payload for payload, _ in batch])
+            if not isinstance(results, (list, tuple)) or len(results) != len(batch):
+                raise ValueError(
+                    f"Batch handler for '{self._function_id}' must return a list of {len(batch)} results, "
+                    f"got {type(results).__name__}"
+                    + (f" of length {len(results)}" if isinstance(results, (list, tuple)) else "")
+                )
+        except Exception as exc:
+            self._failed_batches += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending": len(self._items),
+            "running_batches": len(self._tasks),
+            "flushed_full": self._flushed_full,
+            "flushed_timeout": self._flushed_timeout,
+            "failed_batches": self._failed_batches,
+            "batch_size": self._batch_size.snapshot(),
+        }
@@ -0,0 +1,244 @@
+"""Data channels multiplexed over the worker's engine connection.
+
+Instead of opening a WebSocket per channel end, a worker whose engine
+advertises the ``channel_mux`` capability carries channel traffic as tagged
+binary frames on the connection it already holds.  Every frame starts with
+a fixed header::
+
+    MUX_MAGIC (4 bytes) | op (1 byte) | stream id (uint32, big endian) | body
+
+Stream ids are chosen by the worker when it opens a channel end.  ``OPEN``
+carries the channel ref and the receive window as JSON; ``DATA`` and
+``TEXT`` carry binary chunks and text messages; ``CLOSE`` ends a stream in
+either direction; ``CREDIT`` (uint32 body) returns window to the sender.
+Each side may have at most ``window`` unacknowledged body bytes in flight
+per stream, so a slow reader never makes the engine buffer more than that.
+JSON frames never start with a NUL byte, so mux frames share the
+connection without extra framing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import struct
+from typing import Any, Awaitable, Callable
+
+from .iii_constants import ChannelMuxConfig
+from .iii_types import StreamChannelRef
+
+log = logging.getLogger("iii.channel_mux")
+
+CAPABILITY_CHANNEL_MUX = "channel_mux"
+
+MUX_MAGIC = b"\x00iic"
+
+OP_OPEN = 1
+OP_DATA = 2
+OP_TEXT = 3
+OP_CREDIT = 4
+OP_CLOSE = 5
+
+_HEADER = struct.Struct(">4sBI")
+_CREDIT = struct.Struct(">I")
+
+_END = object()
+
+
+def is_mux_frame(frame: str | bytes) -> bool:
+    return isinstance(frame, bytes) and frame[:4] == MUX_MAGIC
+
+
+def mux_frame(op: int, stream_id: int, body: bytes | bytearray | memoryview = b"") -> bytes:
+    """Encode one mux frame into a single new ``bytes`` object.
+
+    Copying ``body`` here is intended: with a send pipeline configured,
+    engine frames wait in the outbound queue after ``send`` returns, so they
+    must not reference a caller's buffer or a memory-mapped file that can
+    change or be unmapped by then.  A mux-backed write therefore costs one
+    copy per frame, where a dedicated channel socket sends the slices as is.
+    """
+    return b"".join((_HEADER.pack(MUX_MAGIC, op, stream_id), body))
+
+
+def parse_mux_frame(frame: bytes) -> tuple[int, int, memoryview]:
+    """Split a mux frame into ``(op, stream_id, body)``."""
+    _, op, stream_id = _HEADER.unpack_from(frame)
+    return op, stream_id, memoryview(frame)[_HEADER.size :]
+
+
+class MuxStream:
+    """One end of a data channel carried over the engine connection.
+
+    Implements the subset of the WebSocket connection interface that
+    ``ChannelWriter`` and ``ChannelReader`` use: ``send``, ``close`` and
+    async iteration over received messages.
+    """
+
+    def __init__(self, mux: ChannelMux, stream_id: int, window: int) -> None:
+        self._mux = mux
+        self.stream_id = stream_id
+        self._window = window
+        self._credit = window
+        self._credit_available = asyncio.Event()
+        self._unacked = 0
+        self._inbox: asyncio.Queue[str | bytes | object] = asyncio.Queue()
+        self._error: Exception | None = None
+        self.closed = False
+
+    async def send(self, message: Any) -> None:
+        """Send a text message, or a binary message within the stream's send credit."""
+        self._check_open()
+        if isinstance(message, str):
+            await self._mux._send(mux_frame(OP_TEXT, self.stream_id, message.encode()))
+            return
+        view = memoryview(message).cast("B")
+        offset = 0
+        while True:
+            while self._credit <= 0:
+                self._credit_available.clear()
+                self._mux._credit_waits += 1
+                await self._credit_available.wait()
+                self._check_open()
+            size = min(self._credit, len(view) - offset)
+            self._credit -= size
+            await self._mux._send(mux_frame(OP_DATA, self.stream_id, view[offset : offset + size]))
+            self._mux._bytes_sent += size
+            offset += size
+            if offset >= len(view):
+                return
+
+    async def close(self) -> None:
+        """End the stream; a reader stops receiving, a writer signals end of data."""
+        if self.closed:
+            return
+        self._finish(None)
+        try:
+            await self._mux._send(mux_frame(OP_CLOSE, self.stream_id))
+        except ConnectionError:
+            pass
+
+    def __aiter__(self) -> MuxStream:
+        return self
+
+    async def __anext__(self) -> str | bytes:
+        item = await self._inbox.get()
+        if isinstance(item, str):
+            return item
+        if isinstance(item, bytes):
+            self._unacked += len(item)
+            if self._unacked * 2 >= self._window and not self.closed:
+                granted, self._unacked = self._unacked, 0
+                try:
+                    await self._mux._send(mux_frame(OP_CREDIT, self.stream_id, _CREDIT.pack(granted)))
+                except ConnectionError:
+                    pass
+            return item
+        self._inbox.put_nowait(_END)
+        if self._error is not None:
+            raise self._error
+        raise StopAsyncIteration
+
+    def _check_open(self) -> None:
+        if self._error is not None:
+            raise self._error
+        if self.closed:
+            raise ConnectionError(f"channel stream {self.stream_id} is closed")
+
+    def _receive(self, op: int, body: memoryview) -> None:
+        if op == OP_DATA:
+            self._mux._bytes_received += len(body)
+            self._inbox.put_nowait(bytes(body))
+        elif op == OP_TEXT:
+            self._inbox.put_nowait(str(body, "utf-8"))
+        elif op == OP_CREDIT:
+            self._credit += _CREDIT.unpack(body)[0]
+            self._credit_available.set()
+        elif op == OP_CLOSE:
+            self._finish(None)
+
+    def _finish(self, error: Exception | None) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._error = error
+        self._inbox.put_nowait(_END)
+        self._credit_available.set()
+        self._mux._streams.pop(self.stream_id, None)
+
+
+class ChannelMux:
+    """Opens and routes channel streams on the engine connection.
+
+    ``send`` writes a frame to the engine connection and raises
+    ``ConnectionError`` when it is not open; ``available`` reports whether
+    the connection is open and the engine advertised ``channel_mux``.
+    Streams are bound to the SDK event loop, so channel ends used from any
+    other loop keep their own socket.
+    """
+
+    def __init__(
+        self,
+        config: ChannelMuxConfig,
+        loop: asyncio.AbstractEventLoop,
+        send: Callable[[bytes], Awaitable[None]],
+        available: Callable[[], bool],
+    ) -> None:
+        self._config = config
+        self._loop = loop
+        self._send = send
+        self._available = available
+        self._streams: dict[int, MuxStream] = {}
+        self._next_id = 1
+        self._opened = 0
+        self._fallbacks = 0
+        self._credit_waits = 0
+        self._bytes_sent = 0
+        self._bytes_received = 0
+
+    async def open(self, ref: StreamChannelRef) -> MuxStream | None:
+        """Open ``ref`` over the engine connection, or return ``None`` to use a dedicated socket."""
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if not on_loop or not self._available():
+            self._fallbacks += 1
+            return None
+        stream_id = self._next_id
+        self._next_id = (self._next_id % 0xFFFFFFFF) + 1
+        stream = self._streams[stream_id] = MuxStream(self, stream_id, self._config.window_bytes)
+        body = json.dumps({**ref.model_dump(), "window": self._config.window_bytes}).encode()
+        try:
+            await self._send(mux_frame(OP_OPEN, stream_id, body))
+        except ConnectionError:
+            stream._finish(None)
+            self._fallbacks += 1
+            return None
+        self._opened += 1
+        return stream
+
+    def handle_frame(self, frame: bytes) -> None:
+        op, stream_id, body = parse_mux_frame(frame)
+        stream = self._streams.get(stream_id)
+        if stream is None:
+            log.debug("Mux frame op=%d for unknown stream %d", op, stream_id)
+            return
+        stream._receive(op, body)
+
+    def reset(self) -> None:
+        """Fail every open stream after the engine connection was lost."""
+        for stream in list(self._streams.values()):
+            stream._finish(ConnectionError("engine connection lost while the channel was open"))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "available": self._available(),
+            "open_streams": len(self._streams),
+            "opened": self._opened,
+            "fallbacks": self._fallbacks,
+            "credit_waits": self._credit_waits,
+            "bytes_sent": self._bytes_sent,
+            "bytes_received": self._bytes_received,
+        }
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, AsyncIterator, Callable
+import mmap
+import os
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
 from urllib.parse import quote
 
 import websockets
@@ -12,10 +14,23 @@ from websockets.asyncio.client import ClientConnection
 
 from .iii_types import StreamChannelRef
 
+if TYPE_CHECKING:
+    from .channel_mux import ChannelMux, MuxStream
+
 log = logging.getLogger("iii.channels")
 
 MAX_FRAME_SIZE = 64 * 1024
 
+BytesLike = bytes | bytearray | memoryview
+"""Payloads accepted by ``ChannelWriter.write``; any buffer-protocol object also works."""
+
+
+def _byte_view(data: Any) -> memoryview:
+    view = memoryview(data)
+    if view.ndim != 1 or view.itemsize != 1:
+        view = view.cast("B")
+    return view
+
 
 def build_channel_url(
     engine_ws_base: str,
@@ -27,13 +42,21 @@ def build_channel_url(
     return f"{base}/ws/channels/{channel_id}?key={quote(access_key)}&dir={direction}"
 
 
+async def _connect(
+    url: str, ref: StreamChannelRef, connect_options: dict[str, Any], mux: ChannelMux | None
+) -> ClientConnection | MuxStream:
+    if mux is not None and (stream := await mux.open(ref)) is not None:
+        return stream
+    return await websockets.connect(url, **connect_options)
+
+
 class WritableStream:
     """Writable stream interface backed by a ChannelWriter, matching Node.js Writable semantics."""
 
     def __init__(self, writer: ChannelWriter) -> None:
         self._writer = writer
 
-    def write(self, data: bytes) -> None:
+    def write(self, data: BytesLike) -> None:
         """Fire-and-forget binary write. Queues an async write on the running loop."""
         try:
             loop = asyncio.get_running_loop()
@@ -41,7 +64,7 @@ class WritableStream:
         except RuntimeError:
             asyncio.run(self._writer.write(data))
 
-    def end(self, data: bytes | None = None) -> None:
+    def end(self, data: BytesLike | None = None) -> None:
         """Write optional final data and close the stream."""
         try:
             loop = asyncio.get_running_loop()
@@ -78,34 +101,93 @@ class ReadableStream:
 
 
 class ChannelWriter:
-    """WebSocket-backed writer for streaming binary data and text messages."""
-
-    def __init__(self, engine_ws_base: str, ref: StreamChannelRef) -> None:
+    """WebSocket-backed writer for streaming binary data and text messages.
+
+    Attributes:
+        frame_size: Largest binary frame sent; bigger writes are split.
+    """
+
+    def __init__(
+        self,
+        engine_ws_base: str,
+        ref: StreamChannelRef,
+        connect_options: dict[str, Any] | None = None,
+        frame_size: int = MAX_FRAME_SIZE,
+        mux: ChannelMux | None = None,
+    ) -> None:
+        if frame_size <= 0:
+            raise ValueError("frame_size must be positive")
         self._url = build_channel_url(engine_ws_base, ref.channel_id, ref.access_key, "write")
-        self._ws: ClientConnection | None = None
+        self._ref = ref
+        self._connect_options = connect_options or {}
+        self._mux = mux
+        self.frame_size = frame_size
+        self._ws: ClientConnection | MuxStream | None = None
         self._connected = False
         self._lock = asyncio.Lock()
         self.stream = WritableStream(self)
 
-    async def _ensure_connected(self) -> ClientConnection:
+    async def _ensure_connected(self) -> ClientConnection | MuxStream:
         if self._ws is not None and self._connected:
             return self._ws
         async with self._lock:
             if self._ws is not None and self._connected:
                 return self._ws
-            self._ws = await websockets.connect(self._url)
+            self._ws = await _connect(self._url, self._ref, self._connect_options, self._mux)
             self._connected = True
             return self._ws
 
-    async def write(self, data: bytes) -> None:
+    async def write(self, data: BytesLike) -> None:
+        """Send ``data`` as one or more binary frames of at most ``frame_size`` bytes.
+
+        Accepts ``bytes``, ``bytearray``, ``memoryview`` or any other
+        buffer-protocol object.  Large payloads are sent as memoryview
+        slices, so splitting them does not copy; the buffer must not be
+        modified until the call returns.
+        """
         ws = await self._ensure_connected()
-        if len(data) <= MAX_FRAME_SIZE:
+        if isinstance(data, bytes) and len(data) <= self.frame_size:
             await ws.send(data)
-        else:
-            offset = 0
-            while offset < len(data):
-                await ws.send(data[offset : offset + MAX_FRAME_SIZE])
-                offset += MAX_FRAME_SIZE
+            return
+        with _byte_view(data) as view:
+            await self._send_view(ws, view)
+
+    async def write_file(self, path: str | os.PathLike[str], offset: int = 0, count: int | None = None) -> int:
+        """Stream a file, or ``count`` bytes of it from ``offset``, without reading it into memory.
+
+        Regular files are memory-mapped and sent as frames sliced from the
+        mapping; files that cannot be mapped are read one frame at a time.
+
+        Returns:
+            The number of bytes written.
+        """
+        ws = await self._ensure_connected()
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            end = size if count is None else min(size, offset + count)
+            if offset >= end:
+                return 0
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return await self._send_reads(ws, f, offset, end)
+            with mapped, memoryview(mapped) as view, view[offset:end] as part:
+                await self._send_view(ws, part)
+            return end - offset
+
+    async def _send_view(self, ws: ClientConnection | MuxStream, view: memoryview) -> None:
+        frame_size = self.frame_size
+        for start in range(0, len(view) or 1, frame_size):
+            with view[start : start + frame_size] as frame:
+                await ws.send(frame)
+
+    async def _send_reads(self, ws: ClientConnection | MuxStream, f: Any, offset: int, end: int) -> int:
+        f.seek(offset)
+        sent = 0
+        while sent < end - offset and (chunk := f.read(min(self.frame_size, end - offset - sent))):
+            await ws.send(chunk)
+            sent += len(chunk)
+        return sent
 
     def send_message(self, msg: str) -> None:
         """Fire-and-forget text message. Queues a coroutine on the running loop."""
@@ -136,21 +218,30 @@ class ChannelWriter:
 class ChannelReader:
     """WebSocket-backed reader for streaming binary data and text messages."""
 
-    def __init__(self, engine_ws_base: str, ref: StreamChannelRef) -> None:
+    def __init__(
+        self,
+        engine_ws_base: str,
+        ref: StreamChannelRef,
+        connect_options: dict[str, Any] | None = None,
+        mux: ChannelMux | None = None,
+    ) -> None:
         self._url = build_channel_url(engine_ws_base, ref.channel_id, ref.access_key, "read")
-        self._ws: ClientConnection | None = None
+        self._ref = ref
+        self._connect_options = connect_options or {}
+        self._mux = mux
+        self._ws: ClientConnection | MuxStream | None = None
         self._connected = False
         self._lock = asyncio.Lock()
         self._message_callbacks: list[Callable[[str], Any]] = []
         self.stream = ReadableStream(self)
 
-    async def _ensure_connected(self) -> ClientConnection:
+    async def _ensure_connected(self) -> ClientConnection | MuxStream:
         if self._ws is not None and self._connected:
             return self._ws
         async with self._lock:
             if self._ws is not None and self._connected:
                 return self._ws
-            self._ws = await websockets.connect(self._url)
+            self._ws = await _connect(self._url, self._ref, self._connect_options, self._mux)
             self._connected = True
             return self._ws
 
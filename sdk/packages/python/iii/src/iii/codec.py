@@ -0,0 +1,142 @@
+"""Wire codecs for the III WebSocket protocol.
+
+The engine accepts JSON in both text and binary frames. ``JsonCodec`` (the
+default) produces text frames via the standard library; ``OrjsonCodec`` and
+``MsgspecCodec`` work directly on ``bytes`` and produce binary frames, which
+avoids the ``str`` round trip on both encode and decode.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+from enum import Enum
+from typing import Any, Literal, Protocol, runtime_checkable
+
+log = logging.getLogger("iii.codec")
+
+CodecName = Literal["json", "orjson", "msgspec", "auto"]
+
+
+@runtime_checkable
+class Codec(Protocol):
+    """Encodes protocol messages to WebSocket frames and decodes them back."""
+
+    name: str
+
+    def encode(self, obj: Any) -> str | bytes:
+        """Encode ``obj``. ``str`` results are sent as text frames, ``bytes`` as binary frames."""
+        ...
+
+    def decode(self, raw: str | bytes) -> Any:
+        """Decode a received frame."""
+        ...
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for values the JSON backends cannot encode natively."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json", by_alias=True, exclude_none=True)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return bytes(obj).decode()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """Standard library ``json`` codec producing text frames."""
+
+    name = "json"
+
+    def encode(self, obj: Any) -> str:
+        return json.dumps(obj, default=_default)
+
+    def decode(self, raw: str | bytes) -> Any:
+        return json.loads(raw)
+
+
+class OrjsonCodec:
+    """``orjson`` codec producing binary frames. Requires ``pip install orjson``."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def encode(self, obj: Any) -> bytes:
+        return self._dumps(obj, default=_default, option=self._option)
+
+    def decode(self, raw: str | bytes) -> Any:
+        return self._loads(raw)
+
+
+class MsgspecCodec:
+    """``msgspec`` JSON codec producing binary frames. Requires ``pip install msgspec``.
+
+    ``msgspec.Struct`` values are encoded natively without an intermediate dict.
+    """
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def decode(self, raw: str | bytes) -> Any:
+        return self._decoder.decode(raw)
+
+
+JSON_CODEC = JsonCodec()
+
+
+def resolve_codec(codec: Codec | CodecName | str | None = None) -> Codec:
+    """Return a codec instance for ``codec``.
+
+    Args:
+        codec: A ``Codec`` instance, or one of ``"json"``, ``"orjson"``,
+            ``"msgspec"`` or ``"auto"``.  ``"auto"`` picks the fastest
+            installed backend and falls back to ``"json"``.  ``None`` means
+            ``"json"``.
+
+    Raises:
+        ImportError: If the requested backend is not installed.
+        ValueError: If ``codec`` is not a known codec name.
+    """
+    if codec is None or codec == "json":
+        return JSON_CODEC
+    if not isinstance(codec, str):
+        return codec
+    if codec == "orjson":
+        return OrjsonCodec()
+    if codec == "msgspec":
+        return MsgspecCodec()
+    if codec == "auto":
+        for factory in (OrjsonCodec, MsgspecCodec):
+            try:
+                return factory()
+            except ImportError:
+                continue
+        log.debug("No fast JSON backend installed, using stdlib json")
+        return JSON_CODEC
+    raise ValueError(f"Unknown codec '{codec}'. Expected 'json', 'orjson', 'msgspec' or 'auto'")
+
+
+def encode_bytes(codec: Codec, obj: Any) -> bytes:
+    """Encode ``obj`` with ``codec`` and return ``bytes`` regardless of backend."""
+    data = codec.encode(obj)
+    return data.encode() if isinstance(data, str) else data
@@ -0,0 +1,164 @@
+"""WebSocket compression for the engine, telemetry and channel connections.
+
+``permessage-deflate`` is negotiated per connection by ``websockets``; the
+factory built here applies ``CompressionConfig`` tuning and counts the
+bytes each side of the extension sees.  On the engine connection large
+frames can additionally be sent as zstd frames.  JSON never starts with the
+zstd magic number, so compressed and plain frames share one connection
+without any extra framing.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from websockets.extensions.permessage_deflate import ClientPerMessageDeflateFactory, PerMessageDeflate
+from websockets.frames import Frame
+
+from .iii_constants import CompressionConfig
+
+CAPABILITY_ZSTD = "zstd_frames"
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# The ``max_size`` ``websockets.connect`` applies to the engine connection.
+MAX_MESSAGE_BYTES = 2**20
+
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+class ByteCounters:
+    """Raw and compressed byte counts in both directions of one kind of connection."""
+
+    __slots__ = ("sent_raw", "sent_compressed", "received_raw", "received_compressed", "frames")
+
+    def __init__(self) -> None:
+        self.sent_raw = 0
+        self.sent_compressed = 0
+        self.received_raw = 0
+        self.received_compressed = 0
+        self.frames = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "sent_raw_bytes": self.sent_raw,
+            "sent_compressed_bytes": self.sent_compressed,
+            "received_raw_bytes": self.received_raw,
+            "received_compressed_bytes": self.received_compressed,
+        }
+
+
+class _CountingDeflate(PerMessageDeflate):
+    def __init__(self, counters: ByteCounters, *args: Any) -> None:
+        super().__init__(*args)
+        self._counters = counters
+
+    def encode(self, frame: Frame) -> Frame:
+        encoded = super().encode(frame)
+        if encoded is not frame:
+            self._counters.frames += 1
+            self._counters.sent_raw += len(frame.data)
+            self._counters.sent_compressed += len(encoded.data)
+        return encoded
+
+    def decode(self, frame: Frame, *, max_size: int | None = None) -> Frame:
+        decoded = super().decode(frame, max_size=max_size)
+        if decoded is not frame:
+            self._counters.frames += 1
+            self._counters.received_raw += len(decoded.data)
+            self._counters.received_compressed += len(frame.data)
+        return decoded
+
+
+class _CountingDeflateFactory(ClientPerMessageDeflateFactory):
+    def __init__(self, counters: ByteCounters, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._counters = counters
+
+    def process_response_params(self, params: Any, accepted_extensions: Any) -> PerMessageDeflate:
+        negotiated = super().process_response_params(params, accepted_extensions)
+        return _CountingDeflate(
+            self._counters,
+            negotiated.remote_no_context_takeover,
+            negotiated.local_no_context_takeover,
+            negotiated.remote_max_window_bits,
+            negotiated.local_max_window_bits,
+            self.compress_settings,
+        )
+
+
+def connect_options(config: CompressionConfig | None, counters: ByteCounters) -> dict[str, Any]:
+    """Keyword arguments for ``websockets.connect`` that apply ``config``.
+
+    ``None`` keeps the ``websockets`` defaults and returns no arguments.
+    """
+    if config is None:
+        return {}
+    if not config.deflate:
+        return {"compression": None}
+    factory = _CountingDeflateFactory(
+        counters,
+        client_no_context_takeover=config.no_context_takeover,
+        client_max_window_bits=config.max_window_bits,
+        compress_settings={"level": config.deflate_level, "memLevel": config.deflate_mem_level},
+    )
+    return {"compression": None, "extensions": [factory]}
+
+
+def is_zstd_frame(frame: str | bytes) -> bool:
+    return isinstance(frame, bytes) and frame[:4] == ZSTD_MAGIC
+
+
+class ZstdFrames:
+    """Compresses large engine frames with zstd and decompresses zstd frames.
+
+    A decompressed frame is held to ``max_size`` bytes, the limit the
+    connection puts on plain frames; ``None`` disables the limit.
+    """
+
+    def __init__(self, config: CompressionConfig, max_size: int | None = MAX_MESSAGE_BYTES) -> None:
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ImportError("zstd frames require zstandard. Install with: pip install 'iii-sdk[zstd]'") from exc
+
+        self._threshold = config.zstd_threshold_bytes
+        self._compressor = zstandard.ZstdCompressor(level=config.zstd_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._max_size = max_size
+        self.counters = ByteCounters()
+
+    def compress(self, frame: str | bytes) -> str | bytes:
+        """Return ``frame`` zstd-compressed if it is large enough, otherwise unchanged."""
+        if len(frame) < self._threshold:
+            return frame
+        data = frame.encode() if isinstance(frame, str) else frame
+        compressed = self._compressor.compress(data)
+        if len(compressed) >= len(data):
+            return frame
+        self.counters.frames += 1
+        self.counters.sent_raw += len(data)
+        self.counters.sent_compressed += len(compressed)
+        return compressed
+
+    def decompress(self, frame: bytes) -> bytes:
+        """Decompress one zstd frame, whether or not its header records the content size.
+
+        Raises:
+            ValueError: If the frame decompresses to more than ``max_size`` bytes.
+        """
+        # Streamed so that a missing or forged content size cannot force an unbounded allocation.
+        chunks: list[bytes] = []
+        size = 0
+        with self._decompressor.stream_reader(frame) as reader:
+            while chunk := reader.read(_READ_CHUNK_BYTES):
+                size += len(chunk)
+                if self._max_size is not None and size > self._max_size:
+                    raise ValueError(f"zstd frame decompresses to more than {self._max_size} bytes")
+                chunks.append(chunk)
+        data = b"".join(chunks)
+        self.counters.frames += 1
+        self.counters.received_raw += len(data)
+        self.counters.received_compressed += len(frame)
+        return data
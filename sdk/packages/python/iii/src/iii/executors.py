@@ -0,0 +1,226 @@
+"""Executors that run synchronous function handlers."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from .codec import JSON_CODEC, Codec, encode_bytes, resolve_codec
+from .iii_constants import ExecutorConfig, ExecutorKind
+from .runtime_stats import Histogram
+
+DEFAULT_EXECUTOR_NAME = "default"
+
+_BUILTIN_CODECS = ("json", "orjson", "msgspec")
+
+# Codecs resolved inside process pool workers, keyed by the reference shipped with each call.
+_worker_codecs: dict[Any, Codec] = {}
+
+
+def _timed_call(handler: Callable[[Any], Any], data: Any) -> tuple[float, Any]:
+    """Run ``handler`` in a pool worker and report when it actually started."""
+    return time.monotonic(), handler(data)
+
+
+def _timed_codec_call(handler: Callable[[Any], Any], codec_ref: Any, payload: bytes) -> tuple[float, bytes]:
+    """Like ``_timed_call`` but with input and result carried as codec bytes."""
+    started = time.monotonic()
+    codec = _worker_codecs.get(codec_ref)
+    if codec is None:
+        codec = _worker_codecs[codec_ref] = resolve_codec(codec_ref)
+    return started, encode_bytes(codec, handler(codec.decode(payload)))
+
+
+def _warm() -> None:
+    """No-op submitted at pool creation so the workers start ahead of traffic."""
+
+
+def _default_max_workers(kind: ExecutorKind) -> int:
+    cpus = os.cpu_count() or 1
+    # Mirrors the concurrent.futures defaults.
+    return cpus if kind == "process" else min(32, cpus + 4)
+
+
+class ManagedExecutor:
+    """A pool running sync handlers, with saturation counters.
+
+    ``outstanding`` counts calls submitted and not yet finished; calls beyond
+    ``max_workers`` are waiting for a free worker.  ``queue_wait_us`` records
+    how long calls waited before a worker picked them up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: ExecutorConfig,
+        codec: Codec = JSON_CODEC,
+        loop_default: bool = False,
+    ) -> None:
+        self.name = name
+        self.kind = config.kind
+        self.max_workers = config.max_workers or _default_max_workers(config.kind)
+        self.initializer = config.initializer
+        self._codec = codec
+        # Built-in codecs are re-created by name in the workers; custom ones must be picklable.
+        self._codec_ref: Any = codec.name if codec.name in _BUILTIN_CODECS else codec
+        self._transfer_codec = config.kind == "process" and config.transfer == "codec"
+        self._executor = None if loop_default else self._create_executor(config)
+        self._outstanding = 0
+        self._peak_outstanding = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._saturated = 0
+        self._queue_wait_us = Histogram(max_bound=1 << 24)
+
+    def _create_executor(self, config: ExecutorConfig) -> Executor | None:
+        if config.kind == "thread":
+            return ThreadPoolExecutor(
+                max_workers=config.max_workers,
+                thread_name_prefix=f"iii-{self.name}",
+                initializer=config.initializer,
+                initargs=config.initargs,
+            )
+        if config.kind == "process":
+            # spawn avoids forking the SDK's event loop thread into the workers.
+            pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=config.initializer,
+                initargs=config.initargs,
+            )
+            if config.warm:
+                # Workers are spawned on demand; one submit per worker starts them all.
+                for _ in range(self.max_workers):
+                    pool.submit(_warm)
+            return pool
+        return None
+
+    def matches(self, config: ExecutorConfig) -> bool:
+        return (
+            config.kind == self.kind
+            and config.max_workers in (None, self.max_workers)
+            and config.initializer in (None, self.initializer)
+        )
+
+    async def run(self, handler: Callable[[Any], Any], data: Any) -> Any:
+        """Call ``handler(data)`` on this executor and return its result."""
+        self._submitted += 1
+        if self.kind == "inline":
+            try:
+                result = handler(data)
+            except Exception:
+                self._failed += 1
+                raise
+            self._completed += 1
+            return result
+
+        if self._outstanding >= self.max_workers:
+            self._saturated += 1
+        self._outstanding += 1
+        if self._outstanding > self._peak_outstanding:
+            self._peak_outstanding = self._outstanding
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        try:
+            if self._transfer_codec:
+                payload = encode_bytes(self._codec, data)
+                started_at, raw = await loop.run_in_executor(
+                    self._executor, _timed_codec_call, handler, self._codec_ref, payload
+                )
+                result = self._codec.decode(raw)
+            else:
+                started_at, result = await loop.run_in_executor(self._executor, _timed_call, handler, data)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._outstanding -= 1
+        self._completed += 1
+        self._queue_wait_us.observe(max(0, int((started_at - submitted_at) * 1_000_000)))
+        return result
+
+    def shutdown(self, cancel_futures: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=cancel_futures)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "outstanding": self._outstanding,
+            "active": min(self._outstanding, self.max_workers),
+            "waiting": max(0, self._outstanding - self.max_workers),
+            "peak_outstanding": self._peak_outstanding,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "saturated": self._saturated,
+            "queue_wait_us": self._queue_wait_us.snapshot(),
+        }
+
+
+class ExecutorRegistry:
+    """Named executors shared by the functions registered on one client."""
+
+    def __init__(self, codec: Codec = JSON_CODEC) -> None:
+        self._codec = codec
+        self._executors: dict[str, ManagedExecutor] = {}
+        # Function ids using each pool; a pool is shut down when its last user goes.
+        self._users: dict[str, set[str]] = {}
+
+    def get(self, function_id: str, config: ExecutorConfig | None) -> ManagedExecutor:
+        """Return the executor for ``function_id``, creating its pool on first use.
+
+        Raises:
+            ValueError: If ``config`` names an existing pool with a different kind,
+                size or initializer.
+        """
+        if config is None:
+            config = ExecutorConfig(name=DEFAULT_EXECUTOR_NAME)
+        name = config.name or function_id
+        executor = self._executors.get(name)
+        if executor is None:
+            # The default pool is the event loop's own executor.
+            loop_default = (
+                name == DEFAULT_EXECUTOR_NAME
+                and config.kind == "thread"
+                and config.max_workers is None
+                and config.initializer is None
+            )
+            executor = ManagedExecutor(name, config, self._codec, loop_default=loop_default)
+            self._executors[name] = executor
+        elif not executor.matches(config):
+            raise ValueError(
+                f"executor '{name}' already exists as {executor.kind} pool with {executor.max_workers} workers"
+            )
+        self._users.setdefault(name, set()).add(function_id)
+        return executor
+
+    def release(self, function_id: str) -> None:
+        """Forget ``function_id`` and shut down the pools no function uses any more.
+
+        Calls already submitted to a released pool still run to completion, and
+        registering a function under the pool's name afterwards creates a new
+        pool from its config.
+        """
+        for name, users in list(self._users.items()):
+            users.discard(function_id)
+            if not users and name != DEFAULT_EXECUTOR_NAME:
+                del self._users[name]
+                executor = self._executors.pop(name, None)
+                if executor is not None:
+                    executor.shutdown(cancel_futures=False)
+
+    def shutdown(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown()
+        self._executors.clear()
+        self._users.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {name: executor.stats() for name, executor in self._executors.items()}
@@ -1,7 +1,7 @@
 """III SDK implementation for WebSocket communication with the III Engine."""
 
 import asyncio
-import json
+import functools
 import logging
 import os
 import platform
@@ -9,25 +9,39 @@ import random
 import threading
 import traceback
 import uuid
+from dataclasses import dataclass
 from importlib.metadata import version
-from typing import Any, Awaitable, Callable, Coroutine, TypeVar, cast
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, TypeVar, cast
 
 import websockets
 from websockets.asyncio.client import ClientConnection
 
-from .channels import ChannelReader, ChannelWriter
+from .admission import OVERLOADED_ERROR_CODE, AdmissionController
+from .async_iii import AsyncIII
+from .batch import TriggerOutcome, trigger_many
+from .batching import MicroBatcher
+from .channel_mux import CAPABILITY_CHANNEL_MUX, ChannelMux, is_mux_frame
+from .channels import MAX_FRAME_SIZE, ChannelReader, ChannelWriter
+from .codec import encode_bytes, resolve_codec
+from .compression import CAPABILITY_ZSTD, ByteCounters, ZstdFrames, connect_options, is_zstd_frame
+from .executors import ExecutorRegistry
 from .iii_constants import (
     DEFAULT_RECONNECTION_CONFIG,
+    DRAIN_POLL_INTERVAL,
     MAX_QUEUE_SIZE,
+    BatchConfig,
+    ConcurrencyLimits,
+    DisconnectPolicy,
+    ExecutorConfig,
     FunctionRef,
     IIIConnectionState,
     InitOptions,
+    RegistrationConfig,
+    ResultCacheConfig,
 )
 from .iii_types import (
     FunctionInfo,
     HttpInvocationConfig,
-    InvocationResultMessage,
-    InvokeFunctionMessage,
     MessageType,
     RegisterFunctionInput,
     RegisterFunctionMessage,
@@ -47,6 +61,14 @@ from .iii_types import (
     UnregisterTriggerTypeMessage,
     WorkerInfo,
 )
+from .interceptors import MessageInterceptor, overrides, run_hooks
+from .local_dispatch import copy_plain, is_plain
+from .outbound import Frame, OutboundWriter
+from .registration import CAPABILITY_BATCH, CAPABILITY_HASH, batch_frames, registry_hash
+from .result_cache import _MISSING, ResultCache, payload_digest
+from .singleflight import SingleFlight
+from .spill import SPILLABLE_FIELDS, SpilledPayload, spill_marker, spilled_ref, write_spilled
+from .spool import OutboundBacklog
 from .stream import (
     IStream,
     StreamDeleteInput,
@@ -56,8 +78,23 @@ from .stream import (
     StreamSetInput,
 )
 from .telemetry_types import OtelConfig
+from .timeouts import TimerWheel
 from .triggers import Trigger, TriggerConfig, TriggerHandler
-from .types import Channel, RemoteFunctionData, RemoteTriggerTypeData, is_channel_ref
+from .types import Channel, RemoteFunctionData, RemoteTriggerTypeData, is_channel_ref, may_contain_channel_ref
+from .wire import (
+    HAS_OTEL,
+    InvocationIdGenerator,
+    action_dict,
+    extract_trace_context,
+    inject_trace_context,
+    invocation_result_message,
+    invoke_function_message,
+    is_sampled_out,
+)
+
+if HAS_OTEL:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace as otel_trace
 
 RemoteFunctionHandler = Callable[[Any], Awaitable[Any]]
 TResult = TypeVar("TResult")
@@ -72,6 +109,41 @@ class _TraceContextError(Exception):
         self.traceparent = traceparent
 
 
+class InvocationDisconnectedError(ConnectionError):
+    """The engine connection closed while a ``trigger()`` call awaited its result.
+
+    The function may or may not have run.  The error is retryable; retry
+    automatically with ``on_disconnect="resend"`` if the function is
+    idempotent.
+
+    Attributes:
+        function_id: The invoked function.
+        invocation_id: Id of the last attempt.
+        attempts: How many times the invocation was sent.
+    """
+
+    retryable = True
+
+    def __init__(self, function_id: str, invocation_id: str, attempts: int) -> None:
+        super().__init__(f"Connection to the engine closed while awaiting '{function_id}' (attempt {attempts})")
+        self.function_id = function_id
+        self.invocation_id = invocation_id
+        self.attempts = attempts
+
+
+@dataclass
+class _OutstandingCall:
+    """Bookkeeping for a ``trigger()`` call awaiting its result."""
+
+    invocation_id: str
+    function_id: str
+    message: dict[str, Any]
+    on_disconnect: DisconnectPolicy
+    epoch: int
+    attempts: int = 1
+    awaiting_resend: bool = False
+
+
 class III:
     """WebSocket client for communication with the III Engine.
 
@@ -90,37 +162,88 @@ class III:
     def __init__(self, address: str, options: InitOptions | None = None) -> None:
         self._address = address
         self._options = options or InitOptions()
+        self._codec = resolve_codec(self._options.codec)
         self._ws: ClientConnection | None = None
         self._functions: dict[str, RemoteFunctionData] = {}
         self._services: dict[str, RegisterServiceMessage] = {}
         self._pending: dict[str, asyncio.Future[Any]] = {}
+        self._next_invocation_id = InvocationIdGenerator()
+        self._calls: dict[str, _OutstandingCall] = {}
+        self._connection_epoch = 0
+        self._disconnect_failed = 0
+        self._local_calls = 0
+        self._disconnect_resent = 0
         self._triggers: dict[str, RegisterTriggerMessage] = {}
         self._trigger_types: dict[str, RemoteTriggerTypeData] = {}
-        self._queue: list[dict[str, Any]] = []
+        self._backlog = OutboundBacklog(self._codec, MAX_QUEUE_SIZE, self._options.spool)
         self._reconnect_task: asyncio.Task[None] | None = None
         self._running = False
+        self._draining = False
         self._receiver_task: asyncio.Task[None] | None = None
         self._functions_available_callbacks: set[Callable[[list[FunctionInfo]], None]] = set()
+        self._interceptors: list[MessageInterceptor] = []
+        self._send_hooks: tuple[Callable[[dict[str, Any]], None], ...] = ()
+        self._receive_hooks: tuple[Callable[[dict[str, Any]], None], ...] = ()
         self._functions_available_trigger: Trigger | None = None
         self._functions_available_function_id: str | None = None
         self._reconnection_config = self._options.reconnection_config or DEFAULT_RECONNECTION_CONFIG
         self._reconnect_attempt = 0
         self._connection_state: IIIConnectionState = "disconnected"
         self._worker_id: str | None = None
+        self._worker_registered = asyncio.Event()
+        self._engine_capabilities: frozenset[str] = frozenset()
+        self._registry_sync: asyncio.Future[bool] | None = None
+        self._registration_stats: dict[str, Any] = {
+            "mode": None,
+            "registry_hash": None,
+            "frames": 0,
+            "messages": 0,
+            "skipped": 0,
+        }
+        self._state_waiters: list[asyncio.Future[None]] = []
+        self._admission = AdmissionController(self._options.concurrency, self._options.scheduling)
+        self._outbound: OutboundWriter | None = None
+        if self._options.send_pipeline is not None:
+            self._outbound = OutboundWriter(self._options.send_pipeline, self._requeue_frames)
+        self._executors = ExecutorRegistry(self._codec)
+        self._batchers: dict[str, MicroBatcher] = {}
+        self._aio = AsyncIII(self)
+        self._result_cache: ResultCache | None = None
+        if self._options.result_cache is not None:
+            self._result_cache = ResultCache(self._options.result_cache, self._codec)
+        self._flights = SingleFlight(self._codec)
+        compression = self._options.compression
+        self._engine_bytes = ByteCounters()
+        self._channel_bytes = ByteCounters()
+        self._telemetry_bytes = ByteCounters()
+        self._ws_options = connect_options(compression, self._engine_bytes)
+        self._channel_ws_options = connect_options(compression, self._channel_bytes)
+        self._zstd = ZstdFrames(compression) if compression is not None and compression.zstd else None
+        self._spill_stats = {"spilled": 0, "spilled_bytes": 0, "loaded": 0}
 
         # Background event loop thread
         self._loop = asyncio.new_event_loop()
+        self._timeouts: TimerWheel[tuple[asyncio.Future[Any], str, int]] = TimerWheel(
+            self._loop, self._expire_invocations
+        )
+        self._mux: ChannelMux | None = None
+        if self._options.channel_mux is not None:
+            self._mux = ChannelMux(self._options.channel_mux, self._loop, self._write_mux_frame, self._mux_available)
         self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
         self._thread.start()
 
+        if self._result_cache is not None and self._options.result_cache is not None:
+            self._subscribe_result_cache(self._result_cache, self._options.result_cache)
+
         # Auto-connect (non-blocking, matches Node.js constructor behavior)
         self._connected_event = threading.Event()
         self._schedule_on_loop(self._async_connect())
 
     def _run_on_loop(self, coro: Coroutine[Any, Any, TResult]) -> TResult:
         if threading.current_thread() is self._thread:
+            coro.close()
             raise RuntimeError(
-                "Cannot call sync SDK methods from the event loop thread. Use async handler methods instead."
+                "Cannot call sync SDK methods from the event loop thread. Use the awaitable iii.aio methods instead."
             )
         future = asyncio.run_coroutine_threadsafe(coro, self._loop)
         return future.result()
@@ -140,6 +263,14 @@ class III:
         if cast(IIIConnectionState, self._connection_state) == "failed":
             raise ConnectionError(f"Connection to {self._address} failed after max retries")
 
+    async def _async_wait_until_connected(self) -> None:
+        while self._connection_state != "connected":
+            if self._connection_state == "failed":
+                raise ConnectionError(f"Connection to {self._address} failed after max retries")
+            waiter: asyncio.Future[None] = self._loop.create_future()
+            self._state_waiters.append(waiter)
+            await waiter
+
     def shutdown(self) -> None:
         """Gracefully shut down the client, releasing all resources.
 
@@ -157,6 +288,40 @@ class III:
         self._loop.call_soon_threadsafe(self._loop.stop)
         self._thread.join(timeout=5)
 
+    def drain(self, timeout: float) -> bool:
+        """Stop taking new invocations and wait for the running ones to finish.
+
+        Unregisters this worker's functions so the engine routes no further
+        invocations to it, then waits up to ``timeout`` seconds until no
+        invocation is in flight or queued.  Invocations already on the wire
+        when the functions are unregistered still run.  Call ``shutdown()``
+        afterwards; ``drain`` leaves the connection open.
+
+        Args:
+            timeout: Seconds to wait for in-flight invocations.
+
+        Returns:
+            ``True`` if every invocation finished within ``timeout``.
+
+        Examples:
+            >>> if not iii.drain(timeout=10):
+            ...     log.warning("Shutting down with invocations still running")
+            >>> iii.shutdown()
+        """
+        return self._run_on_loop(self._async_drain(timeout))
+
+    async def _async_drain(self, timeout: float) -> bool:
+        self._draining = True
+        if self._ws and self._ws.state.name == "OPEN":
+            for function_id in list(self._functions):
+                await self._send(UnregisterFunctionMessage(id=function_id))
+        deadline = self._loop.time() + timeout
+        while (stats := self._admission.stats())["in_flight"] or stats["queued"]:
+            if self._loop.time() >= deadline:
+                return False
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
+        return True
+
     async def _async_connect(self) -> None:
         self._running = True
         try:
@@ -169,7 +334,12 @@ class III:
                     otel_cfg = self._options.otel
                 else:
                     otel_cfg = OtelConfig(**self._options.otel)
-            init_otel(config=otel_cfg, loop=loop)
+            init_otel(
+                config=otel_cfg,
+                loop=loop,
+                codec=self._codec,
+                connect_options=connect_options(self._options.compression, self._telemetry_bytes),
+            )
             attach_event_loop(loop)
         except ImportError:
             log.debug("OpenTelemetry not available")
@@ -192,12 +362,20 @@ class III:
             if not future.done():
                 future.set_exception(Exception("iii is shutting down"))
         self._pending.clear()
+        self._timeouts.clear()
+        if self._mux is not None:
+            self._mux.reset()
+
+        if self._outbound is not None:
+            await self._outbound.stop(flush=True)
 
         if self._ws:
             await self._ws.close()
             self._ws = None
 
         self._set_connection_state("disconnected")
+        self._executors.shutdown()
+        self._backlog.close()
 
         try:
             from .telemetry import shutdown_otel_async
@@ -209,7 +387,9 @@ class III:
     async def _do_connect(self) -> None:
         try:
             log.debug(f"Connecting to {self._address}")
-            self._ws = await websockets.connect(self._address)
+            self._worker_registered.clear()
+            self._engine_capabilities = frozenset()
+            self._ws = await websockets.connect(self._address, **self._ws_options)
             log.info(f"Connected to {self._address}")
             await self._on_connected()
         except (ConnectionError, OSError, TimeoutError, asyncio.TimeoutError) as e:
@@ -227,6 +407,9 @@ class III:
             if config.max_retries != -1 and self._reconnect_attempt >= config.max_retries:
                 self._set_connection_state("failed")
                 log.error(f"Max reconnection retries ({config.max_retries}) reached, giving up")
+                for call in list(self._calls.values()):
+                    if call.awaiting_resend:
+                        self._fail_disconnected_call(call)
                 return
 
             exponential_delay = config.initial_delay_ms * (config.backoff_multiplier**self._reconnect_attempt)
@@ -244,26 +427,79 @@ class III:
     async def _on_connected(self) -> None:
         self._reconnect_attempt = 0
         self._set_connection_state("connected")
-        # Re-register all (snapshot to avoid mutation from caller thread)
-        for trigger_type_data in list(self._trigger_types.values()):
-            await self._send(trigger_type_data.message)
-        for svc in list(self._services.values()):
-            await self._send(svc)
-        for function_data in list(self._functions.values()):
-            await self._send(function_data.message)
-        for trigger in list(self._triggers.values()):
-            await self._send(trigger)
-
-        # Flush queue (swap to avoid O(n^2) pop(0))
-        pending, self._queue = self._queue, []
-        for queued_msg in pending:
-            if self._ws:
-                await self._ws.send(json.dumps(queued_msg))
+        registration = self._options.registration
+        if registration is not None:
+            # The engine's capabilities arrive in workerregistered, so read before registering.
+            self._receiver_task = asyncio.create_task(self._receive_loop())
+            await self._sync_registry(registration)
+        else:
+            for message in self._registry_messages():
+                await self._send(message)
+
+        if self._outbound is not None and self._ws:
+            self._outbound.start(self._ws)
+
+        await self._resend_calls()
+        await self._replay_backlog()
 
         # Register worker metadata
         self._register_worker_metadata()
 
-        self._receiver_task = asyncio.create_task(self._receive_loop())
+        if registration is None:
+            self._receiver_task = asyncio.create_task(self._receive_loop())
+
+    def _registry_messages(self) -> list[Any]:
+        # Snapshot to avoid mutation from caller thread
+        return [
+            *(data.message for data in list(self._trigger_types.values())),
+            *list(self._services.values()),
+            # A draining worker does not take functions back after a reconnect.
+            *(data.message for data in list(self._functions.values()) if not self._draining),
+            *list(self._triggers.values()),
+        ]
+
+    async def _sync_registry(self, config: RegistrationConfig) -> None:
+        messages = [self._to_dict(message) for message in self._registry_messages()]
+        try:
+            await asyncio.wait_for(self._worker_registered.wait(), config.capability_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            log.debug("No workerregistered message from engine, registering one frame per message")
+        stats = self._registration_stats
+        stats["messages"] = len(messages)
+        if CAPABILITY_BATCH not in self._engine_capabilities:
+            stats.update(mode="per_frame", registry_hash=None, frames=len(messages))
+            for message in messages:
+                await self._send(message)
+            return
+
+        digest = registry_hash(messages)
+        stats["registry_hash"] = digest
+        if CAPABILITY_HASH in self._engine_capabilities and await self._engine_has_registry(digest, config):
+            log.debug(f"Engine already holds registry {digest[:12]}, skipping re-registration")
+            stats.update(mode="skipped", frames=0)
+            stats["skipped"] += 1
+            return
+
+        frames = batch_frames(messages, lambda m: len(self._codec.encode(m)), config.max_frame_bytes, digest)
+        stats.update(mode="batch", frames=len(frames))
+        for frame in frames:
+            await self._send(frame)
+
+    async def _engine_has_registry(self, digest: str, config: RegistrationConfig) -> bool:
+        self._registry_sync = self._loop.create_future()
+        try:
+            await self._send(
+                {
+                    "type": MessageType.REGISTRY_SYNC.value,
+                    "registry_hash": digest,
+                    "worker_name": self._worker_name(),
+                }
+            )
+            return await asyncio.wait_for(self._registry_sync, config.capability_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._registry_sync = None
 
     async def _receive_loop(self) -> None:
         if not self._ws:
@@ -274,6 +510,11 @@ class III:
         except websockets.ConnectionClosed:
             log.debug("Connection closed")
             self._ws = None
+            if self._mux is not None:
+                self._mux.reset()
+            if self._outbound is not None:
+                await self._outbound.stop()
+            self._on_calls_disconnected()
             self._set_connection_state("disconnected")
             if self._running:
                 self._schedule_reconnect()
@@ -292,21 +533,88 @@ class III:
 
     async def _send(self, msg: Any) -> None:
         data = self._to_dict(msg)
+        if self._send_hooks:
+            run_hooks(self._send_hooks, data)
         if self._ws and self._ws.state.name == "OPEN":
-            log.debug(f"Send: {json.dumps(data)[:200]}")
-            await self._ws.send(json.dumps(data))
+            payload = self._codec.encode(data)
+            if self._options.spill is not None and len(payload) > self._options.spill.threshold_bytes:
+                payload = await self._spill(data, payload)
+            if self._zstd is not None and CAPABILITY_ZSTD in self._engine_capabilities:
+                payload = self._zstd.compress(payload)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Send: %s", payload[:200])
+            await self._write_frame(payload)
         else:
-            if len(self._queue) >= MAX_QUEUE_SIZE:
-                log.warning("Message queue full, dropping oldest message")
-                self._queue.pop(0)
-            self._queue.append(data)
+            self._backlog.push(data)
+
+    async def _spill(self, data: dict[str, Any], payload: Frame) -> Frame:
+        """Move the payload of an oversized frame to a data channel and return the slimmed frame."""
+        field = SPILLABLE_FIELDS.get(data.get("type", ""))
+        if field is None or field not in data:
+            return payload
+        if field == "data" and (not data.get("invocation_id") or data.get("action")):
+            # Enqueued payloads may outlive the channel; void calls are rare and small.
+            return payload
+        if self._receiver_task is None or self._receiver_task.done():
+            # Creating the channel needs the engine's reply, which nothing would read yet.
+            return payload
+        spill = self._options.spill
+        try:
+            channel = await self._async_create_channel(spill.buffer_size if spill else None)
+        except Exception as e:
+            log.warning(f"Could not create a channel to spill {len(payload)} bytes, sending inline: {e}")
+            return payload
+        body = encode_bytes(self._codec, data[field])
+        task = asyncio.create_task(write_spilled(channel.writer, body))
+        task.add_done_callback(self._log_task_exception)
+        self._spill_stats["spilled"] += 1
+        self._spill_stats["spilled_bytes"] += len(body)
+        return self._codec.encode({**data, field: spill_marker(channel.reader_ref, len(body))})
+
+    def _spilled_payload(self, value: Any) -> SpilledPayload | None:
+        ref = spilled_ref(value)
+        if ref is None:
+            return None
+        self._spill_stats["loaded"] += 1
+        reader = ChannelReader(self._address, ref, self._channel_ws_options, mux=self._mux)
+        return SpilledPayload(reader, value["size"], self._codec)
+
+    async def _write_frame(self, payload: Frame) -> None:
+        if self._outbound is not None:
+            await self._outbound.put(payload)
+        elif self._ws:
+            await self._ws.send(payload)
+
+    async def _write_mux_frame(self, frame: bytes) -> None:
+        if not (self._ws and self._ws.state.name == "OPEN"):
+            raise ConnectionError("engine connection is not open")
+        await self._write_frame(frame)
+
+    def _mux_available(self) -> bool:
+        return (
+            CAPABILITY_CHANNEL_MUX in self._engine_capabilities
+            and self._ws is not None
+            and self._ws.state.name == "OPEN"
+        )
+
+    def _requeue_frames(self, frames: list[Frame]) -> None:
+        for frame in frames:
+            if is_mux_frame(frame):
+                # Channel streams fail on disconnect, so their frames are not replayed.
+                continue
+            if self._zstd is not None and is_zstd_frame(frame):
+                frame = self._zstd.decompress(cast(bytes, frame))
+            msg = self._codec.decode(frame)
+            if msg.get("type") == MessageType.INVOKE_FUNCTION.value and msg.get("invocation_id") in self._calls:
+                # Tracked calls are recovered by their on_disconnect policy, not replayed.
+                continue
+            self._enqueue(msg)
 
     def _enqueue(self, msg: Any) -> None:
-        data = self._to_dict(msg)
-        if len(self._queue) >= MAX_QUEUE_SIZE:
-            log.warning("Message queue full, dropping oldest message")
-            self._queue.pop(0)
-        self._queue.append(data)
+        self._backlog.push(self._to_dict(msg))
+
+    async def _replay_backlog(self) -> None:
+        await self._backlog.replay(self._write_frame, lambda: self._ws is not None)
 
     def _send_if_connected(self, msg: Any) -> None:
         if not (self._ws and self._ws.state.name == "OPEN"):
@@ -324,7 +632,14 @@ class III:
             log.error(f"Error in fire-and-forget send: {exc}")
 
     async def _handle_message(self, raw: str | bytes) -> None:
-        data = json.loads(raw if isinstance(raw, str) else raw.decode())
+        if self._mux is not None and is_mux_frame(raw):
+            self._mux.handle_frame(cast(bytes, raw))
+            return
+        if self._zstd is not None and is_zstd_frame(raw):
+            raw = self._zstd.decompress(cast(bytes, raw))
+        data = self._codec.decode(raw)
+        if self._receive_hooks:
+            run_hooks(self._receive_hooks, data)
         msg_type = data.get("type")
         log.debug(f"Recv: {msg_type}")
 
@@ -335,25 +650,87 @@ class III:
                 data.get("error"),
             )
         elif msg_type == MessageType.INVOKE_FUNCTION.value:
-            asyncio.create_task(
-                self._handle_invoke(
-                    data.get("invocation_id"),
-                    data.get("function_id", ""),
-                    data.get("data"),
-                    data.get("traceparent"),
-                    data.get("baggage"),
-                )
+            self._admit_invoke(
+                data.get("invocation_id"),
+                data.get("function_id", ""),
+                data.get("data"),
+                data.get("traceparent"),
+                data.get("baggage"),
+                channels=may_contain_channel_ref(raw),
             )
         elif msg_type == MessageType.REGISTER_TRIGGER.value:
             asyncio.create_task(self._handle_trigger_registration(data))
         elif msg_type == MessageType.WORKER_REGISTERED.value:
             worker_id = data.get("worker_id", "")
             self._worker_id = worker_id
+            self._engine_capabilities = frozenset(data.get("capabilities") or ())
+            self._worker_registered.set()
             log.debug(f"Worker registered with ID: {worker_id}")
+        elif msg_type == MessageType.REGISTRY_SYNC_RESULT.value:
+            waiter = self._registry_sync
+            if waiter is not None and not waiter.done():
+                waiter.set_result(
+                    bool(data.get("unchanged"))
+                    and data.get("registry_hash") == self._registration_stats["registry_hash"]
+                )
+
+    def _admit_invoke(
+        self,
+        invocation_id: str | None,
+        function_id: str,
+        data: Any,
+        traceparent: str | None,
+        baggage: str | None,
+        channels: bool = True,
+    ) -> None:
+        def start() -> None:
+            asyncio.create_task(
+                self._run_admitted(invocation_id, function_id, data, traceparent, baggage, channels=channels)
+            )
+
+        if self._admission.submit(function_id, start, self._admission.flow_from_baggage(baggage)):
+            return
+
+        log.warning(f"Rejecting invocation of {function_id}: worker overloaded")
+        if invocation_id:
+            task = asyncio.create_task(
+                self._send(
+                    invocation_result_message(
+                        invocation_id,
+                        function_id,
+                        error={
+                            "code": OVERLOADED_ERROR_CODE,
+                            "message": f"Worker is overloaded, cannot accept invocation of '{function_id}'",
+                        },
+                    )
+                )
+            )
+            task.add_done_callback(self._log_task_exception)
+
+    async def _run_admitted(
+        self,
+        invocation_id: str | None,
+        function_id: str,
+        data: Any,
+        traceparent: str | None,
+        baggage: str | None,
+        channels: bool = True,
+    ) -> None:
+        handler_task: asyncio.Task[Any] | None = None
+        try:
+            handler_task = await self._handle_invoke(
+                invocation_id, function_id, data, traceparent, baggage, channels=channels
+            )
+        finally:
+            if handler_task is None:
+                self._admission.release(function_id)
+            else:
+                # A void invocation holds its slot until the handler finishes.
+                handler_task.add_done_callback(lambda _: self._admission.release(function_id))
 
     def _handle_result(self, invocation_id: str, result: Any, error: Any) -> None:
         future = self._pending.pop(invocation_id, None)
-        if not future:
+        if not future or future.done():
             log.debug(f"No pending invocation: {invocation_id}")
             return
 
@@ -363,26 +740,10 @@ class III:
             future.set_result(result)
 
     def _inject_traceparent(self) -> str | None:
-        try:
-            from opentelemetry import context as otel_context
-            from opentelemetry import propagate
-
-            carrier: dict[str, str] = {}
-            propagate.inject(carrier, context=otel_context.get_current())
-            return carrier.get("traceparent")
-        except ImportError:
-            return None
+        return inject_trace_context()[0]
 
     def _inject_baggage(self) -> str | None:
-        try:
-            from opentelemetry import context as otel_context
-            from opentelemetry import propagate
-
-            carrier: dict[str, str] = {}
-            propagate.inject(carrier, context=otel_context.get_current())
-            return carrier.get("baggage")
-        except ImportError:
-            return None
+        return inject_trace_context()[1]
 
     async def _invoke_with_otel_context(
         self,
@@ -391,50 +752,74 @@ class III:
         traceparent: str | None,
         baggage: str | None,
     ) -> tuple[Any, str | None]:
-        try:
-            from opentelemetry import context as otel_context
-            from opentelemetry import propagate, trace
+        """Run ``handler`` under a SERVER span parented on the incoming trace context.
 
-            otel_available = True
-        except ImportError:
-            otel_available = False
-
-        if not otel_available:
+        Returns the handler result and the traceparent to send back.  When the
+        incoming ``traceparent`` is sampled out, the handler runs under the
+        extracted (unsampled) parent so onward calls stay in the dropped
+        trace, and neither a span nor a response traceparent is produced.
+        """
+        if not HAS_OTEL:
             return await handler(data), None
 
-        carrier: dict[str, str] = {}
-        if traceparent:
-            carrier["traceparent"] = traceparent
-        if baggage:
-            carrier["baggage"] = baggage
-        parent_ctx = propagate.extract(carrier) if carrier else otel_context.get_current()
-        tracer = trace.get_tracer("iii-python-sdk")
+        parent_ctx = extract_trace_context(traceparent, baggage)
+        if is_sampled_out(traceparent):
+            token = otel_context.attach(parent_ctx)
+            try:
+                return await handler(data), None
+            finally:
+                otel_context.detach(token)
+
+        tracer = otel_trace.get_tracer("iii-python-sdk")
         with tracer.start_as_current_span(
             f"call {handler.__name__}",
             context=parent_ctx,
-            kind=trace.SpanKind.SERVER,
+            kind=otel_trace.SpanKind.SERVER,
         ) as span:
             try:
                 result = await handler(data)
-                span.set_status(trace.StatusCode.OK)
-                response_traceparent = self._inject_traceparent()
-                return result, response_traceparent
+                span.set_status(otel_trace.StatusCode.OK)
+                return result, inject_trace_context()[0]
             except Exception as e:
                 span.record_exception(e)
-                span.set_status(trace.StatusCode.ERROR, str(e))
-                response_traceparent = self._inject_traceparent()
+                span.set_status(otel_trace.StatusCode.ERROR, str(e))
+                response_traceparent = inject_trace_context()[0]
                 raise _TraceContextError(response_traceparent) from e
 
     def _resolve_channels(self, data: Any) -> Any:
-        if is_channel_ref(data):
-            ref = StreamChannelRef(**data)
-            return ChannelReader(self._address, ref) if ref.direction == "read" else ChannelWriter(self._address, ref)
+        """Replace channel refs in ``data`` with ``ChannelReader``/``ChannelWriter`` objects.
+
+        Containers are copied only on the path to a ref, so a payload
+        without refs is returned as the very same object, and scalars are
+        never visited individually.
+        """
         if isinstance(data, dict):
-            return {k: self._resolve_channels(v) for k, v in data.items()}
-        if isinstance(data, list):
-            return [self._resolve_channels(v) for v in data]
-        if isinstance(data, tuple):
-            return tuple(self._resolve_channels(v) for v in data)
+            if is_channel_ref(data):
+                ref = StreamChannelRef(**data)
+                if ref.direction == "read":
+                    return ChannelReader(self._address, ref, self._channel_ws_options, mux=self._mux)
+                return ChannelWriter(self._address, ref, self._channel_ws_options, mux=self._mux)
+            copy: dict[Any, Any] | None = None
+            for key, value in data.items():
+                if isinstance(value, (dict, list, tuple)):
+                    resolved = self._resolve_channels(value)
+                    if resolved is not value:
+                        if copy is None:
+                            copy = dict(data)
+                        copy[key] = resolved
+            return data if copy is None else copy
+        if isinstance(data, (list, tuple)):
+            items: list[Any] | None = None
+            for index, value in enumerate(data):
+                if isinstance(value, (dict, list, tuple)):
+                    resolved = self._resolve_channels(value)
+                    if resolved is not value:
+                        if items is None:
+                            items = list(data)
+                        items[index] = resolved
+            if items is None:
+                return data
+            return items if isinstance(data, list) else tuple(items)
         return data
 
     async def _handle_invoke(
@@ -444,7 +829,15 @@ class III:
         data: Any,
         traceparent: str | None = None,
         baggage: str | None = None,
-    ) -> None:
+        channels: bool = True,
+    ) -> asyncio.Task[Any] | None:
+        """Run the handler for ``path`` and send its result.
+
+        ``channels=False`` asserts the payload holds no channel refs (the
+        raw frame lacked the marker key) and skips the resolution walk.
+        Without an ``invocation_id`` no result is sent: the handler runs in
+        its own task, which is returned so the caller can track it.
+        """
         func = self._functions.get(path)
 
         if not func or not func.handler:
@@ -456,34 +849,40 @@ class III:
             log.warning(error_msg)
             if invocation_id:
                 await self._send(
-                    InvocationResultMessage(
-                        invocation_id=invocation_id,
-                        function_id=path,
+                    invocation_result_message(
+                        invocation_id,
+                        path,
                         error={"code": error_code, "message": error_msg},
                     )
                 )
-            return
+            return None
 
         try:
-            resolved_data = self._resolve_channels(data)
+            spilled = self._spilled_payload(data)
+            if spilled is None:
+                resolved_data = self._resolve_channels(data) if channels else data
+            elif func.stream_spilled:
+                resolved_data = spilled
+            else:
+                resolved_data = self._resolve_channels(await spilled.load())
         except Exception as e:
             log.exception("Failed to resolve channel refs")
             if invocation_id:
                 await self._send(
-                    InvocationResultMessage(
-                        invocation_id=invocation_id,
-                        function_id=path,
+                    invocation_result_message(
+                        invocation_id,
+                        path,
                         error={"code": "invocation_failed", "message": str(e), "stacktrace": traceback.format_exc()},
                     )
                 )
-            return
+            return None
 
         if not invocation_id:
             task = asyncio.create_task(
                 self._invoke_with_otel_context(func.handler, resolved_data, traceparent, baggage)
             )
             task.add_done_callback(self._log_task_exception)
-            return
+            return task
 
         try:
             result, response_traceparent = await self._invoke_with_otel_context(
@@ -493,9 +892,9 @@ class III:
                 baggage,
             )
             await self._send(
-                InvocationResultMessage(
-                    invocation_id=invocation_id,
-                    function_id=path,
+                invocation_result_message(
+                    invocation_id,
+                    path,
                     result=result,
                     traceparent=response_traceparent,
                 )
@@ -504,9 +903,9 @@ class III:
             original = te.__cause__
             log.exception(f"Error in handler {path}")
             await self._send(
-                InvocationResultMessage(
-                    invocation_id=invocation_id,
-                    function_id=path,
+                invocation_result_message(
+                    invocation_id,
+                    path,
                     error={"code": "invocation_failed", "message": str(original), "stacktrace": traceback.format_exc()},
                     traceparent=te.traceparent,
                 )
@@ -514,12 +913,13 @@ class III:
         except Exception as e:
             log.exception(f"Error in handler {path}")
             await self._send(
-                InvocationResultMessage(
-                    invocation_id=invocation_id,
-                    function_id=path,
+                invocation_result_message(
+                    invocation_id,
+                    path,
                     error={"code": "invocation_failed", "message": str(e), "stacktrace": traceback.format_exc()},
                 )
             )
+        return None
 
     async def _handle_trigger_registration(self, data: dict[str, Any]) -> None:
         trigger_type_id = data.get("trigger_type")
@@ -557,6 +957,10 @@ class III:
                 self._connected_event.set()
             else:
                 self._connected_event.clear()
+            waiters, self._state_waiters = self._state_waiters, []
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
 
     def get_connection_state(self) -> IIIConnectionState:
         """Return the current WebSocket connection state.
@@ -572,6 +976,87 @@ class III:
         """The worker ID assigned by the engine, or None if not yet registered."""
         return self._worker_id
 
+    def get_runtime_stats(self) -> dict[str, Any]:
+        """Return a snapshot of SDK runtime counters.
+
+        Sections are present only for features that are enabled.  Values are
+        cheap in-process counters; the call never touches the network.
+
+        Returns:
+            A dict with ``pending_invocations``, ``queued_messages``,
+            ``backlog`` (messages held while disconnected, and dropped,
+            spooled and replayed counts), ``invocations`` (in-flight, queued and rejected incoming
+            invocations), ``timeouts`` (scheduled deadlines and recent
+            expiry rate of outgoing calls), ``disconnected_calls``
+            (calls failed or re-sent because the connection closed),
+            ``local_calls`` (calls run on this client's own handlers),
+            ``registration`` (how the registry was last sent), ``result_cache``
+            (entries, hits and misses of the client result cache), ``coalescing``
+            (in-flight, started and joined single-flight calls), ``compression``
+            (raw and compressed bytes per connection kind), ``spill`` (payloads
+            moved to and read from data channels), ``channel_mux`` (channel
+            streams carried over the engine connection, and fallbacks to
+            dedicated sockets), ``executors`` (per-pool
+            saturation of sync handler executors), ``batching`` (batch
+            sizes per batched function) and one nested dict per enabled
+            subsystem
+            (e.g. ``outbound``).
+
+        Examples:
+            >>> stats = iii.get_runtime_stats()
+            >>> stats["outbound"]["queue_depth"]
+            0
+        """
+        stats: dict[str, Any] = {
+            "pending_invocations": len(self._pending),
+            "queued_messages": len(self._backlog),
+        }
+        stats["backlog"] = self._backlog.stats()
+        stats["invocations"] = self._admission.stats()
+        stats["timeouts"] = self._timeouts.stats()
+        if self._options.registration is not None:
+            stats["registration"] = dict(self._registration_stats)
+        stats["disconnected_calls"] = {
+            "awaiting_resend": sum(1 for call in self._calls.values() if call.awaiting_resend),
+            "failed": self._disconnect_failed,
+            "resent": self._disconnect_resent,
+        }
+        stats["coalescing"] = self._flights.stats()
+        stats["local_calls"] = self._local_calls
+        stats["executors"] = self._executors.stats()
+        if self._batchers:
+            stats["batching"] = {fid: batcher.stats() for fid, batcher in self._batchers.items()}
+        if self._outbound is not None:
+            stats["outbound"] = self._outbound.stats()
+        if self._result_cache is not None:
+            stats["result_cache"] = self._result_cache.stats()
+        if self._options.spill is not None:
+            stats["spill"] = dict(self._spill_stats)
+        if self._mux is not None:
+            stats["channel_mux"] = self._mux.stats()
+        if self._options.compression is not None:
+            stats["compression"] = {
+                "engine_deflate": self._engine_bytes.stats(),
+                "channels_deflate": self._channel_bytes.stats(),
+                "telemetry_deflate": self._telemetry_bytes.stats(),
+            }
+            if self._zstd is not None:
+                stats["compression"]["engine_zstd"] = self._zstd.counters.stats()
+        return stats
+
+    @property
+    def aio(self) -> AsyncIII:
+        """Awaitable request API for use from async code.
+
+        Unlike the blocking methods, ``iii.aio`` may be used inside async
+        function handlers and from any other running event loop.
+
+        Examples:
+            >>> async def handler(data):
+            ...     return await iii.aio.trigger({'function_id': 'greet', 'payload': data})
+        """
+        return self._aio
+
     # Public API
     def register_trigger_type(
         self,
@@ -656,6 +1141,12 @@ class III:
         self,
         func: RegisterFunctionInput | dict[str, Any],
         handler_or_invocation: RemoteFunctionHandler | HttpInvocationConfig,
+        *,
+        concurrency: ConcurrencyLimits | None = None,
+        priority: int = 0,
+        executor: ExecutorConfig | None = None,
+        batching: BatchConfig | None = None,
+        stream_spilled: bool = False,
     ) -> FunctionRef:
         """Register a function with the engine.
 
@@ -666,12 +1157,24 @@ class III:
             func: A ``RegisterFunctionInput`` or dict with ``id`` and optional
                 ``description``, ``metadata``, ``request_format``, ``response_format``.
             handler_or_invocation: Handler callable or ``HttpInvocationConfig``.
+            concurrency: Per-function admission limits applied on top of the
+                worker-wide ``InitOptions.concurrency``.
+            priority: Scheduling class for queued invocations. Higher values
+                start first; see ``SchedulingConfig``. Default ``0``.
+            executor: Where a synchronous handler runs. Defaults to the
+                event loop's shared thread pool; see ``ExecutorConfig``.
+            batching: Call the handler with lists of concurrently arriving
+                payloads instead of one payload at a time; see ``BatchConfig``.
+            stream_spilled: Pass payloads that the caller spilled to a data
+                channel as a ``SpilledPayload`` the handler reads itself,
+                instead of loading them first; see ``SpillConfig``.
 
         Returns:
             A FunctionRef with ``id`` and ``unregister()`` method.
 
         Raises:
-            ValueError: If ``id`` is empty or already registered.
+            ValueError: If ``id`` is empty or already registered, or ``executor``
+                conflicts with an existing pool of the same name.
             TypeError: If ``handler_or_invocation`` is not callable or HttpInvocationConfig.
 
         Examples:
@@ -702,6 +1205,7 @@ class III:
                 actual_type = type(handler_or_invocation).__name__
                 raise TypeError(f"handler_or_invocation must be callable or HttpInvocationConfig, got {actual_type}")
             handler = handler_or_invocation
+            pool = None if asyncio.iscoroutinefunction(handler) else self._executors.get(func.id, executor)
             msg = RegisterFunctionMessage(
                 id=func.id,
                 description=func.description,
@@ -711,22 +1215,45 @@ class III:
             )
             self._send_if_connected(msg)
 
-            if asyncio.iscoroutinefunction(handler):
+            # The wrappers carry the handler's name, which the invocation span is named after.
+            if pool is None:
 
+                @functools.wraps(handler)
                 async def wrapped(input_data: Any) -> Any:
                     return await handler(input_data)
 
             else:
 
+                @functools.wraps(handler)
                 async def wrapped(input_data: Any) -> Any:
-                    return await self._loop.run_in_executor(None, handler, input_data)
+                    return await pool.run(handler, input_data)
 
-            self._functions[func.id] = RemoteFunctionData(message=msg, handler=wrapped)
+            if batching is not None:
+                batcher = self._batchers[func.id] = MicroBatcher(func.id, wrapped, batching)
+
+                @functools.wraps(handler)
+                async def submit(input_data: Any) -> Any:
+                    return await batcher.submit(input_data)
+
+                self._functions[func.id] = RemoteFunctionData(
+                    message=msg, handler=submit, stream_spilled=stream_spilled
+                )
+            else:
+                self._functions[func.id] = RemoteFunctionData(
+                    message=msg, handler=wrapped, stream_spilled=stream_spilled
+                )
+            if concurrency is not None or priority:
+                self._admission.configure_function(func.id, concurrency, priority)
+        if self._result_cache is not None:
+            self._result_cache.learn([(func.id, func.metadata)])
 
         func_id = func.id
 
         def unregister() -> None:
             self._functions.pop(func_id, None)
+            self._batchers.pop(func_id, None)
+            self._admission.remove_function(func_id)
+            self._executors.release(func_id)
             self._send_if_connected(UnregisterFunctionMessage(id=func_id))
 
         return FunctionRef(id=func_id, unregister=unregister)
@@ -787,58 +1314,302 @@ class III:
         return self._run_on_loop(self._async_trigger(request))
 
     async def _async_trigger(self, request: "dict[str, Any] | TriggerRequest") -> Any:
-        req = request if isinstance(request, dict) else request.model_dump()
-        function_id = req["function_id"]
-        payload = req.get("payload")
-        action = req.get("action")
+        if isinstance(request, dict):
+            function_id = request["function_id"]
+            payload = request.get("payload")
+            action = request.get("action")
+            timeout_ms = request.get("timeout_ms") or self._options.invocation_timeout_ms
+            on_disconnect = request.get("on_disconnect") or self._options.on_disconnect
+            use_cache = request.get("cache")
+            coalesce = request.get("coalesce")
+            local = request.get("local")
+        else:
+            function_id = request.function_id
+            payload = request.payload
+            action = request.action
+            timeout_ms = request.timeout_ms or self._options.invocation_timeout_ms
+            on_disconnect = request.on_disconnect or self._options.on_disconnect
+            use_cache = request.cache
+            coalesce = request.coalesce
+            local = request.local
+
+        action = action_dict(action)
+        if action is not None:
+            return await self._call_engine(function_id, payload, action, timeout_ms, on_disconnect)
+
+        if local is None:
+            local = self._options.local_dispatch
+        cache = self._result_cache
+        ttl_ms = cache.ttl_ms(function_id) if cache is not None else None
+        if coalesce is None:
+            coalesce = self._options.coalesce_calls
+        digest = payload_digest(payload) if ttl_ms or coalesce else None
+        if digest is None:
+            return await self._call(function_id, payload, timeout_ms, on_disconnect, local)
+
+        if cache is not None and ttl_ms and use_cache is not False:
+            hit, cached = cache.get(function_id, digest)
+            if hit:
+                return cached
+        if coalesce:
+            result = await self._flights.call(
+                function_id,
+                digest,
+                on_disconnect,
+                timeout_ms,
+                lambda flight_timeout_ms: self._call(function_id, payload, flight_timeout_ms, on_disconnect, local),
+            )
+        else:
+            result = await self._call(function_id, payload, timeout_ms, on_disconnect, local)
+        if cache is not None and ttl_ms:
+            cache.put(function_id, digest, result, ttl_ms)
+        return result
 
-        timeout_ms = req.get("timeout_ms") or self._options.invocation_timeout_ms
+    async def _call(
+        self,
+        function_id: str,
+        payload: Any,
+        timeout_ms: int,
+        on_disconnect: DisconnectPolicy,
+        local: bool,
+    ) -> Any:
+        """Make a request/response call, on a handler of this client when ``local`` allows it."""
+        if local:
+            func = self._functions.get(function_id)
+            if func is not None and func.handler is not None:
+                return await self._call_locally(function_id, func.handler, payload, timeout_ms)
+        return await self._call_engine(function_id, payload, None, timeout_ms, on_disconnect)
+
+    async def _call_locally(
+        self,
+        function_id: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        payload: Any,
+        timeout_ms: int,
+    ) -> Any:
+        """Invoke a handler registered on this client without the engine round trip.
+
+        The call passes admission control and runs under a SERVER span parented
+        on the caller's trace context, like an invocation arriving from the
+        engine.  On timeout the caller stops waiting and the handler runs on,
+        and a failing handler surfaces as the same error the engine would relay.
+        """
+        traceparent, baggage = inject_trace_context()
+        if is_plain(payload):
+            payload = copy_plain(payload)
+        else:
+            payload = self._resolve_channels(self._codec.decode(self._codec.encode(payload)))
+        invocation_id = self._next_invocation_id()
+        future: asyncio.Future[Any] = self._loop.create_future()
 
-        timeout_secs = timeout_ms / 1000.0
+        def start() -> None:
+            if future.done():
+                # Timed out or cancelled while queued for admission.
+                self._admission.release(function_id)
+                return
+            task = asyncio.create_task(self._invoke_with_otel_context(handler, payload, traceparent, baggage))
+            task.add_done_callback(functools.partial(self._settle_local_call, function_id, future))
 
-        if isinstance(action, dict):
-            if action.get("type") == "enqueue":
-                action = TriggerActionEnqueue(queue=action["queue"])
-            elif action.get("type") == "void":
-                action = TriggerActionVoid()
+        self._local_calls += 1
+        self._timeouts.schedule(invocation_id, timeout_ms, (future, function_id, timeout_ms))
+        try:
+            if not self._admission.submit(function_id, start, self._admission.flow_from_baggage(baggage)):
+                log.warning(f"Rejecting invocation of {function_id}: worker overloaded")
+                error = {
+                    "code": OVERLOADED_ERROR_CODE,
+                    "message": f"Worker is overloaded, cannot accept invocation of '{function_id}'",
+                }
+                raise Exception(str(error))
+            return await future
+        finally:
+            self._timeouts.cancel(invocation_id)
+
+    def _settle_local_call(
+        self,
+        function_id: str,
+        future: asyncio.Future[Any],
+        task: asyncio.Task[tuple[Any, str | None]],
+    ) -> None:
+        self._admission.release(function_id)
+        if task.cancelled():
+            future.cancel()
+            return
+        exc = task.exception()
+        if exc is None:
+            result = task.result()[0]
+            try:
+                if is_plain(result):
+                    result = copy_plain(result)
+                else:
+                    result = self._codec.decode(self._codec.encode(result))
+            except Exception as e:
+                exc = e
+            else:
+                if not future.done():
+                    future.set_result(result)
+                return
+        if isinstance(exc, _TraceContextError) and exc.__cause__ is not None:
+            exc = exc.__cause__
+        log.error(f"Error in handler {function_id}", exc_info=exc)
+        if future.done():
+            return
+        stacktrace = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+        error = Exception(str({"code": "invocation_failed", "message": str(exc), "stacktrace": stacktrace}))
+        error.__cause__ = exc
+        future.set_exception(error)
+
+    async def _call_engine(
+        self,
+        function_id: str,
+        payload: Any,
+        action: dict[str, Any] | None,
+        timeout_ms: int,
+        on_disconnect: DisconnectPolicy,
+    ) -> Any:
+        """Send one invocation to the engine and, unless it is ``Void``, await its result."""
+        action_type = action.get("type") if action else None
+        traceparent, baggage = inject_trace_context()
 
         # Void: fire-and-forget, no response expected
-        if isinstance(action, TriggerActionVoid):
+        if action_type == "void":
             await self._send(
-                InvokeFunctionMessage(
-                    function_id=function_id,
-                    data=payload,
-                    traceparent=self._inject_traceparent(),
-                    baggage=self._inject_baggage(),
-                    action=action,
-                )
+                invoke_function_message(function_id, payload, traceparent=traceparent, baggage=baggage, action=action)
             )
             return None
 
         # Enqueue and default: send invocation_id, await response
-        invocation_id = str(uuid.uuid4())
+        invocation_id = self._next_invocation_id()
         future: asyncio.Future[Any] = self._loop.create_future()
 
+        message = invoke_function_message(
+            function_id,
+            payload,
+            invocation_id,
+            traceparent,
+            baggage,
+            action if action_type == "enqueue" else None,
+        )
+        call = _OutstandingCall(invocation_id, function_id, message, on_disconnect, self._connection_epoch)
+
         self._pending[invocation_id] = future
+        self._calls[invocation_id] = call
+        self._timeouts.schedule(invocation_id, timeout_ms, (future, function_id, timeout_ms))
+        try:
+            await self._send(message)
+            result = await future
+            spilled = self._spilled_payload(result)
+            return result if spilled is None else await spilled.load()
+        finally:
+            # Runs on success, timeout, send failure and cancellation alike, so
+            # no map keeps an entry for a call nobody is waiting on.  A re-sent
+            # call is keyed by its latest invocation id.
+            self._pending.pop(call.invocation_id, None)
+            self._calls.pop(call.invocation_id, None)
+            self._timeouts.cancel(invocation_id)
+
+    def _expire_invocations(self, expired: list[tuple[asyncio.Future[Any], str, int]]) -> None:
+        for future, function_id, timeout_ms in expired:
+            if not future.done():
+                future.set_exception(TimeoutError(f"Invocation of '{function_id}' timed out after {timeout_ms}ms"))
+
+    def _on_calls_disconnected(self) -> None:
+        """Apply each outstanding call's ``on_disconnect`` policy after the socket closed."""
+        epoch = self._connection_epoch
+        self._connection_epoch += 1
+        for call in list(self._calls.values()):
+            # Calls made while disconnected are still in the backlog, unsent.
+            if call.epoch != epoch:
+                continue
+            if call.on_disconnect == "resend" and call.attempts < self._options.max_invocation_attempts:
+                call.awaiting_resend = True
+            else:
+                self._fail_disconnected_call(call)
+
+    def _fail_disconnected_call(self, call: "_OutstandingCall") -> None:
+        future = self._pending.get(call.invocation_id)
+        if future is not None and not future.done():
+            self._disconnect_failed += 1
+            future.set_exception(InvocationDisconnectedError(call.function_id, call.invocation_id, call.attempts))
+
+    async def _resend_calls(self) -> None:
+        for call in [c for c in self._calls.values() if c.awaiting_resend]:
+            future = self._pending.pop(call.invocation_id, None)
+            del self._calls[call.invocation_id]
+            if future is None or future.done():
+                continue
+            # A fresh id keeps a late reply to the lost attempt from resolving this one.
+            call.invocation_id = self._next_invocation_id()
+            call.message = {**call.message, "invocation_id": call.invocation_id}
+            call.attempts += 1
+            call.epoch = self._connection_epoch
+            call.awaiting_resend = False
+            self._pending[call.invocation_id] = future
+            self._calls[call.invocation_id] = call
+            self._disconnect_resent += 1
+            log.debug(f"Re-sending invocation of {call.function_id} (attempt {call.attempts})")
+            await self._send(call.message)
+
+    def trigger_many(
+        self,
+        requests: "Iterable[dict[str, Any] | TriggerRequest]",
+        *,
+        max_concurrency: int | None = None,
+        timeout_ms: int | None = None,
+        ordered: bool = True,
+        fail_fast: bool = False,
+    ) -> list[TriggerOutcome]:
+        """Invoke many functions concurrently over the shared connection.
+
+        Invocations are pipelined: up to ``max_concurrency`` are in flight at
+        once and the next one is sent as soon as a slot frees up.  Each
+        request keeps its own ``timeout_ms`` (falling back to ``timeout_ms``
+        here, then ``InitOptions.invocation_timeout_ms``), measured from when
+        it is sent.
 
-        enqueue_action: TriggerActionEnqueue | None = action if isinstance(action, TriggerActionEnqueue) else None
+        Args:
+            requests: ``TriggerRequest`` objects or dicts, as for ``trigger()``.
+            max_concurrency: Maximum invocations in flight. ``None`` sends all at once.
+            timeout_ms: Default timeout for requests that do not set one.
+            ordered: Return outcomes in input order (default) or in completion order.
+            fail_fast: Cancel the remaining invocations and raise the first error
+                instead of recording it in the outcome.
 
-        await self._send(
-            InvokeFunctionMessage(
-                function_id=function_id,
-                data=payload,
-                invocation_id=invocation_id,
-                traceparent=self._inject_traceparent(),
-                baggage=self._inject_baggage(),
-                action=enqueue_action,
+        Returns:
+            One ``TriggerOutcome`` per request, holding its ``result`` or ``error``.
+
+        Raises:
+            Exception: The first failure, when ``fail_fast`` is set.
+
+        Examples:
+            >>> outcomes = iii.trigger_many(
+            ...     [{'function_id': 'score', 'payload': doc} for doc in docs],
+            ...     max_concurrency=32,
+            ... )
+            >>> scores = [o.result for o in outcomes if o.ok]
+        """
+        return self._run_on_loop(
+            self._async_trigger_many(
+                requests, max_concurrency=max_concurrency, timeout_ms=timeout_ms, ordered=ordered, fail_fast=fail_fast
             )
         )
 
-        try:
-            return await asyncio.wait_for(future, timeout=timeout_secs)
-        except asyncio.TimeoutError:
-            self._pending.pop(invocation_id, None)
-            raise TimeoutError(f"Invocation of '{function_id}' timed out after {timeout_ms}ms")
+    async def _async_trigger_many(
+        self,
+        requests: "Iterable[dict[str, Any] | TriggerRequest]",
+        *,
+        max_concurrency: int | None = None,
+        timeout_ms: int | None = None,
+        ordered: bool = True,
+        fail_fast: bool = False,
+    ) -> list[TriggerOutcome]:
+        return await trigger_many(
+            self._async_trigger,
+            requests,
+            max_concurrency=max_concurrency,
+            timeout_ms=timeout_ms,
+            ordered=ordered,
+            fail_fast=fail_fast,
+        )
 
     def list_functions(self) -> list[FunctionInfo]:
         """List all functions registered with the engine across all workers.
@@ -855,7 +1626,10 @@ class III:
     async def _async_list_functions(self) -> list[FunctionInfo]:
         result = await self._async_trigger({"function_id": "engine::functions::list", "payload": {}})
         functions_data = result.get("functions", [])
-        return [FunctionInfo(**f) for f in functions_data]
+        functions = [FunctionInfo(**f) for f in functions_data]
+        if self._result_cache is not None:
+            self._result_cache.learn((f.function_id, f.metadata) for f in functions)
+        return functions
 
     def list_workers(self) -> list[WorkerInfo]:
         """List all workers currently connected to the engine.
@@ -900,7 +1674,7 @@ class III:
         triggers_data = result.get("triggers", [])
         return [TriggerInfo(**t) for t in triggers_data]
 
-    def create_channel(self, buffer_size: int | None = None) -> Channel:
+    def create_channel(self, buffer_size: int | None = None, frame_size: int | None = None) -> Channel:
         """Create a streaming channel pair for worker-to-worker data transfer.
 
         The returned ``Channel`` contains a local ``writer`` / ``reader``
@@ -909,6 +1683,8 @@ class III:
 
         Args:
             buffer_size: Buffer capacity for the channel. Defaults to ``64``.
+            frame_size: Largest binary frame the local ``writer`` sends.
+                Defaults to 64 KiB.
 
         Returns:
             A ``Channel`` with ``writer``, ``reader``, ``writer_ref``, and
@@ -919,9 +1695,9 @@ class III:
             >>> fn = iii.register_function({"id": "producer"}, producer_handler)
             >>> iii.trigger({"function_id": "producer", "payload": {"output": ch.writer_ref}})
         """
-        return self._run_on_loop(self._async_create_channel(buffer_size))
+        return self._run_on_loop(self._async_create_channel(buffer_size, frame_size))
 
-    async def _async_create_channel(self, buffer_size: int | None = None) -> Channel:
+    async def _async_create_channel(self, buffer_size: int | None = None, frame_size: int | None = None) -> Channel:
         result = await self._async_trigger(
             {
                 "function_id": "engine::channels::create",
@@ -931,19 +1707,28 @@ class III:
         writer_ref = StreamChannelRef(**result["writer"])
         reader_ref = StreamChannelRef(**result["reader"])
         return Channel(
-            writer=ChannelWriter(self._address, writer_ref),
-            reader=ChannelReader(self._address, reader_ref),
+            writer=ChannelWriter(
+                self._address,
+                writer_ref,
+                self._channel_ws_options,
+                frame_size=frame_size or MAX_FRAME_SIZE,
+                mux=self._mux,
+            ),
+            reader=ChannelReader(self._address, reader_ref, self._channel_ws_options, mux=self._mux),
             writer_ref=writer_ref,
             reader_ref=reader_ref,
         )
 
+    def _worker_name(self) -> str:
+        return self._options.worker_name or f"{platform.node()}:{os.getpid()}"
+
     def _get_worker_metadata(self) -> dict[str, Any]:
         try:
             sdk_version = version("iii-sdk")
         except Exception:
             sdk_version = "unknown"
 
-        worker_name = self._options.worker_name or f"{platform.node()}:{os.getpid()}"
+        worker_name = self._worker_name()
 
         telemetry_opts = self._options.telemetry
         language = (
@@ -957,7 +1742,7 @@ class III:
             "amplitude_api_key": telemetry_opts.amplitude_api_key if telemetry_opts else None,
         }
 
-        return {
+        metadata: dict[str, Any] = {
             "runtime": "python",
             "version": sdk_version,
             "name": worker_name,
@@ -965,14 +1750,24 @@ class III:
             "pid": os.getpid(),
             "telemetry": telemetry,
         }
+        capabilities: list[str] = []
+        if self._zstd is not None:
+            # Lets the engine send large frames to this worker zstd-compressed.
+            capabilities.append(CAPABILITY_ZSTD)
+        if self._mux is not None:
+            capabilities.append(CAPABILITY_CHANNEL_MUX)
+        if capabilities:
+            metadata["capabilities"] = capabilities
+        return metadata
 
     def _register_worker_metadata(self) -> None:
-        msg = InvokeFunctionMessage(
-            function_id="engine::workers::register",
-            data=self._get_worker_metadata(),
-            traceparent=self._inject_traceparent(),
-            baggage=self._inject_baggage(),
-            action=TriggerActionVoid(),
+        traceparent, baggage = inject_trace_context()
+        msg = invoke_function_message(
+            "engine::workers::register",
+            self._get_worker_metadata(),
+            traceparent=traceparent,
+            baggage=baggage,
+            action={"type": "void"},
         )
         asyncio.run_coroutine_threadsafe(self._send(msg), self._loop)
 
@@ -1028,6 +1823,94 @@ class III:
 
         return unsubscribe
 
+    def invalidate_cache(self, function_id: str | None = None, payload: Any = _MISSING) -> int:
+        """Drop results from the client result cache.
+
+        Args:
+            function_id: Function whose results to drop. ``None`` clears the
+                whole cache.
+            payload: Drop only the result cached for this payload.
+
+        Returns:
+            The number of cached results removed; ``0`` when the cache is disabled.
+
+        Examples:
+            >>> iii.invalidate_cache("prices.get", {"sku": "a-1"})
+            >>> iii.invalidate_cache("prices.get")
+        """
+        cache = self._result_cache
+        if cache is None:
+            return 0
+        if threading.current_thread() is self._thread:
+            return cache.invalidate(function_id, payload)
+
+        async def invalidate() -> int:
+            return cache.invalidate(function_id, payload)
+
+        return self._run_on_loop(invalidate())
+
+    def _subscribe_result_cache(self, cache: ResultCache, config: ResultCacheConfig) -> None:
+        if config.discover:
+            self.on_functions_available(lambda functions: cache.learn((f.function_id, f.metadata) for f in functions))
+        if config.invalidation is not None:
+            function_id = f"iii.result_cache.invalidate.{uuid.uuid4()}"
+
+            async def invalidate(data: Any) -> None:
+                data = data or {}
+                if data.get("function_id") is None:
+                    cache.invalidate()
+                elif "payload" in data:
+                    cache.invalidate(data["function_id"], data["payload"])
+                else:
+                    cache.invalidate(data["function_id"])
+
+            self.register_function({"id": function_id}, invalidate)
+            self.register_trigger(
+                {
+                    "type": config.invalidation["type"],
+                    "function_id": function_id,
+                    "config": config.invalidation.get("config", {}),
+                }
+            )
+
+    def add_interceptor(self, interceptor: MessageInterceptor) -> Callable[[], None]:
+        """Install a hook that sees every protocol message this client sends or receives.
+
+        Interceptors work on the message dicts the client already builds and
+        decodes, so they add no extra encode or parse per frame.  They run in
+        the order they were added.
+
+        Args:
+            interceptor (MessageInterceptor): The interceptor to install.
+
+        Returns:
+            A callable that removes the interceptor when called.
+
+        Examples:
+            >>> class Stamp(MessageInterceptor):
+            ...     def on_send(self, message):
+            ...         message.setdefault("baggage", "tenant=acme")
+            >>> remove = iii.add_interceptor(Stamp())
+            >>> # later ...
+            >>> remove()
+        """
+        self._interceptors.append(interceptor)
+        self._rebuild_hooks()
+
+        def remove() -> None:
+            if interceptor in self._interceptors:
+                self._interceptors.remove(interceptor)
+                self._rebuild_hooks()
+
+        return remove
+
+    def _rebuild_hooks(self) -> None:
+        # Hooks are bound once here so the per-message cost without
+        # interceptors is a single truthiness check.
+        interceptors = list(self._interceptors)
+        self._send_hooks = tuple(i.on_send for i in interceptors if overrides(i, "on_send"))
+        self._receive_hooks = tuple(i.on_receive for i in interceptors if overrides(i, "on_receive"))
+
     def create_stream(self, stream_name: str, stream: IStream[Any]) -> None:
         """Register a custom stream implementation, overriding the engine default.
 
@@ -1,16 +1,24 @@
 """Constants and configuration types for the III SDK (mirrors iii-constants.ts)."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Literal
 
+from .codec import Codec
 from .telemetry_types import OtelConfig
 
+ExecutorKind = Literal["thread", "process", "inline"]
+
+ExecutorTransfer = Literal["pickle", "codec"]
+
+DisconnectPolicy = Literal["fail", "resend"]
+
 IIIConnectionState = Literal["disconnected", "connecting", "connected", "reconnecting", "failed"]
 
 ConnectionStateCallback = Callable[["IIIConnectionState"], None]
 
 DEFAULT_INVOCATION_TIMEOUT_MS = 30000
 MAX_QUEUE_SIZE = 1000
+DRAIN_POLL_INTERVAL = 0.05
 
 
 @dataclass
@@ -35,6 +43,280 @@ class ReconnectionConfig:
 DEFAULT_RECONNECTION_CONFIG = ReconnectionConfig()
 
 
+@dataclass
+class SendPipelineConfig:
+    """Configuration for the outbound send pipeline.
+
+    When enabled, messages are handed to a single writer task that coalesces
+    whatever is pending and writes it back-to-back, instead of every caller
+    awaiting its own socket write.
+
+    Attributes:
+        max_batch_bytes: Flush once this many bytes are pending. Default ``65536``.
+        max_delay_us: Longest time to wait for more messages before flushing,
+            in microseconds. ``0`` flushes whatever is ready immediately. Default ``200``.
+        max_queue_size: Capacity of the outbound queue. Senders wait when it is full.
+            Default ``10000``.
+    """
+
+    max_batch_bytes: int = 64 * 1024
+    max_delay_us: int = 200
+    max_queue_size: int = 10000
+
+
+@dataclass
+class ConcurrencyLimits:
+    """Admission limits for incoming invocations.
+
+    Used worker-wide via ``InitOptions.concurrency`` and per function via
+    ``register_function(..., concurrency=...)``.  An invocation starts only
+    when both the worker and its function are below ``max_concurrent``.
+    Otherwise it waits in a bounded queue; once that is full the engine
+    receives an ``overloaded`` error so it can route or retry elsewhere.
+
+    Attributes:
+        max_concurrent: Maximum invocations running at once. ``None`` means unlimited.
+        max_queued: Maximum invocations waiting for a slot. Default ``0`` (reject immediately).
+    """
+
+    max_concurrent: int | None = None
+    max_queued: int = 0
+
+
+@dataclass
+class SchedulingConfig:
+    """Ordering of invocations waiting in the admission queue.
+
+    Queued invocations run in priority order (see
+    ``register_function(..., priority=...)``).  Within a priority class,
+    flows identified by the ``fairness_key`` baggage entry share capacity in
+    proportion to their weight, so one busy tenant cannot starve the others.
+    Scheduling only takes effect when ``ConcurrencyLimits`` cause invocations
+    to queue.
+
+    Attributes:
+        fairness_key: Baggage key identifying the flow, e.g. ``"tenant"``.
+            ``None`` (default) keeps FIFO order within a priority class.
+        weights: Relative share per flow value. Flows not listed use ``default_weight``.
+        default_weight: Weight for flows without an explicit entry. Default ``1.0``.
+    """
+
+    fairness_key: str | None = None
+    weights: dict[str, float] = field(default_factory=dict)
+    default_weight: float = 1.0
+
+
+@dataclass
+class ExecutorConfig:
+    """Where a synchronous handler runs.
+
+    By default sync handlers share the event loop's default thread pool, so
+    slow blocking handlers can starve unrelated fast ones.  Pass an
+    ``ExecutorConfig`` to ``register_function(..., executor=...)`` to isolate
+    them.
+
+    Attributes:
+        kind: ``"thread"`` (default) runs in a thread pool, ``"process"`` in a
+            process pool, and ``"inline"`` calls the handler directly on the
+            SDK event loop, which is only safe for handlers that never block.
+            Process pools use the ``spawn`` start method, so the handler must
+            be importable (a module-level function).
+        name: Pool name. Functions naming the same pool share it. Defaults to
+            the function id, i.e. a pool dedicated to that function.
+        max_workers: Pool size. Defaults to the ``concurrent.futures`` default
+            (one process per CPU for process pools).
+        initializer: Called once in every pool worker before it runs a handler,
+            e.g. to load a model or open a connection.
+        initargs: Positional arguments for ``initializer``.
+        warm: Start all process pool workers at registration instead of on the
+            first invocations. Default ``True``.
+        transfer: How process pools move input and results between processes.
+            ``"pickle"`` (default) pickles them; ``"codec"`` ships the client's
+            wire-codec bytes, which is faster for large JSON payloads with
+            ``orjson``/``msgspec`` and guarantees wire-compatible results.
+    """
+
+    kind: ExecutorKind = "thread"
+    name: str | None = None
+    max_workers: int | None = None
+    initializer: Callable[..., None] | None = None
+    initargs: tuple[Any, ...] = ()
+    warm: bool = True
+    transfer: ExecutorTransfer = "pickle"
+
+
+@dataclass
+class BatchConfig:
+    """Micro-batching of concurrent invocations of one function.
+
+    Pass to ``register_function(..., batching=...)``.  The handler is then
+    called with a list of payloads and must return a list of results in the
+    same order.  An ``Exception`` instance in the returned list fails only
+    that invocation.
+
+    Attributes:
+        max_batch_size: Dispatch as soon as this many invocations are waiting. Default ``32``.
+        max_wait_ms: Longest time the first invocation of a batch waits for
+            others to join it. Default ``5``.
+    """
+
+    max_batch_size: int = 32
+    max_wait_ms: float = 5
+
+
+@dataclass
+class SpoolConfig:
+    """Disk spool for messages sent while the engine is unreachable.
+
+    While disconnected, the first ``MAX_QUEUE_SIZE`` outgoing messages are
+    held in memory; with a spool configured, later ones are appended to
+    ``path`` instead of pushing out the oldest.  On reconnect the memory
+    backlog and then the spool are replayed in order, reading the file one
+    record at a time.  Undelivered records survive a restart and are
+    replayed by the next client using the same path, so delivery is
+    at-least-once.
+
+    Attributes:
+        path: Spool file. Must not be shared between worker processes.
+        max_bytes: Largest spool file size. Messages that do not fit are
+            dropped and counted. Default 64 MiB.
+    """
+
+    path: str
+    max_bytes: int = 64 * 1024 * 1024
+
+
+@dataclass
+class RegistrationConfig:
+    """Batched re-registration of the worker's registry on connect.
+
+    After connecting, the client waits for the engine's ``workerregistered``
+    message, which lists the engine's capabilities.  Engines that support
+    it receive the whole registry (trigger types, services, functions and
+    triggers) in a few large frames, and engines that keep a hash of each
+    worker's registry let an unchanged registry be skipped entirely.  Other
+    engines get one frame per registration.
+
+    Attributes:
+        max_frame_bytes: Target encoded size of each batch frame. Default 256 KiB.
+        capability_timeout_ms: How long to wait for ``workerregistered``
+            before falling back to one frame per registration. Default ``2000``.
+    """
+
+    max_frame_bytes: int = 256 * 1024
+    capability_timeout_ms: int = 2000
+
+
+@dataclass
+class ResultCacheConfig:
+    """Client-side cache of ``trigger()`` results for cacheable functions.
+
+    A function is cacheable when its registration metadata declares a TTL,
+    ``{"cache": {"ttl_ms": 30000}}``, or when ``functions`` names it.  Only
+    successful request/response calls are cached; ``Enqueue`` and ``Void``
+    calls always go to the engine.  The client learns declarations from
+    functions it registers itself, from ``list_functions()`` results and,
+    with ``discover``, from function-availability events.
+
+    Attributes:
+        max_entries: Most results held before the least recently used is
+            evicted. Default ``1024``.
+        max_bytes: Most encoded result bytes held. Default 16 MiB.
+        functions: TTL in milliseconds per function id, overriding or
+            replacing the function's own declaration.
+        discover: Subscribe to function-availability events to learn the
+            declarations of functions registered by other workers. Default ``True``.
+        invalidation: Trigger ``{"type": ..., "config": ...}`` to bind an
+            invalidation function to, e.g. a pubsub topic. Its payload
+            ``{"function_id": ..., "payload": ...}`` drops one entry; omit
+            ``payload`` to drop every entry of the function, or send ``{}``
+            to clear the cache.
+    """
+
+    max_entries: int = 1024
+    max_bytes: int = 16 * 1024 * 1024
+    functions: dict[str, int] = field(default_factory=dict)
+    discover: bool = True
+    invalidation: dict[str, Any] | None = None
+
+
+@dataclass
+class CompressionConfig:
+    """Compression of the worker, telemetry and channel WebSocket connections.
+
+    ``permessage-deflate`` is offered in the WebSocket handshake of every
+    connection and used when the peer accepts it.  The optional zstd body
+    codec compresses engine frames whose encoded size reaches
+    ``zstd_threshold_bytes`` into binary zstd frames; it is only used once the
+    engine has advertised the ``zstd_frames`` capability, and frames the engine
+    sends back compressed are decompressed transparently.  Since deflate would
+    compress the zstd frames a second time, turn ``deflate`` off when the
+    engine connection mostly carries large payloads.
+
+    Attributes:
+        deflate: Offer ``permessage-deflate``. Default ``True``.
+        deflate_level: zlib compression level, ``1`` (fastest) to ``9``. Default ``6``.
+        deflate_mem_level: zlib memory level, ``1`` to ``9``. Default ``5``.
+        max_window_bits: LZ77 window the client compresses with, ``9`` to
+            ``15``. Smaller windows use less memory per connection. Default ``15``.
+        no_context_takeover: Reset the compression context after every
+            message, trading ratio for memory. Default ``False``.
+        zstd: Enable the zstd body codec on the engine connection. Requires
+            ``pip install 'iii-sdk[zstd]'``. Default ``False``.
+        zstd_level: zstd compression level. Default ``3``.
+        zstd_threshold_bytes: Smallest encoded frame that is zstd-compressed. Default 16 KiB.
+    """
+
+    deflate: bool = True
+    deflate_level: int = 6
+    deflate_mem_level: int = 5
+    max_window_bits: int = 15
+    no_context_takeover: bool = False
+    zstd: bool = False
+    zstd_level: int = 3
+    zstd_threshold_bytes: int = 16 * 1024
+
+
+@dataclass
+class SpillConfig:
+    """Move oversized invocation payloads and results to data channels.
+
+    A request/response ``trigger()`` payload or a handler result whose
+    encoded size exceeds ``threshold_bytes`` is streamed through a data
+    channel created with ``engine::channels::create`` and only a channel
+    ref travels in the frame.  Receivers read it back transparently, so
+    every worker that may receive a spilled value must run an SDK that
+    understands spill markers.
+
+    Attributes:
+        threshold_bytes: Largest payload sent inline. Default 256 KiB.
+        buffer_size: Buffer size requested for spill channels. ``None``
+            uses the engine default.
+    """
+
+    threshold_bytes: int = 256 * 1024
+    buffer_size: int | None = None
+
+
+@dataclass
+class ChannelMuxConfig:
+    """Carry data channels over the worker's engine connection.
+
+    Channel ends opened on the SDK event loop are sent as tagged binary
+    frames on the existing engine connection instead of each opening its
+    own WebSocket, saving a TCP and WebSocket handshake per channel end.
+    Used only once the engine advertises the ``channel_mux`` capability;
+    otherwise, and for channel ends used from other event loops, the
+    dedicated per-channel socket is kept.
+
+    Attributes:
+        window_bytes: Unacknowledged bytes allowed in flight per channel in
+            each direction. Default 256 KiB.
+    """
+
+    window_bytes: int = 256 * 1024
+
+
 @dataclass
 class FunctionRef:
     """Reference to a registered function, allowing programmatic unregistration."""
@@ -65,6 +347,47 @@ class InitOptions:
         otel: OpenTelemetry configuration. Enabled by default.
             Set ``{'enabled': False}`` or env ``OTEL_ENABLED=false`` to disable.
         telemetry: Internal telemetry metadata.
+        codec: Wire codec for engine messages. A ``Codec`` instance or one of
+            ``"json"`` (default), ``"orjson"``, ``"msgspec"`` or ``"auto"``.
+            The bytes-based backends send binary frames and skip ``str`` round trips.
+        send_pipeline: Enable outbound frame coalescing. See ``SendPipelineConfig``.
+            Disabled by default.
+        concurrency: Worker-wide admission limits for incoming invocations.
+            Unlimited by default. See ``ConcurrencyLimits``.
+        scheduling: Priority and fair-share ordering of queued invocations.
+            See ``SchedulingConfig``.
+        spool: Spill messages sent while disconnected to disk once the
+            in-memory backlog is full. See ``SpoolConfig``. Without it the
+            oldest backlog message is dropped.
+        on_disconnect: What happens to ``trigger()`` calls awaiting a result
+            when the engine connection closes. ``"fail"`` (default) raises
+            ``InvocationDisconnectedError`` at once; ``"resend"`` sends the
+            invocation again after reconnecting, for idempotent functions.
+            Overridable per call with ``TriggerRequest.on_disconnect``.
+        max_invocation_attempts: Total sends allowed per call under the
+            ``"resend"`` policy before it fails. Default ``3``.
+        registration: Send the registry in batches on connect when the
+            engine supports it. See ``RegistrationConfig``. Disabled by default.
+        result_cache: Serve repeated ``trigger()`` calls to cacheable
+            functions from a local cache. See ``ResultCacheConfig``. Disabled by default.
+        coalesce_calls: Let identical in-flight ``trigger()`` calls share one
+            engine round trip. Only enable it when callers of the same
+            function and payload can accept the same result. Default ``False``;
+            overridable per call with ``TriggerRequest.coalesce``.
+        local_dispatch: Run request/response ``trigger()`` calls to functions
+            this client registered with a handler directly, without the
+            engine round trip. ``Enqueue`` and ``Void`` calls and
+            HTTP-invoked functions still go through the engine, and message
+            interceptors do not see local calls. Default ``False``;
+            overridable per call with ``TriggerRequest.local``.
+        compression: Tune ``permessage-deflate`` and enable zstd frames for
+            large payloads. See ``CompressionConfig``. Without it connections
+            use the ``websockets`` defaults.
+        spill: Send oversized payloads and results through data channels
+            instead of inline. See ``SpillConfig``. Disabled by default.
+        channel_mux: Multiplex data channels over the engine connection
+            when the engine supports it. See ``ChannelMuxConfig``. Disabled
+            by default.
     """
 
     worker_name: str | None = None
@@ -73,3 +396,17 @@ class InitOptions:
     reconnection_config: ReconnectionConfig | None = None
     otel: OtelConfig | dict[str, Any] | None = None
     telemetry: TelemetryOptions | None = None
+    codec: Codec | str | None = None
+    send_pipeline: SendPipelineConfig | None = None
+    concurrency: ConcurrencyLimits | None = None
+    scheduling: SchedulingConfig | None = None
+    spool: SpoolConfig | None = None
+    on_disconnect: DisconnectPolicy = "fail"
+    max_invocation_attempts: int = 3
+    registration: RegistrationConfig | None = None
+    result_cache: ResultCacheConfig | None = None
+    coalesce_calls: bool = False
+    local_dispatch: bool = False
+    compression: CompressionConfig | None = None
+    spill: SpillConfig | None = None
+    channel_mux: ChannelMuxConfig | None = None
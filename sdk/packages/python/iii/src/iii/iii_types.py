@@ -56,6 +56,9 @@ class MessageType(str, Enum):
     UNREGISTER_TRIGGER_TYPE = "unregistertriggertype"
     TRIGGER_REGISTRATION_RESULT = "triggerregistrationresult"
     WORKER_REGISTERED = "workerregistered"
+    REGISTER_BATCH = "registerbatch"
+    REGISTRY_SYNC = "registrysync"
+    REGISTRY_SYNC_RESULT = "registrysyncresult"
 
 
 class RegisterTriggerTypeMessage(BaseModel):
@@ -202,12 +205,27 @@ class TriggerRequest(BaseModel):
         payload: Payload to pass to the function.
         action: Routing action. Omit for synchronous request/response.
         timeout_ms: Override the default invocation timeout in milliseconds.
+            The timeout covers every attempt of a re-sent call.
+        on_disconnect: Override ``InitOptions.on_disconnect`` for this call:
+            ``"fail"`` or ``"resend"``. Only use ``"resend"`` for idempotent
+            functions, since the first attempt may already have run.
+        cache: Set ``False`` to bypass the client result cache for this
+            call; the fresh result still replaces the cached one.
+        coalesce: Share one engine round trip with identical in-flight
+            calls (same function, payload and ``on_disconnect``). Overrides
+            ``InitOptions.coalesce_calls``. Ignored for ``Enqueue`` and ``Void``.
+        local: Run the call on a handler registered by this client without
+            going through the engine. Overrides ``InitOptions.local_dispatch``.
     """
 
     function_id: str
     payload: Any = None
     action: TriggerActionEnqueue | TriggerActionVoid | None = None
     timeout_ms: int | None = None
+    on_disconnect: Literal["fail", "resend"] | None = None
+    cache: bool | None = None
+    coalesce: bool | None = None
+    local: bool | None = None
 
 
 class InvokeFunctionMessage(BaseModel):
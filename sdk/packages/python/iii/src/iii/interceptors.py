@@ -0,0 +1,49 @@
+"""Hooks that see protocol messages as the client sends and receives them."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+log = logging.getLogger("iii.interceptors")
+
+
+class MessageInterceptor:
+    """Observes or amends protocol messages on the client's connection.
+
+    Subclass and override ``on_send``, ``on_receive`` or both, then pass an
+    instance to ``III.add_interceptor``.  Both methods get the message as a
+    plain dict: ``on_send`` before it is encoded, so it may add or change
+    fields (e.g. ``traceparent``), and ``on_receive`` after the frame has
+    been decoded once by the client, before it is dispatched.  Hooks run on
+    the client's event loop thread and must not block.
+
+    Examples:
+        >>> class InvocationCounter(MessageInterceptor):
+        ...     def __init__(self):
+        ...         self.received = 0
+        ...     def on_receive(self, message):
+        ...         if message.get("type") == "invokefunction":
+        ...             self.received += 1
+        >>> remove = iii.add_interceptor(InvocationCounter())
+    """
+
+    def on_send(self, message: dict[str, Any]) -> None:
+        """Called with each outgoing message before it is encoded."""
+
+    def on_receive(self, message: dict[str, Any]) -> None:
+        """Called with each incoming message after it is decoded."""
+
+
+def overrides(interceptor: MessageInterceptor, hook: str) -> bool:
+    """Whether ``interceptor`` implements ``hook`` itself rather than inheriting the no-op."""
+    return getattr(type(interceptor), hook) is not getattr(MessageInterceptor, hook)
+
+
+def run_hooks(hooks: tuple[Any, ...], message: dict[str, Any]) -> None:
+    """Call each bound hook with ``message``; a failing hook is logged and skipped."""
+    for hook in hooks:
+        try:
+            hook(message)
+        except Exception:
+            log.exception("Message interceptor %r failed", hook)
@@ -0,0 +1,39 @@
+"""Helpers for dispatching ``trigger()`` calls to handlers registered on the same client.
+
+A local call skips the engine, so values are not encoded and decoded on the
+way.  Plain JSON values (dicts with string keys, lists, strings, numbers,
+booleans and ``None``) are copied, so neither side can mutate what the
+other holds; anything the wire would have changed, such as a Pydantic model,
+a tuple or a channel ref, is first normalised by a codec round trip so the
+handler and the caller see what they would have seen over the engine.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .types import is_channel_ref
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def is_plain(value: Any) -> bool:
+    """Whether ``value`` survives a JSON round trip unchanged and holds no channel refs."""
+    if isinstance(value, _SCALARS):
+        return True
+    if isinstance(value, list):
+        return all(is_plain(item) for item in value)
+    if isinstance(value, dict):
+        if is_channel_ref(value):
+            return False
+        return all(isinstance(key, str) and is_plain(item) for key, item in value.items())
+    return False
+
+
+def copy_plain(value: Any) -> Any:
+    """Copy the lists and dicts of a value for which :func:`is_plain` holds."""
+    if isinstance(value, list):
+        return [copy_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: copy_plain(item) for key, item in value.items()}
+    return value
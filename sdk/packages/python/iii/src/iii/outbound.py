@@ -0,0 +1,151 @@
+"""Outbound send pipeline that coalesces frames written to the engine socket."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable
+
+import websockets
+from websockets.asyncio.client import ClientConnection
+
+from .iii_constants import SendPipelineConfig
+from .runtime_stats import Histogram
+
+log = logging.getLogger("iii.outbound")
+
+Frame = str | bytes
+
+
+class OutboundWriter:
+    """Drains a bounded queue of encoded frames from a single writer task.
+
+    Producers enqueue frames and return immediately (waiting only when the
+    queue is full).  The writer task collects every frame that is ready,
+    waits up to ``max_delay_us`` for stragglers, and once ``max_batch_bytes``
+    is reached or the delay expires sends the whole batch back to back.  The
+    sends do not wait on the network while the transport buffer has room, so
+    the transport coalesces a burst instead of every caller awaiting its own
+    write.  Each message is still its own WebSocket frame.
+
+    Frames that cannot be written because the connection closed are handed
+    to ``on_unsent`` so the client can replay them after reconnecting.
+    """
+
+    def __init__(self, config: SendPipelineConfig, on_unsent: Callable[[list[Frame]], None]) -> None:
+        self._config = config
+        self._on_unsent = on_unsent
+        self._queue: asyncio.Queue[Frame] = asyncio.Queue(maxsize=config.max_queue_size)
+        self._ws: ClientConnection | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._batch: list[Frame] = []
+        self._flush_frames = Histogram()
+        self._flush_bytes = Histogram(max_bound=1 << 24)
+        self._frames_sent = 0
+        self._bytes_sent = 0
+        self._max_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self, ws: ClientConnection) -> None:
+        """Begin writing to ``ws``. Must be called on the SDK event loop."""
+        self._ws = ws
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, flush: bool = False) -> None:
+        """Stop the writer task, optionally writing any frames still queued."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        batch, self._batch = self._batch, []
+        batch.extend(self._drain(self._queue.qsize()))
+        if flush and batch and self._ws is not None:
+            await self._write(batch)
+        elif batch:
+            self._on_unsent(batch)
+        self._ws = None
+
+    async def put(self, frame: Frame) -> None:
+        await self._queue.put(frame)
+        depth = self._queue.qsize()
+        if depth > self._max_queue_depth:
+            self._max_queue_depth = depth
+
+    def _drain(self, limit: int) -> list[Frame]:
+        batch: list[Frame] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        max_bytes = self._config.max_batch_bytes
+        delay = self._config.max_delay_us / 1_000_000
+        while True:
+            batch = self._batch = [await self._queue.get()]
+            size = len(batch[0])
+            deadline = time.monotonic() + delay
+            while size < max_bytes:
+                if self._queue.empty():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(remaining)
+                    if self._queue.empty():
+                        break
+                frame = self._queue.get_nowait()
+                batch.append(frame)
+                size += len(frame)
+            # The batch stays in self._batch until written, so stop() can
+            # still flush or hand back what a cancelled write left over.
+            if not await self._write(batch):
+                self._batch = []
+                return
+            self._batch = []
+
+    async def _write(self, batch: list[Frame]) -> bool:
+        ws = self._ws
+        if ws is None:
+            self._on_unsent(batch)
+            return False
+        sent = 0
+        try:
+            for frame in batch:
+                await ws.send(frame)
+                sent += 1
+        except websockets.ConnectionClosed:
+            log.debug("Connection closed with %d outbound frame(s) pending", len(batch) - sent)
+            self._on_unsent(batch[sent:])
+            return False
+        except asyncio.CancelledError:
+            self._batch = batch[sent:]
+            raise
+        finally:
+            if sent:
+                nbytes = sum(len(f) for f in batch[:sent])
+                self._frames_sent += sent
+                self._bytes_sent += nbytes
+                self._flush_frames.observe(sent)
+                self._flush_bytes.observe(nbytes)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self._max_queue_depth,
+            "frames_sent": self._frames_sent,
+            "bytes_sent": self._bytes_sent,
+            "flushes": self._flush_frames.count,
+            "flush_frames": self._flush_frames.snapshot(),
+            "flush_bytes": self._flush_bytes.snapshot(),
+        }
@@ -0,0 +1,62 @@
+"""Batched re-registration of a worker's registry after (re)connecting.
+
+Engines that advertise the ``registration_batch`` capability in their
+``workerregistered`` message accept the whole registry as a few
+``registerbatch`` frames.  Engines that also advertise ``registry_hash``
+are first asked, with a ``registrysync`` frame, whether they still hold a
+registry with the same hash for this worker; if so nothing is re-sent.
+Other engines receive one frame per registration, as before.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Callable, Iterable
+
+from .codec import _default
+from .iii_types import MessageType
+
+CAPABILITY_BATCH = "registration_batch"
+CAPABILITY_HASH = "registry_hash"
+
+
+def registry_hash(messages: Iterable[dict[str, Any]]) -> str:
+    """Stable digest of registration messages, independent of the wire codec."""
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(json.dumps(message, sort_keys=True, separators=(",", ":"), default=_default).encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def batch_frames(
+    messages: list[dict[str, Any]],
+    encoded_size: Callable[[dict[str, Any]], int],
+    max_frame_bytes: int,
+    digest: str,
+) -> list[dict[str, Any]]:
+    """Group ``messages`` into ``registerbatch`` frames of about ``max_frame_bytes`` each.
+
+    A single registration larger than the limit gets a frame of its own.
+    The last frame is marked ``final`` so the engine can drop registrations
+    that are no longer present.
+    """
+    chunks: list[list[dict[str, Any]]] = [[]]
+    size = 0
+    for message in messages:
+        message_size = encoded_size(message)
+        if chunks[-1] and size + message_size > max_frame_bytes:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(message)
+        size += message_size
+    return [
+        {
+            "type": MessageType.REGISTER_BATCH.value,
+            "registry_hash": digest,
+            "messages": chunk,
+            "final": index == len(chunks) - 1,
+        }
+        for index, chunk in enumerate(chunks)
+    ]
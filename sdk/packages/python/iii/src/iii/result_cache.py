@@ -0,0 +1,141 @@
+"""Client-side cache of ``trigger()`` results for functions declared cacheable.
+
+A function opts in through its registration metadata, e.g.
+``{"cache": {"ttl_ms": 30000}}``; ``ResultCacheConfig.functions`` can set or
+override the TTL per function on the calling side.  Entries are keyed by
+function id and a digest of the canonical JSON form of the payload, and are
+held encoded with the client's codec, so every hit returns a fresh copy
+that the caller may mutate freely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from .codec import Codec, _default
+from .iii_constants import ResultCacheConfig
+
+CACHE_METADATA_KEY = "cache"
+
+_MISSING = object()
+
+
+def cache_ttl_ms(metadata: dict[str, Any] | None) -> int | None:
+    """TTL declared in a function's registration metadata, or ``None`` if it is not cacheable."""
+    declared = (metadata or {}).get(CACHE_METADATA_KEY)
+    if not isinstance(declared, dict):
+        return None
+    ttl = declared.get("ttl_ms")
+    return ttl if isinstance(ttl, int) and not isinstance(ttl, bool) and ttl > 0 else None
+
+
+def payload_digest(payload: Any) -> str | None:
+    """Digest of the canonical JSON form of ``payload``; ``None`` if it cannot be encoded."""
+    try:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_default)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """TTL and LRU bounded store of encoded invocation results."""
+
+    def __init__(self, config: ResultCacheConfig, codec: Codec) -> None:
+        self._config = config
+        self._codec = codec
+        self._declared: dict[str, int] = {}
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def ttl_ms(self, function_id: str) -> int | None:
+        """TTL for results of ``function_id``, or ``None`` when its results are not cached."""
+        override = self._config.functions.get(function_id)
+        return override if override is not None else self._declared.get(function_id)
+
+    def learn(self, functions: Iterable[tuple[str, dict[str, Any] | None]]) -> None:
+        """Record the cache declarations from ``(function_id, metadata)`` pairs."""
+        for function_id, metadata in functions:
+            ttl = cache_ttl_ms(metadata)
+            if ttl is None:
+                if self._declared.pop(function_id, None) is not None:
+                    self.invalidate(function_id)
+            else:
+                self._declared[function_id] = ttl
+
+    def get(self, function_id: str, digest: str) -> tuple[bool, Any]:
+        """Return ``(True, result)`` for a live entry, otherwise ``(False, None)``."""
+        key = (function_id, digest)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, encoded, _ = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._codec.decode(encoded)
+            self._remove(key)
+            self.expirations += 1
+        self.misses += 1
+        return False, None
+
+    def put(self, function_id: str, digest: str, result: Any, ttl_ms: int) -> None:
+        """Store ``result``, evicting least recently used entries to stay within bounds."""
+        try:
+            encoded = self._codec.encode(result)
+        except (TypeError, ValueError):
+            return
+        size = len(encoded)
+        if size > self._config.max_bytes:
+            return
+        key = (function_id, digest)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl_ms / 1000, encoded, size)
+        self._bytes += size
+        while len(self._entries) > self._config.max_entries or self._bytes > self._config.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, function_id: str | None = None, payload: Any = _MISSING) -> int:
+        """Drop cached results of ``function_id`` (all functions if ``None``), or of one payload.
+
+        Returns:
+            The number of entries removed.
+        """
+        if function_id is None:
+            keys = list(self._entries)
+        elif payload is not _MISSING:
+            digest = payload_digest(payload)
+            keys = [(function_id, digest)] if digest is not None and (function_id, digest) in self._entries else []
+        else:
+            keys = [key for key in self._entries if key[0] == function_id]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
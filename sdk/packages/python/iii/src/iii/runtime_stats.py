@@ -0,0 +1,54 @@
+"""Lightweight in-process counters for SDK runtime statistics.
+
+These are plain Python objects updated on the SDK event loop and read via
+``III.get_runtime_stats()``.  They deliberately avoid any OTel dependency so
+they cost nothing when nobody looks at them.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class Histogram:
+    """Power-of-two bucketed histogram of non-negative integer samples.
+
+    Bucket ``le_N`` counts samples ``<= N``; the last bucket is ``le_inf``.
+    """
+
+    __slots__ = ("_bounds", "_counts", "count", "total", "max")
+
+    def __init__(self, max_bound: int = 1 << 16) -> None:
+        bounds: list[int] = []
+        bound = 1
+        while bound <= max_bound:
+            bounds.append(bound)
+            bound <<= 1
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value: int) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        for i, bound in enumerate(self._bounds):
+            if value <= bound:
+                self._counts[i] += 1
+                return
+        self._counts[-1] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        buckets = {f"le_{b}": c for b, c in zip(self._bounds, self._counts) if c}
+        if self._counts[-1]:
+            buckets["le_inf"] = self._counts[-1]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": buckets,
+        }
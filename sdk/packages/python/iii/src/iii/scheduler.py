@@ -0,0 +1,148 @@
+"""Ordering of invocations waiting for an admission slot."""
+
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+from typing import Any, Callable
+from urllib.parse import unquote
+
+from .iii_constants import SchedulingConfig
+
+
+class Waiter:
+    """An invocation parked until the admission controller can start it.
+
+    ``context`` is the ``contextvars`` context current when the invocation
+    was submitted; ``start`` runs inside it, so the task it creates does not
+    inherit the context of whichever invocation freed the slot.
+    """
+
+    __slots__ = ("function_id", "start", "flow", "priority", "context", "finish", "seq")
+
+    def __init__(
+        self,
+        function_id: str,
+        start: Callable[[], None],
+        flow: str | None,
+        priority: int,
+        context: contextvars.Context | None = None,
+    ) -> None:
+        self.function_id = function_id
+        self.start = start
+        self.flow = flow
+        self.priority = priority
+        self.context = context if context is not None else contextvars.copy_context()
+        self.finish = 0.0
+        self.seq = 0
+
+    def __lt__(self, other: Waiter) -> bool:
+        return (-self.priority, self.finish, self.seq) < (-other.priority, other.finish, other.seq)
+
+
+class FairScheduler:
+    """Priority classes plus weighted fair queuing across flows.
+
+    Waiters in a higher ``priority`` class always run first.  Within a class,
+    each flow (e.g. a tenant taken from baggage) is served in proportion to
+    its weight using start-time fair queuing: a waiter's virtual finish time
+    is ``max(virtual_time, flow_last_finish) + 1 / weight``, and the smallest
+    finish time runs next.  Without a fairness key every waiter shares one
+    flow, which reduces to FIFO within each priority class.
+
+    Waiters are kept in one heap per function, and a second heap ranks the
+    head of each function's heap.  A function whose head cannot start is
+    parked, i.e. left out of the heads heap, until ``unpark`` reports that
+    it may have capacity again, so ``pop`` never re-sorts waiters that are
+    known to be blocked.
+    """
+
+    def __init__(self, config: SchedulingConfig | None = None) -> None:
+        self._config = config or SchedulingConfig()
+        self._queues: dict[str, list[Waiter]] = {}
+        self._heads: list[Waiter] = []
+        self._parked: set[str] = set()
+        self._size = 0
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._flow_finish: dict[str | None, float] = {}
+        self._flow_queued: dict[str | None, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def flow_from_baggage(self, baggage: str | None) -> str | None:
+        """Extract the fairness key's value from a W3C ``baggage`` header."""
+        key = self._config.fairness_key
+        if not key or not baggage:
+            return None
+        for member in baggage.split(","):
+            name, sep, value = member.partition("=")
+            if sep and unquote(name.strip()) == key:
+                return unquote(value.split(";", 1)[0].strip())
+        return None
+
+    def push(self, waiter: Waiter) -> None:
+        weight = self._config.weights.get(waiter.flow or "", self._config.default_weight)
+        start = max(self._virtual_time, self._flow_finish.get(waiter.flow, 0.0))
+        waiter.finish = start + 1.0 / max(weight, 1e-9)
+        waiter.seq = next(self._seq)
+        self._flow_finish[waiter.flow] = waiter.finish
+        self._flow_queued[waiter.flow] = self._flow_queued.get(waiter.flow, 0) + 1
+        self._size += 1
+        queue = self._queues.setdefault(waiter.function_id, [])
+        heapq.heappush(queue, waiter)
+        if queue[0] is waiter and waiter.function_id not in self._parked:
+            # Any entry for the previous head is now stale and skipped by pop().
+            heapq.heappush(self._heads, waiter)
+
+    def unpark(self, function_id: str) -> None:
+        """Make a parked function's waiters candidates for ``pop`` again."""
+        if function_id in self._parked:
+            self._parked.discard(function_id)
+            queue = self._queues.get(function_id)
+            if queue:
+                heapq.heappush(self._heads, queue[0])
+
+    def pop(self, eligible: Callable[[Waiter], bool]) -> Waiter | None:
+        """Remove and return the best-ranked waiter for which ``eligible`` is true.
+
+        Functions whose head is not eligible are parked until ``unpark``.
+        """
+        while self._heads:
+            head = heapq.heappop(self._heads)
+            queue = self._queues.get(head.function_id)
+            if not queue or queue[0] is not head or head.function_id in self._parked:
+                continue
+            if not eligible(head):
+                self._parked.add(head.function_id)
+                continue
+            heapq.heappop(queue)
+            if queue:
+                heapq.heappush(self._heads, queue[0])
+            else:
+                del self._queues[head.function_id]
+            self._take(head)
+            return head
+        return None
+
+    def _take(self, waiter: Waiter) -> None:
+        self._size -= 1
+        self._virtual_time = max(self._virtual_time, waiter.finish - 1.0 / self._weight(waiter.flow))
+        remaining = self._flow_queued[waiter.flow] - 1
+        if remaining:
+            self._flow_queued[waiter.flow] = remaining
+        else:
+            del self._flow_queued[waiter.flow]
+            if not self._size:
+                self._flow_finish.clear()
+
+    def _weight(self, flow: str | None) -> float:
+        return max(self._config.weights.get(flow or "", self._config.default_weight), 1e-9)
+
+    def stats(self) -> dict[str, Any]:
+        return {"queued_by_flow": {str(flow): n for flow, n in self._flow_queued.items()}}
@@ -0,0 +1,103 @@
+"""Single-flight coalescing of identical in-flight ``trigger()`` calls.
+
+Calls that opted in and share a function id, payload digest and disconnect
+policy join one engine round trip instead of each sending their own
+``invokefunction``.  Each caller keeps its own timeout: one whose deadline
+comes before the flight's stops waiting at its own deadline, and one whose
+deadline comes after it starts a new flight if the shared call times out.
+Cancelling a caller detaches it from the flight; the engine call itself is
+cancelled once no caller is left.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import math
+from typing import Any, Callable, Coroutine
+
+from .codec import Codec
+
+
+class _Flight:
+    __slots__ = ("task", "deadline", "waiters")
+
+    def __init__(self, task: asyncio.Task[Any], deadline: float) -> None:
+        self.task = task
+        self.deadline = deadline
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Shares one engine call between identical concurrent callers."""
+
+    def __init__(self, codec: Codec) -> None:
+        self._codec = codec
+        self._flights: dict[tuple[str, str, str], _Flight] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def call(
+        self,
+        function_id: str,
+        digest: str,
+        on_disconnect: str,
+        timeout_ms: int,
+        start: Callable[[int], Coroutine[Any, Any, Any]],
+    ) -> Any:
+        """Join the flight for this call, or start one with ``start(timeout_ms)``.
+
+        Callers that joined an existing flight get their own copy of the
+        result, so no two callers share a mutable object.
+        """
+        loop = asyncio.get_running_loop()
+        key = (function_id, digest, on_disconnect)
+        deadline = loop.time() + timeout_ms / 1000
+        while True:
+            remaining = deadline - loop.time()
+            flight = self._flights.get(key)
+            if flight is None or flight.task.done():
+                owner = True
+                flight = _Flight(loop.create_task(start(max(1, math.ceil(remaining * 1000)))), deadline)
+                self._flights[key] = flight
+                flight.task.add_done_callback(functools.partial(self._land, key, flight))
+                self.started += 1
+            else:
+                owner = False
+                self.coalesced += 1
+
+            flight.waiters += 1
+            try:
+                if flight.deadline <= deadline:
+                    # The flight's own timeout fires no later than this caller's.
+                    result = await asyncio.shield(flight.task)
+                else:
+                    result = await asyncio.wait_for(asyncio.shield(flight.task), remaining)
+            except (asyncio.TimeoutError, TimeoutError):
+                if not flight.task.done():
+                    raise TimeoutError(f"Invocation of '{function_id}' timed out after {timeout_ms}ms") from None
+                if loop.time() >= deadline:
+                    raise
+                # A flight started by a caller with an earlier deadline timed
+                # out; go on in a new flight for the time this caller has left.
+                continue
+            finally:
+                flight.waiters -= 1
+                if flight.waiters == 0 and not flight.task.done():
+                    flight.task.cancel()
+            return result if owner else self._codec.decode(self._codec.encode(result))
+
+    def _land(self, key: tuple[str, str, str], flight: _Flight, task: asyncio.Task[Any]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not task.cancelled():
+            # Retrieve the exception so a flight whose callers all left is not
+            # reported as "exception was never retrieved".
+            task.exception()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
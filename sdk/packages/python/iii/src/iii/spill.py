@@ -0,0 +1,76 @@
+"""Spilling of oversized invocation payloads and results to data channels.
+
+A frame whose encoded size exceeds ``SpillConfig.threshold_bytes`` is sent
+with its payload (``data`` of a request/response ``invokefunction``, or
+``result`` of an ``invocationresult``) replaced by a marker holding the
+read end of a fresh data channel.  The body is streamed into the channel in
+the background, so neither the outbound queue nor the engine holds the
+whole blob.  The receiving side reads the channel back before handing the
+value to the handler or the caller; handlers registered with
+``stream_spilled=True`` get a ``SpilledPayload`` instead and can read it in
+chunks.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from .codec import Codec
+from .iii_types import StreamChannelRef
+
+if TYPE_CHECKING:
+    from .channels import ChannelReader, ChannelWriter
+
+SPILL_KEY = "__iii_spilled__"
+
+SPILLABLE_FIELDS = {"invokefunction": "data", "invocationresult": "result"}
+"""Message type to the field that may be spilled."""
+
+
+def spill_marker(ref: StreamChannelRef, size: int) -> dict[str, Any]:
+    """The value sent in place of a spilled payload of ``size`` encoded bytes."""
+    return {SPILL_KEY: ref.model_dump(), "size": size}
+
+
+def spilled_ref(value: Any) -> StreamChannelRef | None:
+    """The channel holding ``value``'s payload if ``value`` is a spill marker, else ``None``."""
+    if isinstance(value, dict) and isinstance(value.get(SPILL_KEY), dict):
+        return StreamChannelRef(**value[SPILL_KEY])
+    return None
+
+
+async def write_spilled(writer: ChannelWriter, body: bytes) -> None:
+    """Stream ``body`` into a spill channel and close it."""
+    try:
+        await writer.write(body)
+    finally:
+        await writer.close_async()
+
+
+class SpilledPayload:
+    """A payload that was moved to a data channel because it was too large to inline.
+
+    The channel can be read once, either whole with ``load()`` or piece by
+    piece with ``chunks()``.
+
+    Attributes:
+        size: Encoded size of the payload in bytes.
+    """
+
+    def __init__(self, reader: ChannelReader, size: int, codec: Codec) -> None:
+        self._reader = reader
+        self._codec = codec
+        self.size = size
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield the encoded payload in the chunks it arrives in."""
+        async for chunk in self._reader:
+            yield chunk
+
+    async def read_bytes(self) -> bytes:
+        """Return the whole encoded payload."""
+        return await self._reader.read_all()
+
+    async def load(self) -> Any:
+        """Read and decode the payload."""
+        return self._codec.decode(await self.read_bytes())
@@ -0,0 +1,159 @@
+"""Backlog of messages sent while disconnected, with optional disk spool."""
+
+from __future__ import annotations
+
+import collections
+import logging
+import os
+import struct
+from typing import IO, Any, Awaitable, Callable
+
+from .codec import Codec
+from .iii_constants import SpoolConfig
+from .outbound import Frame
+
+log = logging.getLogger("iii.spool")
+
+# Record header: payload length and frame kind (0 = text, 1 = binary).
+_HEADER = struct.Struct(">IB")
+_TEXT = 0
+_BINARY = 1
+
+
+class SpoolFile:
+    """Append-only file of encoded frames, read back from a moving offset.
+
+    Records already replayed are not rewritten; the file is truncated once
+    every record has been read.  A torn record left by a crash mid-append is
+    discarded when the file is reopened.
+    """
+
+    def __init__(self, config: SpoolConfig) -> None:
+        self._max_bytes = config.max_bytes
+        self._file: IO[bytes] = open(config.path, "a+b")
+        self._offset = 0
+        self._size = 0
+        self.records = 0
+        self._recover()
+
+    def _recover(self) -> None:
+        end = self._file.seek(0, os.SEEK_END)
+        pos = 0
+        self._file.seek(0)
+        while pos + _HEADER.size <= end:
+            length, _ = _HEADER.unpack(self._file.read(_HEADER.size))
+            if pos + _HEADER.size + length > end:
+                break
+            pos += _HEADER.size + length
+            self._file.seek(pos)
+            self.records += 1
+        if pos != end:
+            log.warning("Discarding %d bytes of incomplete spool record", end - pos)
+            self._file.truncate(pos)
+        self._size = pos
+
+    @property
+    def size(self) -> int:
+        return self._size - self._offset
+
+    def append(self, frame: Frame) -> bool:
+        """Append ``frame``; returns ``False`` if it would exceed ``max_bytes``."""
+        if isinstance(frame, str):
+            payload, kind = frame.encode(), _TEXT
+        else:
+            payload, kind = bytes(frame), _BINARY
+        record_size = _HEADER.size + len(payload)
+        if self._size + record_size > self._max_bytes:
+            return False
+        self._file.write(_HEADER.pack(len(payload), kind))
+        self._file.write(payload)
+        self._file.flush()
+        self._size += record_size
+        self.records += 1
+        return True
+
+    def peek(self) -> tuple[Frame, int]:
+        """Return the oldest unread frame and its record size."""
+        self._file.seek(self._offset)
+        length, kind = _HEADER.unpack(self._file.read(_HEADER.size))
+        payload = self._file.read(length)
+        return (payload.decode() if kind == _TEXT else payload), _HEADER.size + length
+
+    def advance(self, record_size: int) -> None:
+        self._offset += record_size
+        self.records -= 1
+        if self.records == 0:
+            self._file.truncate(0)
+            self._offset = self._size = 0
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class OutboundBacklog:
+    """Messages waiting for the engine connection, replayed in order.
+
+    Up to ``max_messages`` messages are kept in memory.  Beyond that they
+    are appended to the spool file when one is configured; otherwise the
+    oldest in-memory message is dropped.  Once anything is on disk, newer
+    messages follow it there so the replay order is preserved.
+    """
+
+    def __init__(self, codec: Codec, max_messages: int, spool: SpoolConfig | None = None) -> None:
+        self._codec = codec
+        self._max_messages = max_messages
+        self._memory: collections.deque[dict[str, Any]] = collections.deque()
+        self._spool = SpoolFile(spool) if spool is not None else None
+        self._dropped = 0
+        self._spooled = 0
+        self._replayed = 0
+
+    def __len__(self) -> int:
+        return len(self._memory) + (self._spool.records if self._spool else 0)
+
+    def push(self, msg: dict[str, Any]) -> None:
+        spool = self._spool
+        if spool is None:
+            if len(self._memory) >= self._max_messages:
+                log.warning("Message queue full, dropping oldest message")
+                self._memory.popleft()
+                self._dropped += 1
+            self._memory.append(msg)
+        elif not spool.records and len(self._memory) < self._max_messages:
+            self._memory.append(msg)
+        elif spool.append(self._codec.encode(msg)):
+            self._spooled += 1
+        else:
+            log.warning("Message spool full, dropping message")
+            self._dropped += 1
+
+    async def replay(self, write: Callable[[Frame], Awaitable[None]], connected: Callable[[], bool]) -> None:
+        """Write every backlog message with ``write`` while ``connected()`` holds.
+
+        A message is removed only after ``write`` returns, so one that fails
+        mid-replay stays at the head of the backlog for the next attempt.
+        """
+        while self._memory and connected():
+            await write(self._codec.encode(self._memory[0]))
+            self._memory.popleft()
+            self._replayed += 1
+        spool = self._spool
+        while spool is not None and spool.records and connected():
+            frame, record_size = spool.peek()
+            await write(frame)
+            spool.advance(record_size)
+            self._replayed += 1
+
+    def close(self) -> None:
+        if self._spool is not None:
+            self._spool.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_memory": len(self._memory),
+            "spooled_pending": self._spool.records if self._spool else 0,
+            "spool_bytes": self._spool.size if self._spool else 0,
+            "dropped": self._dropped,
+            "spooled": self._spooled,
+            "replayed": self._replayed,
+        }
@@ -13,6 +13,7 @@ import os
 import uuid
 from typing import Any, cast
 
+from .codec import Codec
 from .telemetry_types import OtelConfig
 
 _tracer: Any = None
@@ -29,6 +30,8 @@ _DEFAULT_SERVICE_NAME = "iii-python-sdk"
 def init_otel(
     config: OtelConfig | None = None,
     loop: asyncio.AbstractEventLoop | None = None,
+    codec: Codec | None = None,
+    connect_options: dict[str, Any] | None = None,
 ) -> None:
     """Initialize OpenTelemetry. Subsequent calls are no-ops.
 
@@ -37,6 +40,9 @@ def init_otel(
         loop: Running asyncio event loop. When provided, SharedEngineConnection
               starts immediately. When None, the connection is started lazily
               on first use (pre-start buffer absorbs early frames).
+        codec: Codec used to serialize OTLP JSON payloads. Defaults to stdlib ``json``.
+        connect_options: Extra ``websockets.connect`` arguments for the
+              telemetry connection, e.g. compression settings.
     """
     global _tracer, _log_provider, _connection, _initialized, _fetch_patched
 
@@ -86,11 +92,11 @@ def init_otel(
     from .telemetry_exporters import EngineSpanExporter, SharedEngineConnection
 
     ws_url = cfg.engine_ws_url or os.environ.get("III_URL") or "ws://localhost:49134"
-    _connection = SharedEngineConnection(ws_url)
+    _connection = SharedEngineConnection(ws_url, codec=codec, connect_options=connect_options)
     if loop is not None:
         _connection.start(loop)
 
-    span_exporter = EngineSpanExporter(_connection)
+    span_exporter = EngineSpanExporter(_connection, codec=_connection.codec)
     provider = TracerProvider(resource=resource)
     provider.add_span_processor(BatchSpanProcessor(span_exporter))  # type: ignore[arg-type]
     trace.set_tracer_provider(provider)
@@ -129,7 +135,7 @@ def _configure_meter_provider(
         logging.getLogger("iii.telemetry").warning("opentelemetry-sdk metrics not available; metrics export skipped.")
         return
 
-    metrics_exporter = EngineMetricsExporter(connection)
+    metrics_exporter = EngineMetricsExporter(connection, codec=connection.codec)
     metric_reader = PeriodicExportingMetricReader(
         metrics_exporter,  # type: ignore[arg-type]
         export_interval_millis=cfg.metrics_export_interval_ms,
@@ -178,7 +184,7 @@ def _configure_log_provider(resource: Any, connection: Any, cfg: OtelConfig) ->
         logging.getLogger("iii.telemetry").warning("opentelemetry-sdk logs not available; log export skipped.")
         return
 
-    log_exporter = EngineLogExporter(connection)
+    log_exporter = EngineLogExporter(connection, codec=connection.codec)
 
     logs_flush_interval_ms = _resolve_int(
         cfg.logs_flush_interval_ms,
@@ -373,6 +379,36 @@ def _reset_state() -> None:
     _initialized = False
 
 
+def reset_after_fork() -> None:
+    """Forget OTel state inherited from the parent after ``os.fork()``.
+
+    The parent's providers, exporter threads and engine connection do not
+    exist in the child, so they are dropped without being shut down.  Call
+    this in the child before creating a new ``III`` client.
+
+    OpenTelemetry lets each global provider be set only once per process,
+    so the parent must not initialise OTel before forking: a child of an
+    initialised parent keeps the parent's (now dead) global providers.
+    """
+    global _tracer, _meter, _meter_provider, _log_provider, _connection, _initialized
+
+    _tracer = None
+    _meter = None
+    _meter_provider = None
+    _log_provider = None
+    _connection = None
+    _initialized = False
+
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return
+    if not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        logging.getLogger("iii.telemetry").warning(
+            "OpenTelemetry was initialised before fork; the worker keeps the parent's global providers."
+        )
+
+
 def attach_event_loop(loop: asyncio.AbstractEventLoop) -> None:
     """Wire the running asyncio event loop into the OTel connection.
 
@@ -8,12 +8,13 @@ Metrics → binary WS frame: b"MTRC" + OTLP JSON bytes
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import random
 from collections import defaultdict, deque
 from typing import TYPE_CHECKING, Any, Sequence
 
+from .codec import JSON_CODEC, Codec, encode_bytes
+
 if TYPE_CHECKING:
     from opentelemetry.sdk._logs.export import LogExportResult
     from opentelemetry.sdk.metrics.export import MetricExportResult
@@ -32,8 +33,10 @@ class SharedEngineConnection:
 
     MAX_QUEUE: int = 1000
 
-    def __init__(self, url: str) -> None:
+    def __init__(self, url: str, codec: Codec | None = None, connect_options: dict[str, Any] | None = None) -> None:
         self._url = url
+        self.codec: Codec = codec or JSON_CODEC
+        self._connect_options = connect_options or {}
         self._loop: asyncio.AbstractEventLoop | None = None
         self._task: asyncio.Task | None = None  # type: ignore[type-arg]
         self._queue: asyncio.Queue | None = None  # type: ignore[type-arg]
@@ -79,7 +82,7 @@ class SharedEngineConnection:
         delay = 1.0
         while True:
             try:
-                async with websockets.connect(self._url) as ws:
+                async with websockets.connect(self._url, **self._connect_options) as ws:
                     log.debug("OTel WS connected to %s", self._url)
                     delay = 1.0
                     while True:
@@ -131,7 +134,7 @@ def _attrs_to_otlp(attrs: Any) -> "list[dict[str, Any]]":
     return [{"key": k, "value": _attr_value(v)} for k, v in attrs.items()]
 
 
-def _serialize_spans(spans: Sequence[Any]) -> bytes:
+def _serialize_spans(spans: Sequence[Any], codec: Codec = JSON_CODEC) -> bytes:
     """Serialize ReadableSpans to OTLP JSON with lowercase-hex trace/span IDs.
 
     Matches the format produced by the Node.js JsonTraceSerializer.serializeRequest().
@@ -202,10 +205,10 @@ def _serialize_spans(spans: Sequence[Any]) -> bytes:
             }
         )
 
-    return json.dumps({"resourceSpans": resource_spans}).encode()
+    return encode_bytes(codec, {"resourceSpans": resource_spans})
 
 
-def _serialize_logs(batch: Sequence[Any]) -> bytes:
+def _serialize_logs(batch: Sequence[Any], codec: Codec = JSON_CODEC) -> bytes:
     """Serialize log records to OTLP JSON with lowercase-hex trace/span IDs.
 
     Matches the format produced by the Node.js JsonLogsSerializer.serializeRequest().
@@ -266,20 +269,21 @@ def _serialize_logs(batch: Sequence[Any]) -> bytes:
             }
         )
 
-    return json.dumps({"resourceLogs": resource_logs}).encode()
+    return encode_bytes(codec, {"resourceLogs": resource_logs})
 
 
 class EngineSpanExporter:
     """SpanExporter that sends OTLP JSON over the engine WebSocket connection."""
 
-    def __init__(self, connection: SharedEngineConnection) -> None:
+    def __init__(self, connection: SharedEngineConnection, codec: Codec | None = None) -> None:
         self._connection = connection
+        self._codec = codec or JSON_CODEC
 
     def export(self, spans: Sequence[Any]) -> SpanExportResult:
         from opentelemetry.sdk.trace.export import SpanExportResult
 
         try:
-            json_bytes = _serialize_spans(spans)
+            json_bytes = _serialize_spans(spans, self._codec)
             self._connection.send_threadsafe(b"OTLP", json_bytes)
             return SpanExportResult.SUCCESS
         except Exception:
@@ -296,14 +300,15 @@ class EngineSpanExporter:
 class EngineLogExporter:
     """LogExporter that sends OTLP JSON over the engine WebSocket connection."""
 
-    def __init__(self, connection: SharedEngineConnection) -> None:
+    def __init__(self, connection: SharedEngineConnection, codec: Codec | None = None) -> None:
         self._connection = connection
+        self._codec = codec or JSON_CODEC
 
     def export(self, batch: Sequence[Any]) -> LogExportResult:
         from opentelemetry.sdk._logs.export import LogExportResult
 
         try:
-            json_bytes = _serialize_logs(batch)
+            json_bytes = _serialize_logs(batch, self._codec)
             self._connection.send_threadsafe(b"LOGS", json_bytes)
             return LogExportResult.SUCCESS
         except Exception:
@@ -320,7 +325,7 @@ class EngineLogExporter:
 PREFIX_METRICS = b"MTRC"
 
 
-def _serialize_metrics(metrics_data: Any) -> bytes:
+def _serialize_metrics(metrics_data: Any, codec: Codec = JSON_CODEC) -> bytes:
     """Serialize SDK MetricsData to OTLP JSON (ExportMetricsServiceRequest).
 
     Matches the format produced by the Node.js JsonMetricsSerializer.serializeRequest().
@@ -411,7 +416,7 @@ def _serialize_metrics(metrics_data: Any) -> bytes:
             }
         )
 
-    return json.dumps({"resourceMetrics": resource_metrics}).encode()
+    return encode_bytes(codec, {"resourceMetrics": resource_metrics})
 
 
 def _temporality_value(data: Any) -> int:
@@ -428,8 +433,9 @@ class EngineMetricsExporter:
     Implements the PushMetricExporter interface from opentelemetry.sdk.metrics.export.
     """
 
-    def __init__(self, connection: SharedEngineConnection) -> None:
+    def __init__(self, connection: SharedEngineConnection, codec: Codec | None = None) -> None:
         self._connection = connection
+        self._codec = codec or JSON_CODEC
         # Required by PeriodicExportingMetricReader
         self._preferred_temporality: dict[Any, Any] = {}
         self._preferred_aggregation: dict[Any, Any] = {}
@@ -443,7 +449,7 @@ class EngineMetricsExporter:
         from opentelemetry.sdk.metrics.export import MetricExportResult
 
         try:
-            json_bytes = _serialize_metrics(metrics_data)
+            json_bytes = _serialize_metrics(metrics_data, self._codec)
             self._connection.send_threadsafe(PREFIX_METRICS, json_bytes)
             return MetricExportResult.SUCCESS
         except Exception:
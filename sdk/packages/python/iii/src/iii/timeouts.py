@@ -0,0 +1,112 @@
+"""Hashed timer wheel for invocation timeouts."""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import math
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+RATE_WINDOW_SECONDS = 60
+
+
+class TimerWheel(Generic[T]):
+    """Expires many deadlines with a single event-loop timer.
+
+    ``asyncio.wait_for`` arms one timer handle (and, on older Pythons, one
+    extra task) per call.  The wheel instead buckets deadlines into slots of
+    ``tick_ms`` and runs one periodic tick while anything is scheduled; each
+    tick hands every item whose slot has passed to ``on_expire`` in one
+    call.  Deadlines fire at most one tick late and never early.  Scheduling
+    and cancelling are O(1), so completed calls do not linger until their
+    deadline.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        on_expire: Callable[[list[T]], None],
+        tick_ms: float = 10,
+    ) -> None:
+        self._loop = loop
+        self._on_expire = on_expire
+        self._tick = tick_ms / 1000
+        self._slots: dict[int, dict[str, T]] = {}
+        self._index: dict[str, int] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._last_tick = self._now_tick()
+        self._expired_total = 0
+        self._expired_by_second: collections.deque[list[int]] = collections.deque()
+
+    def _now_tick(self) -> int:
+        return math.floor(self._loop.time() / self._tick)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def schedule(self, key: str, timeout_ms: float, item: T) -> None:
+        """Expire ``item`` after ``timeout_ms`` unless ``cancel(key)`` is called first."""
+        self.cancel(key)
+        slot = math.ceil((self._loop.time() + timeout_ms / 1000) / self._tick)
+        self._slots.setdefault(slot, {})[key] = item
+        self._index[key] = slot
+        if self._handle is None:
+            self._last_tick = self._now_tick()
+            self._handle = self._loop.call_later(self._tick, self._advance)
+
+    def cancel(self, key: str) -> None:
+        slot = self._index.pop(key, None)
+        if slot is None:
+            return
+        bucket = self._slots[slot]
+        del bucket[key]
+        if not bucket:
+            del self._slots[slot]
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self._index.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _advance(self) -> None:
+        self._handle = None
+        now = self._now_tick()
+        expired: list[T] = []
+        # Walk every slot since the previous tick so a late tick loses nothing.
+        for slot in range(self._last_tick + 1, now + 1):
+            bucket = self._slots.pop(slot, None)
+            if bucket:
+                for key in bucket:
+                    del self._index[key]
+                expired.extend(bucket.values())
+        self._last_tick = now
+        if self._index:
+            self._handle = self._loop.call_later(self._tick, self._advance)
+        if expired:
+            self._record_expired(len(expired))
+            self._on_expire(expired)
+
+    def _record_expired(self, count: int) -> None:
+        self._expired_total += count
+        second = int(self._loop.time())
+        if self._expired_by_second and self._expired_by_second[-1][0] == second:
+            self._expired_by_second[-1][1] += count
+        else:
+            self._expired_by_second.append([second, count])
+
+    def _expiry_rate(self) -> float:
+        horizon = self._loop.time() - RATE_WINDOW_SECONDS
+        while self._expired_by_second and self._expired_by_second[0][0] < horizon:
+            self._expired_by_second.popleft()
+        return sum(count for _, count in self._expired_by_second) / RATE_WINDOW_SECONDS
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "scheduled": len(self._index),
+            "expired_total": self._expired_total,
+            "expired_per_second": self._expiry_rate(),
+        }
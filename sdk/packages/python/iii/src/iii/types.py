@@ -22,6 +22,7 @@ from .iii_types import (
     TriggerInfo,
     TriggerRequest,
 )
+from .interceptors import MessageInterceptor
 from .stream import IStream
 from .triggers import Trigger, TriggerHandler
 
@@ -43,6 +44,7 @@ class RemoteFunctionData(BaseModel):
 
     message: RegisterFunctionMessage
     handler: RemoteFunctionHandler | None = None
+    stream_spilled: bool = False
 
 
 class RemoteTriggerTypeData(BaseModel):
@@ -108,7 +110,7 @@ class IIIClient(Protocol):
 
     def unregister_trigger_type(self, trigger_type: RegisterTriggerTypeInput | dict[str, Any]) -> None: ...
 
-    def create_channel(self, buffer_size: int | None = None) -> Channel: ...
+    def create_channel(self, buffer_size: int | None = None, frame_size: int | None = None) -> Channel: ...
 
     def create_stream(self, stream_name: str, stream: IStream[Any]) -> None: ...
 
@@ -118,6 +120,8 @@ class IIIClient(Protocol):
 
     def on_functions_available(self, callback: FunctionsAvailableCallback) -> Callable[[], None]: ...
 
+    def add_interceptor(self, interceptor: MessageInterceptor) -> Callable[[], None]: ...
+
     def shutdown(self) -> None: ...
 
 
@@ -200,6 +204,21 @@ class HttpRequest:
     request_body: ChannelReader
 
 
+CHANNEL_REF_MARKER = "channel_id"
+"""Key every serialized ``StreamChannelRef`` contains."""
+
+
+def may_contain_channel_ref(raw: str | bytes) -> bool:
+    """Cheap pre-check on an encoded frame before walking its payload for channel refs.
+
+    A substring search runs at memory speed, so payloads without channels
+    never need to be walked.  A ``True`` result may be a false positive.
+    """
+    if isinstance(raw, str):
+        return CHANNEL_REF_MARKER in raw
+    return CHANNEL_REF_MARKER.encode() in raw
+
+
 def is_channel_ref(value: Any) -> bool:
     """Check if a value looks like a StreamChannelRef."""
     return (
@@ -0,0 +1,144 @@
+"""Plain-dict builders for the messages on the invocation hot path.
+
+``trigger()`` and every handled invocation send one of two messages.  Building
+them as pydantic models and dumping them again costs more than the encode
+itself, so these helpers produce the same dicts that
+``model_dump(by_alias=True, exclude_none=True)`` would, directly.  Nested
+models and dataclasses inside payloads are still encoded by the codec's
+fallback.
+
+The OpenTelemetry modules used for ``traceparent``/``baggage`` propagation
+are imported once here rather than on every invocation.
+"""
+
+from __future__ import annotations
+
+import itertools
+import uuid
+from typing import Any
+
+from .iii_types import MessageType, TriggerActionEnqueue, TriggerActionVoid
+
+INVOKE_FUNCTION = MessageType.INVOKE_FUNCTION.value
+INVOCATION_RESULT = MessageType.INVOCATION_RESULT.value
+
+_U64 = (1 << 64) - 1
+
+try:
+    from opentelemetry import context as _otel_context
+    from opentelemetry import propagate as _otel_propagate
+
+    HAS_OTEL = True
+except ImportError:
+    HAS_OTEL = False
+
+
+class InvocationIdGenerator:
+    """Generates unique, UUID-formatted invocation ids without calling ``uuid4``.
+
+    The engine parses invocation ids as UUIDs, so each id keeps that shape:
+    a random prefix drawn once per generator followed by a 64-bit counter.
+    Ids from one generator never repeat, and the random prefix keeps
+    generators in different processes (including forked workers, which build
+    a new client) apart.
+    """
+
+    __slots__ = ("_counter", "_prefix")
+
+    def __init__(self) -> None:
+        seed = uuid.uuid4().hex
+        self._prefix = f"{seed[:8]}-{seed[8:12]}-{seed[12:16]}-"
+        self._counter = itertools.count(int(seed[16:], 16))
+
+    def __call__(self) -> str:
+        n = next(self._counter) & _U64
+        return f"{self._prefix}{n >> 48:04x}-{n & 0xFFFFFFFFFFFF:012x}"
+
+
+def inject_trace_context() -> tuple[str | None, str | None]:
+    """Return the current ``(traceparent, baggage)`` from a single propagator pass."""
+    if not HAS_OTEL:
+        return None, None
+    carrier: dict[str, str] = {}
+    _otel_propagate.inject(carrier, context=_otel_context.get_current())
+    return carrier.get("traceparent"), carrier.get("baggage")
+
+
+def is_sampled_out(traceparent: str | None) -> bool:
+    """Whether ``traceparent`` is well formed and has its ``sampled`` flag cleared.
+
+    Parent-based samplers (the OpenTelemetry default) drop every span below
+    such a parent, so work done only to record spans can be skipped.
+    Missing or malformed headers return ``False`` and take the full path.
+    """
+    if not traceparent or len(traceparent) < 55 or traceparent[52] != "-":
+        return False
+    try:
+        return not int(traceparent[53:55], 16) & 0x01
+    except ValueError:
+        return False
+
+
+def extract_trace_context(traceparent: str | None, baggage: str | None) -> Any:
+    """Return the context carried by ``traceparent``/``baggage``, or the current one."""
+    if not traceparent and not baggage:
+        return _otel_context.get_current()
+    carrier: dict[str, str] = {}
+    if traceparent:
+        carrier["traceparent"] = traceparent
+    if baggage:
+        carrier["baggage"] = baggage
+    return _otel_propagate.extract(carrier)
+
+
+def action_dict(action: Any) -> dict[str, Any] | None:
+    """Normalise a trigger action (model or dict) to its wire form."""
+    if action is None or isinstance(action, dict):
+        return action
+    if isinstance(action, TriggerActionEnqueue):
+        return {"type": "enqueue", "queue": action.queue}
+    if isinstance(action, TriggerActionVoid):
+        return {"type": "void"}
+    dumped: dict[str, Any] = action.model_dump(exclude_none=True)
+    return dumped
+
+
+def invoke_function_message(
+    function_id: str,
+    data: Any,
+    invocation_id: str | None = None,
+    traceparent: str | None = None,
+    baggage: str | None = None,
+    action: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Build an ``invokefunction`` message; equivalent to ``InvokeFunctionMessage``."""
+    msg: dict[str, Any] = {"type": INVOKE_FUNCTION, "function_id": function_id}
+    if data is not None:
+        msg["data"] = data
+    if invocation_id is not None:
+        msg["invocation_id"] = invocation_id
+    if traceparent is not None:
+        msg["traceparent"] = traceparent
+    if baggage is not None:
+        msg["baggage"] = baggage
+    if action is not None:
+        msg["action"] = action
+    return msg
+
+
+def invocation_result_message(
+    invocation_id: str,
+    function_id: str,
+    result: Any = None,
+    error: Any = None,
+    traceparent: str | None = None,
+) -> dict[str, Any]:
+    """Build an ``invocationresult`` message; equivalent to ``InvocationResultMessage``."""
+    msg: dict[str, Any] = {"type": INVOCATION_RESULT, "invocation_id": invocation_id, "function_id": function_id}
+    if result is not None:
+        msg["result"] = result
+    if error is not None:
+        msg["error"] = error
+    if traceparent is not None:
+        msg["traceparent"] = traceparent
+    return msg
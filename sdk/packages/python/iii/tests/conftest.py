@@ -1,10 +1,18 @@
-"""Shared fixtures for III SDK integration tests."""
+"""Shared fixtures for III SDK tests."""
 
+import asyncio
+import json
 import os
 import time
+from collections.abc import Callable, Iterator
+from types import SimpleNamespace
+from typing import Any
 
 import pytest
+import websockets
 
+import iii.iii as iii_module
+from iii import InitOptions
 from iii.iii import III
 
 ENGINE_WS_URL = os.environ.get("III_URL", "ws://localhost:49199")
@@ -24,3 +32,64 @@ def iii_client():
 @pytest.fixture
 def engine_http_url():
     return ENGINE_HTTP_URL
+
+
+class RecordingWebSocket:
+    """Stands in for the engine connection and records every frame sent to it.
+
+    ``frames`` holds the frames as written and ``sent`` their JSON decoding.
+    With ``fail_after`` set, sends beyond that many frames fail as if the
+    connection had closed.  Nothing is ever received.
+    """
+
+    def __init__(self, fail_after: int | None = None) -> None:
+        self.frames: list[str | bytes] = []
+        self.sent: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self._fail_after = fail_after
+
+    async def send(self, payload: str | bytes) -> None:
+        if self._fail_after is not None and len(self.frames) >= self._fail_after:
+            raise websockets.ConnectionClosedOK(None, None)
+        self.frames.append(payload)
+        self.sent.append(json.loads(payload))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "RecordingWebSocket":
+        return self
+
+    async def __anext__(self) -> Any:
+        await asyncio.Event().wait()
+
+
+@pytest.fixture
+def fake_client(monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[..., III]]:
+    """Build connected III clients whose engine connection is a ``RecordingWebSocket``.
+
+    Call it with the client's ``InitOptions`` and optionally the socket to
+    connect to; the client's socket is ``client._ws``.  Clients the test has
+    not shut down are shut down afterwards.
+    """
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    clients: list[III] = []
+
+    def make(options: InitOptions | None = None, ws: RecordingWebSocket | None = None) -> III:
+        socket = ws if ws is not None else RecordingWebSocket()
+
+        async def fake_connect(_: str, **kwargs: Any) -> RecordingWebSocket:
+            return socket
+
+        monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+        client = III("ws://fake", options or InitOptions())
+        client._wait_until_connected()
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        if client._thread.is_alive():
+            client.shutdown()
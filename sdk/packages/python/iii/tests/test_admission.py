@@ -0,0 +1,189 @@
+"""Tests for bounded admission control of incoming invocations."""
+
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from conftest import RecordingWebSocket
+
+from iii import ConcurrencyLimits, InitOptions
+from iii.admission import AdmissionController
+from iii.iii import III
+
+
+def _invoke(client: III, function_id: str, invocation_id: str) -> None:
+    frame = json.dumps(
+        {"type": "invokefunction", "function_id": function_id, "invocation_id": invocation_id, "data": invocation_id}
+    )
+    client._run_on_loop(client._handle_message(frame))
+
+
+def _results(ws: RecordingWebSocket) -> dict[str, dict[str, Any]]:
+    return {m["invocation_id"]: m for m in ws.sent if m.get("type") == "invocationresult"}
+
+
+def test_worker_limit_queues_then_rejects_with_overloaded(fake_client: Callable[..., III]) -> None:
+    client = fake_client(InitOptions(concurrency=ConcurrencyLimits(max_concurrent=1, max_queued=1)))
+    ws = client._ws
+    release = asyncio.Event()
+
+    async def slow(data: Any) -> Any:
+        await release.wait()
+        return data
+
+    client.register_function({"id": "slow"}, slow)
+    for inv in ("a", "b", "c"):
+        _invoke(client, "slow", inv)
+    time.sleep(0.02)
+
+    stats = client.get_runtime_stats()["invocations"]
+    assert stats["in_flight"] == 1
+    assert stats["queued"] == 1
+    assert stats["rejected"] == 1
+    assert _results(ws)["c"]["error"]["code"] == "overloaded"
+
+    client._loop.call_soon_threadsafe(release.set)
+    time.sleep(0.05)
+    results = _results(ws)
+    client.shutdown()
+
+    assert results["a"]["result"] == "a"
+    assert results["b"]["result"] == "b"
+    assert client.get_runtime_stats()["invocations"]["in_flight"] == 0
+
+
+def test_function_limit_does_not_block_other_functions(fake_client: Callable[..., III]) -> None:
+    client = fake_client()
+    ws = client._ws
+    release = asyncio.Event()
+
+    async def slow(data: Any) -> Any:
+        await release.wait()
+        return data
+
+    async def fast(data: Any) -> Any:
+        return data
+
+    client.register_function({"id": "slow"}, slow, concurrency=ConcurrencyLimits(max_concurrent=1))
+    client.register_function({"id": "fast"}, fast)
+
+    _invoke(client, "slow", "s1")
+    _invoke(client, "slow", "s2")
+    _invoke(client, "fast", "f1")
+    time.sleep(0.02)
+
+    results = _results(ws)
+    assert results["s2"]["error"]["code"] == "overloaded"
+    assert results["f1"]["result"] == "f1"
+    assert "s1" not in results
+
+    client._loop.call_soon_threadsafe(release.set)
+    time.sleep(0.02)
+    stats = client.get_runtime_stats()["invocations"]
+    client.shutdown()
+
+    assert _results(ws)["s1"]["result"] == "s1"
+    assert stats["functions"]["slow"]["rejected"] == 1
+
+
+def test_queued_invocations_do_not_create_tasks_until_admitted() -> None:
+    started: list[str] = []
+    controller = AdmissionController(ConcurrencyLimits(max_concurrent=2, max_queued=10))
+
+    for name in "abcde":
+        assert controller.submit("fn", lambda name=name: started.append(name))
+
+    assert started == ["a", "b"]
+    assert controller.stats()["queued"] == 3
+
+    controller.release("fn")
+    controller.release("fn")
+    assert started == ["a", "b", "c", "d"]
+
+
+def test_queued_waiter_for_saturated_function_does_not_block_others() -> None:
+    started: list[str] = []
+    controller = AdmissionController(ConcurrencyLimits(max_concurrent=10, max_queued=10))
+    controller.configure_function("busy", ConcurrencyLimits(max_concurrent=1, max_queued=5))
+
+    controller.submit("busy", lambda: started.append("busy-1"))
+    controller.submit("busy", lambda: started.append("busy-2"))
+    controller.submit("other", lambda: started.append("other"))
+
+    assert started == ["busy-1", "other"]
+    controller.release("busy")
+    assert started == ["busy-1", "other", "busy-2"]
+
+
+def test_drain_unregisters_functions_and_waits_for_running_invocations(fake_client: Callable[..., III]) -> None:
+    client = fake_client()
+    ws = client._ws
+
+    async def slow(data: Any) -> Any:
+        await asyncio.sleep(0.1)
+        return data
+
+    client.register_function({"id": "slow"}, slow)
+    _invoke(client, "slow", "a")
+
+    drained = client.drain(timeout=5)
+    results = _results(ws)
+    client.shutdown()
+
+    assert drained
+    assert results["a"]["result"] == "a"
+    assert {"type": "unregisterfunction", "id": "slow"} in ws.sent
+
+
+def test_drain_gives_up_after_timeout(fake_client: Callable[..., III]) -> None:
+    client = fake_client()
+    ws = client._ws
+    release = asyncio.Event()
+
+    async def hang(data: Any) -> Any:
+        await release.wait()
+        return data
+
+    client.register_function({"id": "hang"}, hang)
+    _invoke(client, "hang", "a")
+
+    drained = client.drain(timeout=0.1)
+    stats = client.get_runtime_stats()["invocations"]
+    results = _results(ws)
+    client._loop.call_soon_threadsafe(release.set)
+    assert client.drain(timeout=5)
+    client.shutdown()
+
+    assert not drained
+    assert stats["in_flight"] == 1
+    assert "a" not in results
+
+
+def test_void_invocations_hold_their_slot_until_the_handler_finishes(fake_client: Callable[..., III]) -> None:
+    client = fake_client()
+    release = asyncio.Event()
+    running: list[Any] = []
+
+    async def slow(data: Any) -> Any:
+        running.append(data)
+        await release.wait()
+
+    client.register_function({"id": "slow"}, slow, concurrency=ConcurrencyLimits(max_concurrent=1, max_queued=1))
+    for n in range(3):
+        frame = json.dumps({"type": "invokefunction", "function_id": "slow", "data": n})
+        client._run_on_loop(client._handle_message(frame))
+    time.sleep(0.02)
+
+    stats = client.get_runtime_stats()["invocations"]
+    assert running == [0]
+    assert stats["in_flight"] == 1
+    assert stats["queued"] == 1
+    assert stats["functions"]["slow"]["rejected"] == 1
+
+    client._loop.call_soon_threadsafe(release.set)
+    assert client.drain(timeout=5)
+    client.shutdown()
+
+    assert running == [0, 1]
@@ -0,0 +1,123 @@
+"""Tests for the asyncio-native ``III.aio`` API."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import iii.iii as iii_module
+from iii import AsyncIII, InitOptions
+from iii.iii import III
+
+
+class EchoEngineWebSocket:
+    """Fake engine socket that answers every invocation with ``{"echo": data}``."""
+
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self._inbox: asyncio.Queue[str] | None = None
+
+    def _queue(self) -> asyncio.Queue[str]:
+        if self._inbox is None:
+            self._inbox = asyncio.Queue()
+        return self._inbox
+
+    async def send(self, payload: str | bytes) -> None:
+        msg = json.loads(payload)
+        self.sent.append(msg)
+        if msg.get("type") == "invokefunction" and msg.get("invocation_id"):
+            result = {
+                "type": "invocationresult",
+                "invocation_id": msg["invocation_id"],
+                "function_id": msg["function_id"],
+                "result": {"echo": msg.get("data")},
+            }
+            self._queue().put_nowait(json.dumps(result))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "EchoEngineWebSocket":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._queue().get()
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch):
+    ws = EchoEngineWebSocket()
+
+    async def fake_connect(_: str) -> EchoEngineWebSocket:
+        return ws
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+
+    c = III("ws://fake", InitOptions())
+    c._wait_until_connected()
+    yield c
+    c.shutdown()
+
+
+def test_aio_is_async_iii(client: III) -> None:
+    assert isinstance(client.aio, AsyncIII)
+    assert client.aio is client.aio
+    assert client.aio.client is client
+
+
+def test_aio_trigger_from_foreign_event_loop(client: III) -> None:
+    """Awaiting from a caller-owned loop returns the result without blocking that loop."""
+
+    async def main() -> Any:
+        await client.aio.wait_until_connected()
+        return await asyncio.gather(
+            client.aio.trigger({"function_id": "remote.echo", "payload": 1}),
+            client.aio.trigger({"function_id": "remote.echo", "payload": 2}),
+        )
+
+    assert asyncio.run(main()) == [{"echo": 1}, {"echo": 2}]
+
+
+def test_aio_trigger_inline_inside_async_handler(client: III) -> None:
+    """Async handlers run on the SDK loop and can await nested calls directly."""
+    loops: list[asyncio.AbstractEventLoop] = []
+
+    async def proxy(data: Any) -> Any:
+        loops.append(asyncio.get_running_loop())
+        return await client.aio.trigger({"function_id": "remote.echo", "payload": data})
+
+    client.register_function({"id": "local.proxy"}, proxy)
+
+    async def invoke() -> Any:
+        return await client._functions["local.proxy"].handler({"x": 1})  # type: ignore[misc]
+
+    result = client._run_on_loop(invoke())
+
+    assert result == {"echo": {"x": 1}}
+    assert loops == [client._loop]
+
+
+def test_sync_call_on_sdk_loop_points_to_aio(client: III) -> None:
+    async def call_sync() -> None:
+        client.trigger({"function_id": "remote.echo", "payload": None})
+
+    with pytest.raises(RuntimeError, match="iii.aio"):
+        client._run_on_loop(call_sync())
+
+
+def test_aio_wait_until_connected_raises_when_failed(client: III) -> None:
+    client._loop.call_soon_threadsafe(client._set_connection_state, "failed")
+    time.sleep(0.05)
+
+    async def main() -> None:
+        await client.aio.wait_until_connected()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
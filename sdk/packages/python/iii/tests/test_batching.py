@@ -0,0 +1,118 @@
+"""Tests for micro-batched function handlers."""
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from iii import BatchConfig
+from iii.iii import III
+
+
+@pytest.fixture
+def client(fake_client: Callable[..., III]):
+    return fake_client()
+
+
+def _invoke_all(client: III, function_id: str, payloads: list[Any]) -> None:
+    async def send_all() -> None:
+        for i, payload in enumerate(payloads):
+            frame = json.dumps(
+                {"type": "invokefunction", "function_id": function_id, "invocation_id": f"inv-{i}", "data": payload}
+            )
+            await client._handle_message(frame)
+
+    client._run_on_loop(send_all())
+
+
+def _wait_results(client: Any, count: int, timeout: float = 5.0) -> dict[str, dict[str, Any]]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        results = {m["invocation_id"]: m for m in client._ws.sent if m.get("type") == "invocationresult"}
+        if len(results) >= count:
+            return results
+        time.sleep(0.005)
+    raise AssertionError(f"expected {count} results")
+
+
+def test_concurrent_invocations_are_batched_and_results_routed(client: Any) -> None:
+    batches: list[list[int]] = []
+
+    async def square(payloads: list[int]) -> list[int]:
+        batches.append(payloads)
+        return [p * p for p in payloads]
+
+    client.register_function({"id": "square"}, square, batching=BatchConfig(max_batch_size=4, max_wait_ms=20))
+
+    _invoke_all(client, "square", list(range(6)))
+
+    results = _wait_results(client, 6)
+    assert {inv: r["result"] for inv, r in results.items()} == {f"inv-{i}": i * i for i in range(6)}
+    assert batches == [[0, 1, 2, 3], [4, 5]]
+
+    stats = client.get_runtime_stats()["batching"]["square"]
+    assert stats["flushed_full"] == 1
+    assert stats["flushed_timeout"] == 1
+    assert stats["batch_size"]["count"] == 2
+    assert stats["batch_size"]["max"] == 4
+
+
+def test_invocation_span_is_named_after_the_batch_handler(client: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(trace, "get_tracer", lambda name, *args, **kwargs: provider.get_tracer(name))
+
+    async def square(payloads: list[int]) -> list[int]:
+        return [p * p for p in payloads]
+
+    client.register_function({"id": "square"}, square, batching=BatchConfig(max_batch_size=1))
+    handler = client._functions["square"].handler
+    traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+    result, _ = client._run_on_loop(client._invoke_with_otel_context(handler, 3, traceparent, None))
+
+    assert result == 9
+    assert handler.__qualname__ == square.__qualname__
+    assert [span.name for span in exporter.get_finished_spans()] == ["call square"]
+
+
+def test_exception_items_fail_only_their_invocation(client: Any) -> None:
+    def check(payloads: list[int]) -> list[Any]:
+        return [ValueError(f"bad {p}") if p < 0 else p for p in payloads]
+
+    client.register_function({"id": "check"}, check, batching=BatchConfig(max_wait_ms=10))
+
+    _invoke_all(client, "check", [1, -2, 3])
+
+    results = _wait_results(client, 3)
+    assert results["inv-0"]["result"] == 1
+    assert results["inv-1"]["error"]["message"] == "bad -2"
+    assert results["inv-2"]["result"] == 3
+
+
+def _model_down(payloads: list[int]) -> list[int]:
+    raise RuntimeError("model down")
+
+
+@pytest.mark.parametrize(
+    ("handler", "message"),
+    [
+        (_model_down, "model down"),
+        (lambda payloads: payloads[:1], "must return a list of 2 results"),
+    ],
+)
+def test_handler_failure_or_wrong_length_fails_whole_batch(client: Any, handler: Any, message: str) -> None:
+    client.register_function({"id": "broken"}, handler, batching=BatchConfig(max_wait_ms=10))
+
+    _invoke_all(client, "broken", [1, 2])
+
+    results = _wait_results(client, 2)
+    assert all(message in r["error"]["message"] for r in results.values())
+    assert client.get_runtime_stats()["batching"]["broken"]["failed_batches"] == 1
@@ -0,0 +1,219 @@
+"""Tests for data channels multiplexed over the engine connection."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import websockets
+
+import iii.iii as iii_module
+from iii import ChannelMuxConfig, InitOptions
+from iii.channel_mux import (
+    CAPABILITY_CHANNEL_MUX,
+    OP_CLOSE,
+    OP_CREDIT,
+    OP_DATA,
+    OP_OPEN,
+    OP_TEXT,
+    is_mux_frame,
+    mux_frame,
+    parse_mux_frame,
+)
+from iii.iii import III
+
+WINDOW = 4096
+
+
+class MuxEngine:
+    """Creates channels and pipes each channel's writer stream into its reader stream."""
+
+    def __init__(self, capabilities: list[str]) -> None:
+        self.state = SimpleNamespace(name="OPEN")
+        self.opened: list[dict[str, Any]] = []
+        self.credits: dict[int, int] = {}
+        self.metadata: list[dict[str, Any]] = []
+        self._streams: dict[tuple[str, str], int] = {}
+        self._pending: dict[str, list[tuple[int, bytes]]] = {}
+        self._channels = 0
+        self._inbox: asyncio.Queue[Any] = asyncio.Queue()
+        self._inbox.put_nowait(json.dumps({"type": "workerregistered", "worker_id": "w", "capabilities": capabilities}))
+
+    async def send(self, frame: str | bytes) -> None:
+        if is_mux_frame(frame):
+            self._on_mux(*parse_mux_frame(frame))  # type: ignore[arg-type]
+            return
+        msg = json.loads(frame)
+        if msg.get("function_id") == "engine::workers::register":
+            self.metadata.append(msg["data"])
+        if msg.get("function_id") == "engine::channels::create":
+            channel_id = f"ch-{self._channels}"
+            self._channels += 1
+            self._pending[channel_id] = []
+            refs = {d: {"channel_id": channel_id, "access_key": "k", "direction": d} for d in ("read", "write")}
+            result = {"writer": refs["write"], "reader": refs["read"]}
+            self._reply({"type": "invocationresult", "invocation_id": msg["invocation_id"], "result": result})
+
+    def _on_mux(self, op: int, stream_id: int, body: memoryview) -> None:
+        if op == OP_OPEN:
+            ref = json.loads(bytes(body))
+            self.opened.append(ref)
+            key = (ref["channel_id"], ref["direction"])
+            self._streams[key] = stream_id
+            if ref["direction"] == "read":
+                for pending_op, pending_body in self._pending.pop(ref["channel_id"]):
+                    self._reply(mux_frame(pending_op, stream_id, pending_body))
+            return
+        channel_id, direction = next(k for k, v in self._streams.items() if v == stream_id)
+        if op == OP_CREDIT:
+            self.credits[stream_id] = self.credits.get(stream_id, 0) + int.from_bytes(body, "big")
+            return
+        if op == OP_DATA:
+            # Hand the writer its window back as soon as the chunk is forwarded.
+            self._reply(mux_frame(OP_CREDIT, stream_id, len(body).to_bytes(4, "big")))
+        if direction == "write":
+            self._forward(channel_id, op, bytes(body))
+
+    def _forward(self, channel_id: str, op: int, body: bytes) -> None:
+        reader = self._streams.get((channel_id, "read"))
+        if reader is None:
+            self._pending[channel_id].append((op, body))
+        else:
+            self._reply(mux_frame(op, reader, body))
+
+    def _reply(self, msg: Any) -> None:
+        self._inbox.put_nowait(msg if isinstance(msg, bytes) else json.dumps(msg))
+
+    def drop(self) -> None:
+        self._inbox.put_nowait(websockets.ConnectionClosed(None, None))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "MuxEngine":
+        return self
+
+    async def __anext__(self) -> Any:
+        item = await self._inbox.get()
+        if isinstance(item, Exception):
+            self.state = SimpleNamespace(name="CLOSED")
+            raise item
+        return item
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, engine: MuxEngine, channel_urls: list[str]) -> III:
+    async def fake_connect(url: str, **kwargs: Any) -> Any:
+        if "/ws/channels/" in url:
+            channel_urls.append(url)
+            raise ConnectionRefusedError(url)
+        return engine
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.channels.websockets.connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    client = III("ws://fake", InitOptions(channel_mux=ChannelMuxConfig(window_bytes=WINDOW)))
+    client._wait_until_connected()
+    asyncio.run_coroutine_threadsafe(client._worker_registered.wait(), client._loop).result(timeout=5)
+    return client
+
+
+def test_channel_streams_share_the_engine_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = MuxEngine([CAPABILITY_CHANNEL_MUX])
+    channel_urls: list[str] = []
+    client = _client(monkeypatch, engine, channel_urls)
+    data = bytes(range(256)) * 100
+    messages: list[str] = []
+
+    async def transfer() -> bytes:
+        channel = await client._async_create_channel(frame_size=1000)
+        channel.reader.on_message(messages.append)
+        reader = asyncio.create_task(channel.reader.read_all())
+        await channel.writer.send_message_async("meta")
+        await channel.writer.write(data)
+        await asyncio.sleep(0.05)
+        await channel.writer.close_async()
+        return await reader
+
+    try:
+        received = asyncio.run_coroutine_threadsafe(transfer(), client._loop).result(timeout=5)
+
+        assert received == data
+        assert messages == ["meta"]
+        assert channel_urls == []
+        assert [(ref["channel_id"], ref["direction"], ref["window"]) for ref in engine.opened] == [
+            ("ch-0", "write", WINDOW),
+            ("ch-0", "read", WINDOW),
+        ]
+        # The reader returned window to the engine as it consumed chunks.
+        assert sum(engine.credits.values()) >= len(data) - WINDOW
+        stats = client.get_runtime_stats()["channel_mux"]
+        assert stats["opened"] == 2 and stats["open_streams"] == 0 and stats["fallbacks"] == 0
+        assert stats["bytes_sent"] == stats["bytes_received"] == len(data)
+        assert CAPABILITY_CHANNEL_MUX in engine.metadata[0]["capabilities"]
+    finally:
+        client.shutdown()
+
+
+def test_writer_waits_for_credit_beyond_the_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = MuxEngine([CAPABILITY_CHANNEL_MUX])
+    client = _client(monkeypatch, engine, [])
+
+    async def write() -> None:
+        channel = await client._async_create_channel()
+        await channel.writer.write(b"x" * (WINDOW * 3))
+        await channel.writer.close_async()
+
+    try:
+        asyncio.run_coroutine_threadsafe(write(), client._loop).result(timeout=5)
+        assert client.get_runtime_stats()["channel_mux"]["credit_waits"] >= 2
+    finally:
+        client.shutdown()
+
+
+def test_falls_back_to_channel_sockets_without_engine_support(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = MuxEngine([])
+    channel_urls: list[str] = []
+    client = _client(monkeypatch, engine, channel_urls)
+
+    async def write() -> None:
+        channel = await client._async_create_channel()
+        await channel.writer.write(b"data")
+
+    try:
+        with pytest.raises(ConnectionRefusedError):
+            asyncio.run_coroutine_threadsafe(write(), client._loop).result(timeout=5)
+        assert len(channel_urls) == 1 and "/ws/channels/ch-0" in channel_urls[0]
+        assert engine.opened == []
+        assert client.get_runtime_stats()["channel_mux"]["fallbacks"] == 1
+    finally:
+        client.shutdown()
+
+
+def test_open_streams_fail_when_the_engine_connection_drops(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = MuxEngine([CAPABILITY_CHANNEL_MUX])
+    client = _client(monkeypatch, engine, [])
+
+    async def read() -> bytes:
+        channel = await client._async_create_channel()
+        reader = asyncio.create_task(channel.reader.read_all())
+        await channel.writer.write(b"partial")
+        await asyncio.sleep(0.05)
+        engine.drop()
+        return await reader
+
+    try:
+        with pytest.raises(ConnectionError, match="engine connection lost"):
+            asyncio.run_coroutine_threadsafe(read(), client._loop).result(timeout=5)
+    finally:
+        client.shutdown()
+
+
+def test_mux_frames_round_trip() -> None:
+    frame = mux_frame(OP_TEXT, 7, "hello".encode())
+    op, stream_id, body = parse_mux_frame(frame)
+
+    assert (op, stream_id, bytes(body)) == (OP_TEXT, 7, b"hello")
+    assert is_mux_frame(frame) and not is_mux_frame(json.dumps({"type": "ping"}))
+    assert parse_mux_frame(mux_frame(OP_CLOSE, 1))[0] == OP_CLOSE
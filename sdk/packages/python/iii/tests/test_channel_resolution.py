@@ -0,0 +1,85 @@
+"""Tests for channel reference resolution in invocation payloads."""
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from iii import ChannelReader, ChannelWriter
+from iii.iii import III
+from iii.types import may_contain_channel_ref
+
+READ_REF = {"channel_id": "c1", "access_key": "k1", "direction": "read"}
+WRITE_REF = {"channel_id": "c2", "access_key": "k2", "direction": "write"}
+
+
+@pytest.fixture
+def client(fake_client: Callable[..., III]):
+    return fake_client()
+
+
+def test_payload_without_refs_is_returned_uncopied(client: Any) -> None:
+    payload = {"rows": [{"id": i, "tags": ("a", "b")} for i in range(100)], "meta": {"n": 100}}
+
+    assert client._resolve_channels(payload) is payload
+
+
+def test_only_containers_on_the_path_to_a_ref_are_copied(client: Any) -> None:
+    untouched = {"big": list(range(1000))}
+    payload = {"upload": {"stream": READ_REF}, "other": untouched, "outs": ("x", WRITE_REF)}
+
+    resolved = client._resolve_channels(payload)
+
+    assert isinstance(resolved["upload"]["stream"], ChannelReader)
+    assert isinstance(resolved["outs"][1], ChannelWriter)
+    assert isinstance(resolved["outs"], tuple)
+    assert resolved["other"] is untouched
+    assert payload["upload"]["stream"] is READ_REF  # input is not mutated
+
+
+def test_marker_check_handles_text_and_binary_frames() -> None:
+    assert may_contain_channel_ref(json.dumps({"data": READ_REF}))
+    assert may_contain_channel_ref(json.dumps({"data": READ_REF}).encode())
+    assert not may_contain_channel_ref(b'{"data": {"id": 1}}')
+
+
+def _invoke(client: Any, data: Any) -> None:
+    frame = {"type": "invokefunction", "function_id": "echo", "invocation_id": "inv-1", "data": data}
+    client._run_on_loop(client._handle_message(json.dumps(frame)))
+
+
+def _wait_result(client: Any) -> dict[str, Any]:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        for msg in client._ws.sent:
+            if msg.get("type") == "invocationresult":
+                return msg
+        time.sleep(0.005)
+    raise AssertionError("no invocation result")
+
+
+def test_frames_without_marker_skip_resolution(client: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(data: Any) -> Any:
+        raise AssertionError("payload was walked")
+
+    monkeypatch.setattr(client, "_resolve_channels", fail)
+
+    async def echo(data: Any) -> Any:
+        return data
+
+    client.register_function({"id": "echo"}, echo)
+    _invoke(client, {"rows": [1, 2, 3]})
+
+    assert _wait_result(client)["result"] == {"rows": [1, 2, 3]}
+
+
+def test_frames_with_refs_are_resolved(client: Any) -> None:
+    async def echo(data: Any) -> Any:
+        return type(data["body"]).__name__
+
+    client.register_function({"id": "echo"}, echo)
+    _invoke(client, {"body": READ_REF})
+
+    assert _wait_result(client)["result"] == "ChannelReader"
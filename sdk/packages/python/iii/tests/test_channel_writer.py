@@ -0,0 +1,91 @@
+"""Tests for chunked and file writes on ChannelWriter."""
+
+import array
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+import websockets
+
+from iii import ChannelWriter, StreamChannelRef
+
+REF = StreamChannelRef(channel_id="c1", access_key="k1", direction="write")
+
+
+async def _collect(write: Any, frame_size: int = 1024) -> list[bytes]:
+    frames: list[bytes] = []
+
+    async def sink(ws: Any) -> None:
+        async for message in ws:
+            frames.append(message)
+
+    async with websockets.serve(sink, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        writer = ChannelWriter(f"ws://127.0.0.1:{port}", REF, frame_size=frame_size)
+        await write(writer)
+        await writer.close_async()
+        await asyncio.sleep(0.05)
+    return frames
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        bytes(range(256)) * 10,
+        bytearray(b"abc" * 1000),
+        memoryview(b"xyz" * 1000)[5:2900],
+        array.array("i", range(1000)),
+    ],
+    ids=["bytes", "bytearray", "memoryview", "array"],
+)
+def test_write_splits_buffers_into_frames(data: Any) -> None:
+    async def write(writer: ChannelWriter) -> None:
+        await writer.write(data)
+
+    frames = asyncio.run(_collect(write))
+
+    assert b"".join(frames) == bytes(data)
+    assert all(len(frame) == 1024 for frame in frames[:-1])
+    assert 0 < len(frames[-1]) <= 1024
+
+
+def test_small_writes_are_single_frames() -> None:
+    async def write(writer: ChannelWriter) -> None:
+        await writer.write(b"hello")
+        await writer.write(bytearray(b"world"))
+
+    assert asyncio.run(_collect(write)) == [b"hello", b"world"]
+
+
+def test_frame_size_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        ChannelWriter("ws://fake", REF, frame_size=0)
+
+
+def test_write_file_streams_ranges(tmp_path: Path) -> None:
+    path = tmp_path / "blob.bin"
+    content = bytes(range(256)) * 20
+    path.write_bytes(content)
+    written: list[int] = []
+
+    async def write(writer: ChannelWriter) -> None:
+        written.append(await writer.write_file(path))
+        written.append(await writer.write_file(path, offset=100, count=2000))
+        written.append(await writer.write_file(path, offset=len(content)))
+
+    frames = asyncio.run(_collect(write, frame_size=1000))
+
+    assert written == [len(content), 2000, 0]
+    assert b"".join(frames) == content + content[100:2100]
+    assert max(len(frame) for frame in frames) == 1000
+
+
+def test_write_file_of_empty_file_sends_nothing(tmp_path: Path) -> None:
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+
+    async def write(writer: ChannelWriter) -> None:
+        assert await writer.write_file(path) == 0
+
+    assert asyncio.run(_collect(write)) == []
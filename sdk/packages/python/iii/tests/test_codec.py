@@ -0,0 +1,81 @@
+"""Tests for the pluggable wire codec."""
+
+import json
+import time
+from collections.abc import Callable
+
+import pytest
+
+from iii import InitOptions, TriggerAction
+from iii.codec import JSON_CODEC, JsonCodec, MsgspecCodec, OrjsonCodec, encode_bytes, resolve_codec
+from iii.iii import III
+from iii.iii_types import InvocationResultMessage, MessageType
+
+BACKENDS = ["json", "orjson", "msgspec"]
+
+
+def test_resolve_codec_defaults_to_stdlib_json() -> None:
+    assert resolve_codec(None) is JSON_CODEC
+    assert resolve_codec("json") is JSON_CODEC
+    assert isinstance(resolve_codec("orjson"), OrjsonCodec)
+    assert isinstance(resolve_codec("msgspec"), MsgspecCodec)
+    assert resolve_codec("auto").name in {"orjson", "msgspec", "json"}
+
+
+def test_resolve_codec_passes_instances_through_and_rejects_unknown_names() -> None:
+    codec = JsonCodec()
+    assert resolve_codec(codec) is codec
+    with pytest.raises(ValueError, match="Unknown codec"):
+        resolve_codec("yaml")
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_codec_round_trips_protocol_messages(name: str) -> None:
+    codec = resolve_codec(name)
+    msg = {"type": "invokefunction", "function_id": "a::b", "invocation_id": "1", "data": {"x": [1, 2.5, None, "é"]}}
+
+    encoded = codec.encode(msg)
+
+    assert codec.decode(encoded) == msg
+    assert json.loads(encode_bytes(codec, msg)) == msg
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_codec_encodes_pydantic_models_and_enums(name: str) -> None:
+    codec = resolve_codec(name)
+    nested = InvocationResultMessage(invocation_id="1", function_id="f", result={"ok": True})
+
+    decoded = codec.decode(codec.encode({"result": nested, "type": MessageType.INVOKE_FUNCTION}))
+
+    assert decoded["type"] == "invokefunction"
+    assert decoded["result"] == {
+        "invocation_id": "1",
+        "function_id": "f",
+        "result": {"ok": True},
+        "type": "invocationresult",
+    }
+
+
+def test_bytes_backends_emit_binary_frames() -> None:
+    assert isinstance(resolve_codec("json").encode({}), str)
+    assert isinstance(resolve_codec("orjson").encode({}), bytes)
+    assert isinstance(resolve_codec("msgspec").encode({}), bytes)
+
+
+def test_iii_sends_and_receives_with_configured_codec(fake_client: Callable[..., III]) -> None:
+    client = fake_client(InitOptions(codec="orjson"))
+    ws = client._ws
+    client.trigger({"function_id": "demo.fire", "payload": {"x": 1}, "action": TriggerAction.Void()})
+
+    future = client._loop.create_future()
+    client._pending["inv-1"] = future
+    frame = resolve_codec("orjson").encode({"type": "invocationresult", "invocation_id": "inv-1", "result": 42})
+    client._run_on_loop(client._handle_message(frame))
+    time.sleep(0.01)
+    client.shutdown()
+
+    assert future.result() == 42
+    assert ws.frames and all(isinstance(f, bytes) for f in ws.frames)
+    invoke = json.loads(ws.frames[-1])
+    assert invoke["type"] == "invokefunction"
+    assert invoke["data"] == {"x": 1}
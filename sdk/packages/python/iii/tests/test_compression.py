@@ -0,0 +1,161 @@
+"""Tests for WebSocket compression and zstd frames."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import websockets
+import zstandard
+
+import iii.iii as iii_module
+from iii import CompressionConfig, InitOptions
+from iii.compression import CAPABILITY_ZSTD, ZSTD_MAGIC, ByteCounters, ZstdFrames, connect_options
+from iii.iii import III
+
+DOCUMENT = {"pages": [{"text": "lorem ipsum dolor sit amet " * 40, "page": i} for i in range(200)]}
+
+
+def test_connect_options_defaults_and_opt_out() -> None:
+    assert connect_options(None, ByteCounters()) == {}
+    assert connect_options(CompressionConfig(deflate=False), ByteCounters()) == {"compression": None}
+
+    options = connect_options(CompressionConfig(deflate_level=1, max_window_bits=10), ByteCounters())
+    (factory,) = options["extensions"]
+    assert options["compression"] is None
+    assert factory.client_max_window_bits == 10
+    assert factory.compress_settings == {"level": 1, "memLevel": 5}
+
+
+def test_deflate_counters_track_both_directions() -> None:
+    counters = ByteCounters()
+    payload = json.dumps(DOCUMENT)
+
+    async def echo(ws: Any) -> None:
+        async for message in ws:
+            await ws.send(message)
+
+    async def round_trip() -> str:
+        async with websockets.serve(echo, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            async with websockets.connect(
+                f"ws://127.0.0.1:{port}", **connect_options(CompressionConfig(), counters)
+            ) as ws:
+                await ws.send(payload)
+                return await ws.recv()
+
+    assert asyncio.run(round_trip()) == payload
+    assert counters.sent_raw == counters.received_raw == len(payload)
+    assert counters.sent_compressed < counters.sent_raw // 10
+    assert counters.received_compressed < counters.received_raw // 10
+
+
+def test_zstd_frames_compress_only_above_threshold() -> None:
+    frames = ZstdFrames(CompressionConfig(zstd=True, zstd_threshold_bytes=1024))
+    small = json.dumps({"ok": True})
+    large = json.dumps(DOCUMENT)
+
+    assert frames.compress(small) is small
+    compressed = frames.compress(large)
+    assert isinstance(compressed, bytes) and compressed.startswith(ZSTD_MAGIC)
+    assert frames.decompress(compressed) == large.encode()
+
+    stats = frames.counters.stats()
+    assert stats["frames"] == 2
+    assert stats["sent_raw_bytes"] == stats["received_raw_bytes"] == len(large)
+    assert stats["sent_compressed_bytes"] == len(compressed)
+
+
+def test_zstd_frames_without_content_size_decompress_within_the_limit() -> None:
+    data = json.dumps(DOCUMENT).encode()
+    frames = ZstdFrames(CompressionConfig(zstd=True), max_size=len(data))
+    # A streaming compressor does not know the content size when it writes the header.
+    stream = zstandard.ZstdCompressor().compressobj()
+    frame = stream.compress(data) + stream.flush()
+    assert zstandard.get_frame_parameters(frame).content_size == zstandard.CONTENTSIZE_UNKNOWN
+
+    assert frames.decompress(frame) == data
+
+    stream = zstandard.ZstdCompressor().compressobj()
+    oversized = stream.compress(data + b" ") + stream.flush()
+    with pytest.raises(ValueError, match=f"more than {len(data)} bytes"):
+        frames.decompress(oversized)
+
+
+class ZstdEngine:
+    """Advertises zstd frames and answers invocations with a compressed echo."""
+
+    def __init__(self, capabilities: list[str]) -> None:
+        self.frames: list[str | bytes] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self._inbox: asyncio.Queue[str | bytes] = asyncio.Queue()
+        self._inbox.put_nowait(json.dumps({"type": "workerregistered", "worker_id": "w", "capabilities": capabilities}))
+
+    async def send(self, frame: str | bytes) -> None:
+        self.frames.append(frame)
+        if isinstance(frame, bytes) and frame.startswith(ZSTD_MAGIC):
+            frame = zstandard.ZstdDecompressor().decompress(frame)
+        msg = json.loads(frame)
+        if msg.get("type") == "invokefunction" and msg.get("invocation_id"):
+            reply = {"type": "invocationresult", "invocation_id": msg["invocation_id"], "result": msg["data"]}
+            self._inbox.put_nowait(zstandard.ZstdCompressor().compress(json.dumps(reply).encode()))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "ZstdEngine":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._inbox.get()
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, engine: ZstdEngine) -> III:
+    connect_kwargs: list[dict[str, Any]] = []
+
+    async def fake_connect(_: str, **kwargs: Any) -> ZstdEngine:
+        connect_kwargs.append(kwargs)
+        return engine
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    client = III("ws://fake", InitOptions(compression=CompressionConfig(deflate=False, zstd=True)))
+    client._wait_until_connected()
+    assert connect_kwargs == [{"compression": None}]
+    return client
+
+
+def _wait_for_capabilities(client: III) -> None:
+    asyncio.run_coroutine_threadsafe(client._worker_registered.wait(), client._loop).result(timeout=5)
+
+
+def test_large_invocations_use_zstd_frames_when_engine_supports_them(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = ZstdEngine([CAPABILITY_ZSTD])
+    client = _client(monkeypatch, engine)
+    try:
+        _wait_for_capabilities(client)
+        assert client.trigger({"function_id": "docs.parse", "payload": DOCUMENT}) == DOCUMENT
+        assert client.trigger({"function_id": "docs.parse", "payload": {"small": 1}}) == {"small": 1}
+
+        large, small = engine.frames
+        assert isinstance(large, bytes) and large.startswith(ZSTD_MAGIC)
+        assert not (isinstance(small, bytes) and small.startswith(ZSTD_MAGIC))
+        zstd_stats = client.get_runtime_stats()["compression"]["engine_zstd"]
+        assert zstd_stats["sent_compressed_bytes"] < zstd_stats["sent_raw_bytes"]
+        assert zstd_stats["received_raw_bytes"] > zstd_stats["received_compressed_bytes"] > 0
+    finally:
+        client.shutdown()
+
+
+def test_zstd_frames_wait_for_engine_capability(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = ZstdEngine([])
+    client = _client(monkeypatch, engine)
+    try:
+        _wait_for_capabilities(client)
+        assert client.trigger({"function_id": "docs.parse", "payload": DOCUMENT}) == DOCUMENT
+        assert isinstance(engine.frames[0], str)
+    finally:
+        client.shutdown()
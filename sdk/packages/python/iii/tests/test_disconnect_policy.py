@@ -0,0 +1,187 @@
+"""Tests for failing or re-sending outstanding calls when the connection drops."""
+
+import asyncio
+import json
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import websockets
+
+import iii.iii as iii_module
+from iii import InitOptions, InvocationDisconnectedError, ReconnectionConfig, SendPipelineConfig
+from iii.iii import III
+
+
+class EngineSocket:
+    """One engine connection; answers invocations only when ``answering``.
+
+    With ``answering=None`` the connection closes on the first invocation
+    written to it, so that frame is never sent.
+    """
+
+    def __init__(self, answering: bool | None) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self.answering = answering
+        self._inbox: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def send(self, payload: str | bytes) -> None:
+        msg = json.loads(payload)
+        if self.answering is None and msg.get("type") == "invokefunction":
+            self.drop()
+            raise websockets.ConnectionClosedError(None, None)
+        self.sent.append(msg)
+        if self.answering and msg.get("type") == "invokefunction" and msg.get("invocation_id"):
+            reply = {"type": "invocationresult", "invocation_id": msg["invocation_id"], "result": msg["data"]}
+            self._inbox.put_nowait(json.dumps(reply))
+
+    def drop(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+        self._inbox.put_nowait(None)
+
+    async def close(self) -> None:
+        self.drop()
+
+    def __aiter__(self) -> "EngineSocket":
+        return self
+
+    async def __anext__(self) -> Any:
+        frame = await self._inbox.get()
+        if frame is None:
+            raise websockets.ConnectionClosedError(None, None)
+        return frame
+
+
+class FakeEngine:
+    def __init__(self, *answering: bool | None) -> None:
+        self._answering = list(answering)
+        self.sockets: list[EngineSocket] = []
+
+    async def connect(self, _: str) -> EngineSocket:
+        socket = EngineSocket(self._answering.pop(0) if self._answering else True)
+        self.sockets.append(socket)
+        return socket
+
+    def invocations(self) -> list[dict[str, Any]]:
+        return [m for s in self.sockets for m in s.sent if m.get("type") == "invokefunction"]
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, engine: FakeEngine, **options: Any) -> III:
+    monkeypatch.setattr(iii_module.websockets, "connect", engine.connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    reconnect = ReconnectionConfig(initial_delay_ms=10, jitter_factor=0)
+    client = III("ws://fake", InitOptions(reconnection_config=reconnect, **options))
+    client._wait_until_connected()
+    return client
+
+
+def _start_call(client: III, request: dict[str, Any]) -> "Future[Any]":
+    return asyncio.run_coroutine_threadsafe(client._async_trigger(request), client._loop)
+
+
+def _drop_when_sent(client: III, engine: FakeEngine, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while len(engine.invocations()) < count:
+        assert time.monotonic() < deadline, "invocation was never sent"
+        time.sleep(0.005)
+    client._loop.call_soon_threadsafe(engine.sockets[-1].drop)
+
+
+def test_outstanding_call_fails_fast_on_disconnect(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = FakeEngine(False)
+    client = _client(monkeypatch, engine)
+    try:
+        started = time.monotonic()
+        call = _start_call(client, {"function_id": "slow", "payload": 1})
+        _drop_when_sent(client, engine, 1)
+
+        with pytest.raises(InvocationDisconnectedError) as exc_info:
+            call.result(timeout=5)
+
+        assert time.monotonic() - started < 5
+        assert exc_info.value.retryable
+        assert exc_info.value.attempts == 1
+        assert exc_info.value.function_id == "slow"
+        assert client.get_runtime_stats()["disconnected_calls"]["failed"] == 1
+        assert client._pending == {} and client._calls == {}
+    finally:
+        client.shutdown()
+
+
+def test_resend_policy_retransmits_on_the_new_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = FakeEngine(False, True)
+    client = _client(monkeypatch, engine)
+    try:
+        call = _start_call(client, {"function_id": "lookup", "payload": 7, "on_disconnect": "resend"})
+        _drop_when_sent(client, engine, 1)
+
+        assert call.result(timeout=5) == 7
+        first, second = engine.invocations()
+        assert first["invocation_id"] != second["invocation_id"]
+        assert second["data"] == 7
+        assert client.get_runtime_stats()["disconnected_calls"]["resent"] == 1
+        assert client._pending == {} and client._calls == {}
+    finally:
+        client.shutdown()
+
+
+def test_resend_gives_up_after_max_attempts(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = FakeEngine(False, False)
+    client = _client(monkeypatch, engine, on_disconnect="resend", max_invocation_attempts=2)
+    try:
+        call = _start_call(client, {"function_id": "lookup", "payload": 1})
+        _drop_when_sent(client, engine, 1)
+        _drop_when_sent(client, engine, 2)
+
+        with pytest.raises(InvocationDisconnectedError) as exc_info:
+            call.result(timeout=5)
+
+        assert exc_info.value.attempts == 2
+        assert exc_info.value.invocation_id == engine.invocations()[1]["invocation_id"]
+    finally:
+        client.shutdown()
+
+
+def test_per_call_policy_overrides_client_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = FakeEngine(False, True)
+    client = _client(monkeypatch, engine, on_disconnect="resend")
+    try:
+        failing = _start_call(client, {"function_id": "charge", "payload": 1, "on_disconnect": "fail"})
+        resent = _start_call(client, {"function_id": "lookup", "payload": 2})
+        _drop_when_sent(client, engine, 2)
+
+        with pytest.raises(InvocationDisconnectedError):
+            failing.result(timeout=5)
+        assert resent.result(timeout=5) == 2
+        assert [m["function_id"] for m in engine.sockets[1].sent if m.get("type") == "invokefunction"] == ["lookup"]
+    finally:
+        client.shutdown()
+
+
+@pytest.mark.parametrize(("policy", "expected"), [("resend", 1), ("fail", 0)])
+def test_unsent_pipelined_call_is_recovered_once(monkeypatch: pytest.MonkeyPatch, policy: str, expected: int) -> None:
+    engine = FakeEngine(None, True)
+    client = _client(monkeypatch, engine, send_pipeline=SendPipelineConfig())
+    try:
+        call = _start_call(client, {"function_id": "lookup", "payload": 3, "on_disconnect": policy})
+
+        if policy == "resend":
+            assert call.result(timeout=5) == 3
+        else:
+            with pytest.raises(InvocationDisconnectedError):
+                call.result(timeout=5)
+        deadline = time.monotonic() + 5
+        while len(engine.sockets) < 2 or client._connection_state != "connected":
+            assert time.monotonic() < deadline, "client did not reconnect"
+            time.sleep(0.005)
+        time.sleep(0.05)
+
+        assert len(engine.invocations()) == expected
+        assert client._pending == {} and client._calls == {}
+    finally:
+        client.shutdown()
@@ -0,0 +1,178 @@
+"""Tests for per-function executors of synchronous handlers."""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from iii import ExecutorConfig
+from iii.iii import III
+
+
+@pytest.fixture
+def client(fake_client: Callable[..., III]) -> Any:
+    return fake_client()
+
+
+def _invoke(client: III, function_id: str, invocation_id: str, data: Any = None) -> None:
+    frame = json.dumps(
+        {"type": "invokefunction", "function_id": function_id, "invocation_id": invocation_id, "data": data}
+    )
+    client._run_on_loop(client._handle_message(frame))
+
+
+def _wait_for_result(client: Any, invocation_id: str, timeout: float = 5.0) -> dict[str, Any]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for msg in client._ws.sent:
+            if msg.get("type") == "invocationresult" and msg.get("invocation_id") == invocation_id:
+                return msg
+        time.sleep(0.005)
+    raise AssertionError(f"no result for {invocation_id}")
+
+
+def current_pid(_: Any) -> int:
+    return os.getpid()
+
+
+def test_blocked_dedicated_pool_does_not_stall_other_functions(client: Any) -> None:
+    gate = threading.Event()
+
+    def slow(data: Any) -> str:
+        gate.wait(5)
+        return "slow"
+
+    client.register_function({"id": "slow"}, slow, executor=ExecutorConfig(max_workers=1))
+    client.register_function({"id": "fast"}, lambda data: "fast")
+
+    _invoke(client, "slow", "s1")
+    _invoke(client, "slow", "s2")
+    _invoke(client, "fast", "f1")
+
+    assert _wait_for_result(client, "f1")["result"] == "fast"
+    stats = client.get_runtime_stats()["executors"]["slow"]
+    assert stats["kind"] == "thread"
+    assert stats["active"] == 1
+    assert stats["waiting"] == 1
+    assert stats["saturated"] == 1
+
+    gate.set()
+    _wait_for_result(client, "s2")
+    stats = client.get_runtime_stats()["executors"]
+    assert stats["slow"]["completed"] == 2
+    assert stats["slow"]["queue_wait_us"]["count"] == 2
+    assert stats["default"]["completed"] == 1
+
+
+def test_inline_executor_runs_on_event_loop_thread(client: Any) -> None:
+    client.register_function(
+        {"id": "cheap"}, lambda data: threading.current_thread().name, executor=ExecutorConfig(kind="inline")
+    )
+
+    _invoke(client, "cheap", "c1")
+
+    assert _wait_for_result(client, "c1")["result"] == client._thread.name
+    assert client.get_runtime_stats()["executors"]["cheap"]["completed"] == 1
+
+
+def test_named_pool_is_shared_and_conflicts_are_rejected(client: Any) -> None:
+    shared = ExecutorConfig(name="io", max_workers=2)
+    client.register_function({"id": "a"}, lambda data: "a", executor=shared)
+    client.register_function({"id": "b"}, lambda data: "b", executor=ExecutorConfig(name="io"))
+
+    with pytest.raises(ValueError, match="executor 'io' already exists"):
+        client.register_function({"id": "c"}, lambda data: "c", executor=ExecutorConfig(name="io", max_workers=8))
+
+    assert list(client.get_runtime_stats()["executors"]) == ["io"]
+
+
+def test_named_pools_with_different_initializers_conflict(client: Any) -> None:
+    client.register_function({"id": "a"}, lambda data: "a", executor=ExecutorConfig(name="io", initializer=print))
+
+    with pytest.raises(ValueError, match="executor 'io' already exists"):
+        client.register_function({"id": "b"}, lambda data: "b", executor=ExecutorConfig(name="io", initializer=repr))
+
+
+def test_unregister_shuts_down_the_pool_and_reregister_replaces_it(client: Any) -> None:
+    ref = client.register_function({"id": "work"}, lambda data: "w", executor=ExecutorConfig(max_workers=1))
+    _invoke(client, "work", "w1")
+    _wait_for_result(client, "w1")
+    workers = [t for t in threading.enumerate() if t.name.startswith("iii-work")]
+    assert workers
+
+    ref.unregister()
+
+    for worker in workers:
+        worker.join(5)
+        assert not worker.is_alive()
+    assert "work" not in client.get_runtime_stats()["executors"]
+
+    client.register_function({"id": "work"}, lambda data: "w", executor=ExecutorConfig(max_workers=3))
+    assert client.get_runtime_stats()["executors"]["work"]["max_workers"] == 3
+
+
+def test_shared_pool_outlives_all_but_its_last_function(client: Any) -> None:
+    shared = ExecutorConfig(name="io", max_workers=2)
+    first = client.register_function({"id": "a"}, lambda data: "a", executor=shared)
+    second = client.register_function({"id": "b"}, lambda data: "b", executor=shared)
+
+    first.unregister()
+    assert "io" in client.get_runtime_stats()["executors"]
+
+    second.unregister()
+    assert "io" not in client.get_runtime_stats()["executors"]
+
+
+def test_process_executor_runs_handler_in_another_process(client: Any) -> None:
+    client.register_function({"id": "pid"}, current_pid, executor=ExecutorConfig(kind="process", max_workers=1))
+
+    _invoke(client, "pid", "p1")
+
+    result = _wait_for_result(client, "p1", timeout=30)
+    assert "error" not in result
+    assert result["result"] != os.getpid()
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def load_model(name: str) -> None:
+    _worker_state["model"] = name
+
+
+def score(data: Any) -> dict[str, Any]:
+    return {"model": _worker_state.get("model"), "total": sum(data["values"]), "pid": os.getpid()}
+
+
+def test_process_executor_warms_workers_and_runs_initializer(client: Any) -> None:
+    config = ExecutorConfig(kind="process", max_workers=2, initializer=load_model, initargs=("v2",))
+    client.register_function({"id": "score"}, score, executor=config)
+
+    pool = client._executors.get("score", config)._executor
+    deadline = time.monotonic() + 30
+    while len(pool._processes) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(pool._processes) == 2
+
+    _invoke(client, "score", "s1", {"values": [1, 2, 3]})
+
+    result = _wait_for_result(client, "s1", timeout=30)["result"]
+    assert result["model"] == "v2"
+    assert result["total"] == 6
+
+
+def test_process_executor_codec_transfer_round_trips_payloads(client: Any) -> None:
+    config = ExecutorConfig(kind="process", max_workers=1, transfer="codec", initializer=load_model, initargs=("v3",))
+    client.register_function({"id": "score"}, score, executor=config)
+
+    _invoke(client, "score", "s1", {"values": list(range(1000))})
+
+    result = _wait_for_result(client, "s1", timeout=30)
+    assert "error" not in result
+    assert result["result"]["model"] == "v3"
+    assert result["result"]["total"] == sum(range(1000))
+    assert client.get_runtime_stats()["executors"]["score"]["completed"] == 1
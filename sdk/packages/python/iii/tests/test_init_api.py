@@ -30,10 +30,12 @@ def test_register_worker_is_sync() -> None:
 def test_connect_consumes_otel_from_init_options(monkeypatch) -> None:
     import iii.telemetry as telemetry
 
-    captured = {"config": None}
+    captured = {"config": None, "codec": None, "connect_options": None}
 
-    def fake_init_otel(config=None, loop=None):
+    def fake_init_otel(config=None, loop=None, codec=None, connect_options=None):
         captured["config"] = config
+        captured["codec"] = codec
+        captured["connect_options"] = connect_options
 
     def fake_attach_event_loop(loop):
         return None
@@ -54,5 +56,7 @@ def test_connect_consumes_otel_from_init_options(monkeypatch) -> None:
     assert isinstance(client, III)
     assert captured["config"] is not None
     assert getattr(captured["config"], "service_name", None) == "iii-python-init-test"
+    assert captured["codec"] is client._codec
+    assert isinstance(captured["connect_options"], dict)
 
     client.shutdown()
@@ -0,0 +1,94 @@
+"""Tests for message interceptors on the III client."""
+
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from iii import MessageInterceptor
+from iii.iii import III
+
+
+@pytest.fixture
+def client(fake_client: Callable[..., III]):
+    return fake_client()
+
+
+class Recorder(MessageInterceptor):
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.received: list[dict[str, Any]] = []
+
+    def on_send(self, message: dict[str, Any]) -> None:
+        self.sent.append(message["type"])
+        if message["type"] == "invokefunction":
+            message["baggage"] = "tenant=acme"
+
+    def on_receive(self, message: dict[str, Any]) -> None:
+        self.received.append(message)
+
+
+def _invocation(function_id: str) -> str:
+    return json.dumps({"type": "invokefunction", "function_id": function_id, "traceparent": "tp", "data": 1})
+
+
+def test_interceptor_sees_each_frame_decoded_once(client: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    recorder = Recorder()
+    client.add_interceptor(recorder)
+    decoded: list[Any] = []
+    original_decode = client._codec.decode
+    monkeypatch.setattr(client._codec, "decode", lambda raw: decoded.append(raw) or original_decode(raw))
+
+    client._run_on_loop(client._handle_message(_invocation("missing")))
+
+    assert len(decoded) == 1
+    assert recorder.received == [json.loads(_invocation("missing"))]
+
+
+def test_on_send_can_amend_outgoing_messages(client: Any) -> None:
+    recorder = Recorder()
+    client.add_interceptor(recorder)
+
+    client.trigger({"function_id": "notify", "payload": {}, "action": {"type": "void"}})
+
+    assert recorder.sent == ["invokefunction"]
+    assert client._ws.sent[-1]["baggage"] == "tenant=acme"
+
+
+def test_removed_interceptor_is_no_longer_called(client: Any) -> None:
+    recorder = Recorder()
+    remove = client.add_interceptor(recorder)
+    remove()
+    remove()
+
+    client._run_on_loop(client._handle_message(_invocation("missing")))
+
+    assert recorder.received == []
+    assert client._receive_hooks == () and client._send_hooks == ()
+
+
+def test_failing_interceptor_does_not_stop_dispatch(client: Any) -> None:
+    class Broken(MessageInterceptor):
+        def on_receive(self, message: dict[str, Any]) -> None:
+            raise RuntimeError("boom")
+
+    async def echo(data: Any) -> Any:
+        return data
+
+    client.register_function({"id": "echo"}, echo)
+    client.add_interceptor(Broken())
+    assert client._send_hooks == ()
+
+    client._run_on_loop(
+        client._handle_message(
+            json.dumps({"type": "invokefunction", "function_id": "echo", "invocation_id": "i1", "data": 5})
+        )
+    )
+
+    deadline = time.monotonic() + 5
+    while not any(m.get("type") == "invocationresult" for m in client._ws.sent):
+        assert time.monotonic() < deadline, "no invocation result"
+        time.sleep(0.005)
+    assert [m["result"] for m in client._ws.sent if m.get("type") == "invocationresult"] == [5]
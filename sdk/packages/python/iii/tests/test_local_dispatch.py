@@ -0,0 +1,182 @@
+"""Tests for running trigger() calls on handlers registered by the same client."""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from pydantic import BaseModel
+
+import iii.iii as iii_module
+from iii import ConcurrencyLimits, InitOptions, TriggerAction
+from iii.iii import III
+from iii.iii_types import HttpInvocationConfig
+from iii.local_dispatch import is_plain
+
+
+class EchoEngine:
+    """Records invocations and answers each with ``{"via": "engine"}``."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self._inbox: asyncio.Queue[str] = asyncio.Queue()
+
+    async def send(self, payload: str | bytes) -> None:
+        msg = json.loads(payload)
+        if msg.get("type") == "invokefunction":
+            self.calls.append(msg)
+            if msg.get("invocation_id"):
+                reply = {"type": "invocationresult", "invocation_id": msg["invocation_id"], "result": {"via": "engine"}}
+                self._inbox.put_nowait(json.dumps(reply))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "EchoEngine":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._inbox.get()
+
+
+@pytest.fixture
+def engine() -> EchoEngine:
+    return EchoEngine()
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch, engine: EchoEngine):
+    async def fake_connect(_: str) -> EchoEngine:
+        return engine
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    c = III("ws://fake", InitOptions(local_dispatch=True))
+    c._wait_until_connected()
+    yield c
+    c.shutdown()
+
+
+class Item(BaseModel):
+    sku: str
+
+
+def test_is_plain_detects_values_the_wire_would_change() -> None:
+    assert is_plain({"a": [1, 2.5, "x", None, True]})
+    assert not is_plain({"a": (1, 2)})
+    assert not is_plain({1: "a"})
+    assert not is_plain({"item": Item(sku="a")})
+    assert not is_plain({"ch": {"channel_id": "c", "access_key": "k", "direction": "read"}})
+
+
+def test_local_function_runs_without_engine(client: III, engine: EchoEngine) -> None:
+    async def handler(data: Any) -> Any:
+        return {"via": "local", "got": data}
+
+    client.register_function({"id": "steps.local"}, handler)
+
+    assert client.trigger({"function_id": "steps.local", "payload": {"n": 1}}) == {"via": "local", "got": {"n": 1}}
+    assert client.trigger({"function_id": "steps.remote", "payload": {}}) == {"via": "engine"}
+    assert [call["function_id"] for call in engine.calls] == ["steps.remote"]
+    assert client.get_runtime_stats()["local_calls"] == 1
+
+
+def test_routed_opted_out_and_http_calls_go_to_engine(client: III, engine: EchoEngine) -> None:
+    client.register_function({"id": "steps.local"}, lambda data: data)
+    client.register_function({"id": "steps.http"}, HttpInvocationConfig(url="http://example.test"))
+
+    client.trigger({"function_id": "steps.local", "payload": 1, "action": TriggerAction.Enqueue(queue="q")})
+    client.trigger({"function_id": "steps.local", "payload": 2, "local": False})
+    client.trigger({"function_id": "steps.http", "payload": 3})
+
+    assert [call["data"] for call in engine.calls] == [1, 2, 3]
+    assert client.get_runtime_stats()["local_calls"] == 0
+
+
+def test_non_plain_values_are_normalised_like_the_wire(client: III) -> None:
+    seen: list[Any] = []
+
+    async def handler(data: Any) -> Any:
+        seen.append(data)
+        return Item(sku=data["item"]["sku"].upper())
+
+    client.register_function({"id": "items.upper"}, handler)
+
+    result = client.trigger({"function_id": "items.upper", "payload": {"item": Item(sku="a"), "tags": ("x",)}})
+
+    assert seen == [{"item": {"sku": "a"}, "tags": ["x"]}]
+    assert result == {"sku": "A"}
+
+
+def test_handler_and_caller_do_not_share_mutable_values(client: III) -> None:
+    kept: list[Any] = []
+
+    async def handler(data: Any) -> Any:
+        data["items"].append("added")
+        result = {"items": ["r"]}
+        kept.append(result)
+        return result
+
+    client.register_function({"id": "items.mutate"}, handler)
+    payload = {"items": ["a"]}
+
+    result = client.trigger({"function_id": "items.mutate", "payload": payload})
+    result["items"].append("caller")
+
+    assert payload == {"items": ["a"]}
+    assert kept == [{"items": ["r"]}]
+
+
+def test_handler_error_matches_engine_error_shape(client: III) -> None:
+    async def handler(data: Any) -> Any:
+        raise ValueError("bad input")
+
+    client.register_function({"id": "steps.fail"}, handler)
+
+    with pytest.raises(Exception, match="invocation_failed") as exc_info:
+        client.trigger({"function_id": "steps.fail", "payload": {}})
+    assert "bad input" in str(exc_info.value)
+    assert isinstance(exc_info.value.__cause__, ValueError)
+
+
+def test_timeout_applies_to_local_calls(client: III) -> None:
+    async def handler(data: Any) -> Any:
+        await asyncio.sleep(0.1)
+        finished.set()
+
+    finished = threading.Event()
+    client.register_function({"id": "steps.slow"}, handler)
+
+    with pytest.raises(TimeoutError, match="'steps.slow' timed out after 20ms"):
+        client.trigger({"function_id": "steps.slow", "payload": {}, "timeout_ms": 20})
+    # Like a remote handler, the local one runs on after the caller gave up.
+    assert finished.wait(timeout=5)
+
+
+def test_local_calls_respect_function_concurrency(client: III) -> None:
+    running = 0
+    peak = 0
+
+    async def handler(data: Any) -> Any:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return data
+
+    limits = ConcurrencyLimits(max_concurrent=1, max_queued=8)
+    client.register_function({"id": "steps.limited"}, handler, concurrency=limits)
+
+    async def call_all() -> list[Any]:
+        return await asyncio.gather(
+            *(client._async_trigger({"function_id": "steps.limited", "payload": i}) for i in range(4))
+        )
+
+    assert asyncio.run_coroutine_threadsafe(call_all(), client._loop).result(timeout=5) == [0, 1, 2, 3]
+    assert peak == 1
@@ -0,0 +1,219 @@
+"""Tests for batched re-registration against a stand-in engine."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import websockets
+
+import iii.iii as iii_module
+from iii import InitOptions, ReconnectionConfig, RegistrationConfig
+from iii.iii import III
+from iii.registration import batch_frames, registry_hash
+
+REGISTRATION_TYPES = {"registertriggertype", "registerservice", "registerfunction", "registertrigger"}
+
+
+class StandInEngine:
+    """Minimal engine speaking the registration side of the protocol.
+
+    ``capabilities`` is advertised in ``workerregistered`` (``None`` sends
+    no capability list, like current engines; ``"silent"`` sends no
+    ``workerregistered`` at all).  Registries received in batches are kept
+    per worker name across connections, as an engine that retains
+    registrations would.
+    """
+
+    def __init__(self, capabilities: list[str] | str | None) -> None:
+        self.capabilities = capabilities
+        self.sockets: list["StandInSocket"] = []
+        self.registry_hashes: dict[str, str] = {}
+        self.registered: list[dict[str, Any]] = []
+
+    async def connect(self, _: str) -> "StandInSocket":
+        socket = StandInSocket(self)
+        self.sockets.append(socket)
+        if self.capabilities != "silent":
+            hello: dict[str, Any] = {"type": "workerregistered", "worker_id": f"w{len(self.sockets)}"}
+            if self.capabilities is not None:
+                hello["capabilities"] = self.capabilities
+            socket.reply(hello)
+        return socket
+
+    def handle(self, socket: "StandInSocket", msg: dict[str, Any]) -> None:
+        if msg["type"] == "registrysync":
+            held = self.registry_hashes.get(msg["worker_name"])
+            socket.reply(
+                {
+                    "type": "registrysyncresult",
+                    "registry_hash": msg["registry_hash"],
+                    "unchanged": held == msg["registry_hash"],
+                }
+            )
+        elif msg["type"] == "registerbatch":
+            socket.pending_batch.extend(msg["messages"])
+            if msg["final"]:
+                assert registry_hash(socket.pending_batch) == msg["registry_hash"]
+                self.registered = socket.pending_batch
+                self.registry_hashes["worker-a"] = msg["registry_hash"]
+                socket.pending_batch = []
+        elif msg["type"] in REGISTRATION_TYPES:
+            self.registered.append(msg)
+
+
+class StandInSocket:
+    def __init__(self, engine: StandInEngine) -> None:
+        self.engine = engine
+        self.sent: list[dict[str, Any]] = []
+        self.pending_batch: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self._inbox: asyncio.Queue[str | None] = asyncio.Queue()
+
+    def reply(self, msg: dict[str, Any]) -> None:
+        self._inbox.put_nowait(json.dumps(msg))
+
+    async def send(self, payload: str | bytes) -> None:
+        msg = json.loads(payload)
+        self.sent.append(msg)
+        self.engine.handle(self, msg)
+
+    def drop(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+        self._inbox.put_nowait(None)
+
+    async def close(self) -> None:
+        self.drop()
+
+    def __aiter__(self) -> "StandInSocket":
+        return self
+
+    async def __anext__(self) -> Any:
+        frame = await self._inbox.get()
+        if frame is None:
+            raise websockets.ConnectionClosedError(None, None)
+        return frame
+
+    def types(self) -> list[str]:
+        return [m["type"] for m in self.sent]
+
+
+async def _noop(data: Any) -> Any:
+    return data
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, engine: StandInEngine, **config: Any) -> III:
+    monkeypatch.setattr(iii_module.websockets, "connect", engine.connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    options = InitOptions(
+        worker_name="worker-a",
+        registration=RegistrationConfig(**config),
+        reconnection_config=ReconnectionConfig(initial_delay_ms=10, jitter_factor=0),
+    )
+    client = III("ws://fake", options)
+    client._wait_until_connected()
+    return client
+
+
+def _reconnect(client: III, engine: StandInEngine) -> "StandInSocket":
+    count = len(engine.sockets)
+    client._loop.call_soon_threadsafe(engine.sockets[-1].drop)
+    deadline = time.monotonic() + 5
+    while len(engine.sockets) == count or client._connection_state != "connected":
+        assert time.monotonic() < deadline, "client did not reconnect"
+        time.sleep(0.005)
+    time.sleep(0.05)
+    return engine.sockets[-1]
+
+
+def _register_functions(client: III, count: int, start: int = 0) -> None:
+    for i in range(start, start + count):
+        client.register_function({"id": f"fn.{i}", "description": "x" * 100}, _noop)
+    client._run_on_loop(asyncio.sleep(0.02))  # let the scheduled registration sends go out
+
+
+def test_batch_frames_respect_size_and_mark_the_last_frame() -> None:
+    messages = [{"type": "registerfunction", "id": f"fn.{i}"} for i in range(10)]
+
+    frames = batch_frames(messages, lambda m: 40, max_frame_bytes=100, digest="h")
+
+    assert [len(f["messages"]) for f in frames] == [2, 2, 2, 2, 2]
+    assert [f["final"] for f in frames] == [False] * 4 + [True]
+    assert [m for f in frames for m in f["messages"]] == messages
+    assert batch_frames([], lambda m: 0, 100, "h") == [
+        {"type": "registerbatch", "registry_hash": "h", "messages": [], "final": True}
+    ]
+
+
+def test_registry_hash_ignores_key_order() -> None:
+    assert registry_hash([{"a": 1, "b": 2}]) == registry_hash([{"b": 2, "a": 1}])
+    assert registry_hash([{"a": 1}]) != registry_hash([{"a": 2}])
+
+
+def test_engine_without_capabilities_gets_one_frame_per_registration(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = StandInEngine(capabilities=None)
+    client = _client(monkeypatch, engine)
+    try:
+        _register_functions(client, 5)
+        socket = _reconnect(client, engine)
+
+        assert socket.types().count("registerfunction") == 5
+        assert "registerbatch" not in socket.types()
+        assert client.get_runtime_stats()["registration"]["mode"] == "per_frame"
+    finally:
+        client.shutdown()
+
+
+def test_batch_engine_receives_registry_in_few_frames(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = StandInEngine(capabilities=["registration_batch"])
+    client = _client(monkeypatch, engine, max_frame_bytes=4096)
+    try:
+        _register_functions(client, 60)
+        socket = _reconnect(client, engine)
+
+        batches = [m for m in socket.sent if m["type"] == "registerbatch"]
+        assert 1 < len(batches) < 10
+        assert "registerfunction" not in socket.types()
+        assert sorted(m["id"] for m in engine.registered) == sorted(f"fn.{i}" for i in range(60))
+        stats = client.get_runtime_stats()["registration"]
+        assert stats["mode"] == "batch"
+        assert stats["frames"] == len(batches)
+        assert stats["messages"] == 60
+    finally:
+        client.shutdown()
+
+
+def test_unchanged_registry_is_skipped_on_reconnect(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = StandInEngine(capabilities=["registration_batch", "registry_hash"])
+    client = _client(monkeypatch, engine)
+    try:
+        _register_functions(client, 3)
+        first = _reconnect(client, engine)
+        assert "registerbatch" in first.types()
+
+        second = _reconnect(client, engine)
+        assert second.types() == ["registrysync"]
+        assert client.get_runtime_stats()["registration"]["skipped"] == 1
+
+        _register_functions(client, 1, start=3)
+        third = _reconnect(client, engine)
+        assert third.types()[:2] == ["registrysync", "registerbatch"]
+        assert len(engine.registered) == 4
+    finally:
+        client.shutdown()
+
+
+def test_silent_engine_falls_back_after_capability_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = StandInEngine(capabilities="silent")
+    client = _client(monkeypatch, engine, capability_timeout_ms=20)
+    try:
+        _register_functions(client, 2)
+        socket = _reconnect(client, engine)
+
+        assert socket.types().count("registerfunction") == 2
+    finally:
+        client.shutdown()
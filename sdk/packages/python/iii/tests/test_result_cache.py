@@ -0,0 +1,145 @@
+"""Tests for the client-side result cache of cacheable functions."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import iii.iii as iii_module
+from iii import InitOptions, ResultCacheConfig
+from iii.codec import JsonCodec
+from iii.iii import III
+from iii.result_cache import ResultCache, cache_ttl_ms, payload_digest
+
+
+class CountingEngine:
+    """Answers every invocation with its payload and a running call count."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self._inbox: asyncio.Queue[str] = asyncio.Queue()
+
+    async def send(self, payload: str | bytes) -> None:
+        msg = json.loads(payload)
+        if msg.get("type") == "invokefunction" and msg.get("invocation_id"):
+            self.calls.append(msg)
+            result = {"echo": msg["data"], "call": len(self.calls)}
+            reply = {"type": "invocationresult", "invocation_id": msg["invocation_id"], "result": result}
+            self._inbox.put_nowait(json.dumps(reply))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "CountingEngine":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._inbox.get()
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, engine: CountingEngine, config: ResultCacheConfig) -> III:
+    async def fake_connect(_: str) -> CountingEngine:
+        return engine
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    client = III("ws://fake", InitOptions(result_cache=config))
+    client._wait_until_connected()
+    return client
+
+
+def test_cache_ttl_is_read_from_registration_metadata() -> None:
+    assert cache_ttl_ms({"cache": {"ttl_ms": 500}}) == 500
+    assert cache_ttl_ms({"cache": {"ttl_ms": 0}}) is None
+    assert cache_ttl_ms({"cache": True}) is None
+    assert cache_ttl_ms(None) is None
+
+
+def test_payload_digest_ignores_key_order() -> None:
+    assert payload_digest({"a": 1, "b": [1, 2]}) == payload_digest({"b": [1, 2], "a": 1})
+    assert payload_digest({"a": 1}) != payload_digest({"a": 2})
+    assert payload_digest({"a": object()}) is None
+
+
+def test_entries_expire_and_evict_least_recently_used() -> None:
+    cache = ResultCache(ResultCacheConfig(max_entries=2), JsonCodec())
+    cache.put("f", "a", {"v": 1}, 60_000)
+    cache.put("f", "b", {"v": 2}, 60_000)
+    assert cache.get("f", "a") == (True, {"v": 1})
+
+    cache.put("f", "c", {"v": 3}, 60_000)
+    assert cache.get("f", "b") == (False, None)
+    assert cache.get("f", "a")[0] and cache.get("f", "c")[0]
+
+    cache.put("f", "short", 1, 1)
+    time.sleep(0.01)
+    assert cache.get("f", "short") == (False, None)
+
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 2
+
+
+def test_hits_return_independent_copies() -> None:
+    cache = ResultCache(ResultCacheConfig(), JsonCodec())
+    cache.put("f", "a", {"items": [1]}, 60_000)
+    _, first = cache.get("f", "a")
+    first["items"].append(2)
+    assert cache.get("f", "a") == (True, {"items": [1]})
+
+
+def test_declared_function_is_served_from_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = CountingEngine()
+    client = _client(monkeypatch, engine, ResultCacheConfig(discover=False))
+    try:
+        client.register_function({"id": "flags.get", "metadata": {"cache": {"ttl_ms": 60_000}}}, lambda data: data)
+
+        first = client.trigger({"function_id": "flags.get", "payload": {"flag": "x", "env": "prod"}})
+        second = client.trigger({"function_id": "flags.get", "payload": {"env": "prod", "flag": "x"}})
+        other = client.trigger({"function_id": "flags.get", "payload": {"flag": "y"}})
+
+        assert first == second == {"echo": {"flag": "x", "env": "prod"}, "call": 1}
+        assert other["call"] == 2
+        stats = client.get_runtime_stats()["result_cache"]
+        assert stats["hits"] == 1 and stats["misses"] == 2 and stats["entries"] == 2
+    finally:
+        client.shutdown()
+
+
+def test_undeclared_and_enqueued_calls_bypass_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = CountingEngine()
+    client = _client(monkeypatch, engine, ResultCacheConfig(discover=False, functions={"prices.get": 60_000}))
+    try:
+        assert client.trigger({"function_id": "orders.create", "payload": 1})["call"] == 1
+        assert client.trigger({"function_id": "orders.create", "payload": 1})["call"] == 2
+
+        assert client.trigger({"function_id": "prices.get", "payload": 1})["call"] == 3
+        refreshed = client.trigger({"function_id": "prices.get", "payload": 1, "cache": False})
+        assert refreshed["call"] == 4
+        assert client.trigger({"function_id": "prices.get", "payload": 1})["call"] == 4
+    finally:
+        client.shutdown()
+
+
+def test_invalidate_cache_drops_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = CountingEngine()
+    client = _client(monkeypatch, engine, ResultCacheConfig(discover=False, functions={"prices.get": 60_000}))
+    try:
+        client.trigger({"function_id": "prices.get", "payload": {"sku": "a"}})
+        client.trigger({"function_id": "prices.get", "payload": {"sku": "b"}})
+
+        assert client.invalidate_cache("prices.get", {"sku": "a"}) == 1
+        assert client.trigger({"function_id": "prices.get", "payload": {"sku": "a"}})["call"] == 3
+        assert client.trigger({"function_id": "prices.get", "payload": {"sku": "b"}})["call"] == 2
+
+        assert client.invalidate_cache("prices.get") == 2
+        assert client.get_runtime_stats()["result_cache"]["entries"] == 0
+    finally:
+        client.shutdown()
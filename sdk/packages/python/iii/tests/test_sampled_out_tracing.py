@@ -0,0 +1,68 @@
+"""Tests for the invocation tracing fast path for sampled-out traces."""
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from iii.iii import III
+from iii.wire import is_sampled_out
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+SAMPLED = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+SAMPLED_OUT = f"00-{TRACE_ID}-00f067aa0ba902b7-00"
+
+
+@pytest.fixture
+def exporter(monkeypatch: pytest.MonkeyPatch):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(trace, "get_tracer", lambda name, *args, **kwargs: provider.get_tracer(name))
+    yield exporter
+    provider.shutdown()
+
+
+@pytest.mark.parametrize(
+    ("traceparent", "expected"),
+    [
+        (SAMPLED_OUT, True),
+        (SAMPLED, False),
+        (f"00-{TRACE_ID}-00f067aa0ba902b7-02", True),
+        (f"00-{TRACE_ID}-00f067aa0ba902b7-zz", False),
+        ("00-short-00", False),
+        (None, False),
+    ],
+)
+def test_is_sampled_out_reads_the_sampled_flag(traceparent: str | None, expected: bool) -> None:
+    assert is_sampled_out(traceparent) is expected
+
+
+async def _current_trace_id(data: object) -> str:
+    return format(trace.get_current_span().get_span_context().trace_id, "032x")
+
+
+@pytest.mark.asyncio
+async def test_sampled_out_invocation_records_no_span_but_keeps_the_trace(exporter: InMemorySpanExporter) -> None:
+    client = III.__new__(III)
+
+    result, response_traceparent = await client._invoke_with_otel_context(_current_trace_id, None, SAMPLED_OUT, None)
+
+    assert result == TRACE_ID
+    assert response_traceparent is None
+    assert exporter.get_finished_spans() == ()
+    assert not trace.get_current_span().get_span_context().is_valid
+
+
+@pytest.mark.asyncio
+async def test_sampled_invocation_records_a_server_span(exporter: InMemorySpanExporter) -> None:
+    client = III.__new__(III)
+
+    result, response_traceparent = await client._invoke_with_otel_context(_current_trace_id, None, SAMPLED, None)
+
+    assert result == TRACE_ID
+    assert response_traceparent is not None and response_traceparent.endswith("-01")
+    (span,) = exporter.get_finished_spans()
+    assert span.kind is trace.SpanKind.SERVER
+    assert format(span.parent.span_id, "016x") == "00f067aa0ba902b7"
@@ -0,0 +1,131 @@
+"""Tests for priority and weighted fair scheduling of queued invocations."""
+
+import contextvars
+
+from iii import ConcurrencyLimits, SchedulingConfig
+from iii.admission import AdmissionController
+from iii.scheduler import FairScheduler, Waiter
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+
+
+def _fill(controller: AdmissionController, order: list[str], items: list[tuple[str, str, str | None]]) -> None:
+    for label, function_id, flow in items:
+        assert controller.submit(function_id, lambda label=label: order.append(label), flow)
+
+
+def test_flow_from_baggage_reads_configured_key() -> None:
+    scheduler = FairScheduler(SchedulingConfig(fairness_key="tenant"))
+
+    assert scheduler.flow_from_baggage("user=1,tenant=acme%20co;prop=x") == "acme co"
+    assert scheduler.flow_from_baggage("user=1") is None
+    assert scheduler.flow_from_baggage(None) is None
+    assert FairScheduler().flow_from_baggage("tenant=acme") is None
+
+
+def test_higher_priority_function_starts_first() -> None:
+    controller = AdmissionController(ConcurrencyLimits(max_concurrent=1, max_queued=10))
+    controller.configure_function("batch", None, priority=0)
+    controller.configure_function("interactive", None, priority=10)
+    order: list[str] = []
+
+    _fill(
+        controller,
+        order,
+        [("running", "batch", None), ("b1", "batch", None), ("b2", "batch", None), ("i1", "interactive", None)],
+    )
+    assert order == ["running"]
+
+    controller.release("batch")
+    controller.release("interactive")
+    controller.release("batch")
+    assert order == ["running", "i1", "b1", "b2"]
+
+
+def test_fifo_within_priority_class_without_flows() -> None:
+    controller = AdmissionController(ConcurrencyLimits(max_concurrent=1, max_queued=10))
+    order: list[str] = []
+
+    _fill(controller, order, [("0", "f", None), ("1", "f", None), ("2", "f", None), ("3", "f", None)])
+    for _ in range(3):
+        controller.release("f")
+
+    assert order == ["0", "1", "2", "3"]
+
+
+def test_fair_queuing_interleaves_tenants_by_weight() -> None:
+    controller = AdmissionController(
+        ConcurrencyLimits(max_concurrent=1, max_queued=100),
+        SchedulingConfig(fairness_key="tenant", weights={"gold": 2.0}),
+    )
+    order: list[str] = []
+
+    items = [("running", "f", None)]
+    items += [(f"noisy{i}", "f", "noisy") for i in range(6)]
+    items += [(f"quiet{i}", "f", "quiet") for i in range(2)]
+    items += [(f"gold{i}", "f", "gold") for i in range(4)]
+    _fill(controller, order, items)
+    for _ in range(12):
+        controller.release("f")
+
+    started = order[1:]
+    # A tenant that arrives late is not stuck behind the backlog of a noisy one.
+    assert started.index("quiet0") < started.index("noisy2")
+    # Gold has twice the weight, so it drains its backlog before equally-sized noisy work.
+    assert started.index("gold3") < started.index("noisy5")
+    # Order within a flow is preserved.
+    assert [s for s in started if s.startswith("noisy")] == [f"noisy{i}" for i in range(6)]
+
+
+def test_scheduler_skips_waiters_whose_function_is_at_capacity() -> None:
+    controller = AdmissionController(ConcurrencyLimits(max_concurrent=2, max_queued=10))
+    controller.configure_function("hot", ConcurrencyLimits(max_concurrent=1, max_queued=10), priority=5)
+    order: list[str] = []
+
+    _fill(controller, order, [("hot0", "hot", None), ("hot1", "hot", None), ("cold0", "f", None)])
+
+    assert order == ["hot0", "cold0"]
+    stats = controller.stats()
+    assert stats["queued"] == 1
+    assert stats["queued_by_flow"] == {"None": 1}
+
+
+def test_saturated_function_is_parked_until_released() -> None:
+    scheduler = FairScheduler()
+    for _ in range(100):
+        scheduler.push(Waiter("hot", lambda: None, None, 5))
+    scheduler.push(Waiter("cold", lambda: None, None, 0))
+    checked: list[str] = []
+
+    def eligible(waiter: Waiter) -> bool:
+        checked.append(waiter.function_id)
+        return waiter.function_id != "hot"
+
+    assert scheduler.pop(eligible).function_id == "cold"
+    assert scheduler.pop(eligible) is None
+    assert checked == ["hot", "cold"]
+    assert len(scheduler) == 100
+
+    scheduler.unpark("hot")
+    assert scheduler.pop(lambda waiter: True).function_id == "hot"
+    assert len(scheduler) == 99
+
+
+def test_queued_invocation_starts_in_its_submitters_context() -> None:
+    controller = AdmissionController(ConcurrencyLimits(max_concurrent=1, max_queued=10))
+    seen: list[str] = []
+
+    def submit(rid: str) -> None:
+        request_id.set(rid)
+        controller.submit("f", lambda: seen.append(request_id.get()))
+
+    for rid in ("a", "b"):
+        contextvars.copy_context().run(submit, rid)
+
+    def release() -> None:
+        request_id.set("releaser")
+        controller.release("f")
+
+    contextvars.copy_context().run(release)
+
+    assert seen == ["a", "b"]
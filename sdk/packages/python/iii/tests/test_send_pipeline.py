@@ -0,0 +1,149 @@
+"""Tests for the outbound send pipeline (frame coalescing)."""
+
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+import websockets
+from conftest import RecordingWebSocket
+
+from iii import InitOptions, SendPipelineConfig, TriggerAction
+from iii.iii import III
+from iii.iii_constants import SendPipelineConfig as Config
+from iii.outbound import OutboundWriter
+
+
+def test_burst_is_coalesced_into_few_flushes(fake_client: Callable[..., III]) -> None:
+    client = fake_client(InitOptions(send_pipeline=SendPipelineConfig(max_delay_us=2000)))
+    ws = client._ws
+
+    async def burst() -> None:
+        await asyncio.gather(
+            *(
+                client._async_trigger({"function_id": "f", "payload": i, "action": TriggerAction.Void()})
+                for i in range(50)
+            )
+        )
+        await asyncio.sleep(0.02)
+
+    client._run_on_loop(burst())
+    stats = client.get_runtime_stats()["outbound"]
+    client.shutdown()
+
+    assert [m["data"] for m in ws.sent if m["type"] == "invokefunction"] == list(range(50))
+    assert stats["frames_sent"] == 50
+    assert stats["flushes"] < 50
+    assert stats["flush_frames"]["max"] > 1
+    assert stats["queue_depth"] == 0
+
+
+def test_flush_respects_max_batch_bytes(fake_client: Callable[..., III]) -> None:
+    config = SendPipelineConfig(max_batch_bytes=1, max_delay_us=2000)
+    client = fake_client(InitOptions(send_pipeline=config))
+
+    async def burst() -> None:
+        for i in range(5):
+            await client._send({"type": "invokefunction", "function_id": "f", "data": i})
+        await asyncio.sleep(0.02)
+
+    client._run_on_loop(burst())
+    stats = client.get_runtime_stats()["outbound"]
+    client.shutdown()
+
+    assert stats["frames_sent"] == 5
+    assert stats["flush_frames"]["max"] == 1
+
+
+def test_shutdown_flushes_queued_frames(fake_client: Callable[..., III]) -> None:
+    client = fake_client(InitOptions(send_pipeline=SendPipelineConfig(max_delay_us=10_000_000)))
+    ws = client._ws
+
+    async def send_some() -> None:
+        for i in range(3):
+            await client._send({"type": "invokefunction", "function_id": "f", "data": i})
+
+    client._run_on_loop(send_some())
+    client.shutdown()
+
+    assert [m["data"] for m in ws.sent] == [0, 1, 2]
+
+
+def test_unsent_frames_are_handed_back_when_connection_closes() -> None:
+    unsent: list[Any] = []
+
+    async def main() -> RecordingWebSocket:
+        ws = RecordingWebSocket(fail_after=2)
+        writer = OutboundWriter(Config(max_delay_us=1000), unsent.extend)
+        writer.start(ws)  # type: ignore[arg-type]
+        for i in range(5):
+            await writer.put(json.dumps({"i": i}))
+        await asyncio.sleep(0.02)
+        await writer.stop()
+        return ws
+
+    ws = asyncio.run(main())
+
+    assert [m["i"] for m in ws.sent] == [0, 1]
+    assert [json.loads(f)["i"] for f in unsent] == [2, 3, 4]
+
+
+def test_pipeline_disabled_by_default(fake_client: Callable[..., III]) -> None:
+    client = fake_client()
+    stats = client.get_runtime_stats()
+    client.shutdown()
+
+    assert "outbound" not in stats
+    assert stats["pending_invocations"] == 0
+
+
+def test_burst_is_sent_in_one_flush_over_a_real_connection() -> None:
+    received: list[str] = []
+
+    async def sink(connection: Any) -> None:
+        async for message in connection:
+            received.append(message)
+
+    async def main() -> dict[str, Any]:
+        async with websockets.serve(sink, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            async with websockets.connect(f"ws://127.0.0.1:{port}") as ws:
+                writer = OutboundWriter(Config(max_delay_us=50_000), lambda frames: None)
+                writer.start(ws)
+                for i in range(50):
+                    await writer.put(json.dumps({"i": i}))
+                await asyncio.sleep(0.1)
+                await writer.stop()
+                stats = writer.stats()
+            await asyncio.sleep(0.05)
+        return stats
+
+    stats = asyncio.run(main())
+
+    assert stats["flushes"] == 1 and stats["frames_sent"] == 50
+    assert [json.loads(m)["i"] for m in received] == list(range(50))
+
+
+def test_cancelled_write_keeps_unsent_frames() -> None:
+    unsent: list[Any] = []
+
+    class BlockingWebSocket(RecordingWebSocket):
+        async def send(self, payload: str | bytes) -> None:
+            if self.sent:
+                await asyncio.Event().wait()
+            await super().send(payload)
+
+    async def main() -> BlockingWebSocket:
+        ws = BlockingWebSocket()
+        writer = OutboundWriter(Config(max_delay_us=1000), unsent.extend)
+        writer.start(ws)  # type: ignore[arg-type]
+        for i in range(4):
+            await writer.put(json.dumps({"i": i}))
+        await asyncio.sleep(0.02)
+        await writer.stop()
+        return ws
+
+    ws = asyncio.run(main())
+
+    assert [m["i"] for m in ws.sent] == [0]
+    assert [json.loads(f)["i"] for f in unsent] == [1, 2, 3]
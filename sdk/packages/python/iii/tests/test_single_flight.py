@@ -0,0 +1,145 @@
+"""Tests for single-flight coalescing of identical in-flight calls."""
+
+import asyncio
+import json
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import iii.iii as iii_module
+from iii import InitOptions
+from iii.iii import III
+
+
+class HeldEngine:
+    """Holds invocation replies until ``release`` is called."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self._inbox: asyncio.Queue[str] = asyncio.Queue()
+
+    async def send(self, payload: str | bytes) -> None:
+        msg = json.loads(payload)
+        if msg.get("type") == "invokefunction" and msg.get("invocation_id"):
+            self.calls.append(msg)
+
+    def release(self) -> None:
+        for msg in self.calls:
+            result = {"echo": msg["data"]}
+            reply = {"type": "invocationresult", "invocation_id": msg["invocation_id"], "result": result}
+            self._inbox.put_nowait(json.dumps(reply))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "HeldEngine":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._inbox.get()
+
+
+@pytest.fixture
+def engine() -> HeldEngine:
+    return HeldEngine()
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch, engine: HeldEngine):
+    async def fake_connect(_: str) -> HeldEngine:
+        return engine
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    c = III("ws://fake", InitOptions(coalesce_calls=True))
+    c._wait_until_connected()
+    yield c
+    c.shutdown()
+
+
+def _start_call(client: III, request: dict[str, Any]) -> "Future[Any]":
+    return asyncio.run_coroutine_threadsafe(client._async_trigger(request), client._loop)
+
+
+def _wait_for_calls(engine: HeldEngine, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while len(engine.calls) < count:
+        assert time.monotonic() < deadline, "invocation was never sent"
+        time.sleep(0.005)
+
+
+def _settle(client: III) -> None:
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), client._loop).result(timeout=5)
+
+
+def test_identical_calls_share_one_round_trip(client: III, engine: HeldEngine) -> None:
+    calls = [_start_call(client, {"function_id": "config.get", "payload": {"key": "a"}}) for _ in range(20)]
+    other = _start_call(client, {"function_id": "config.get", "payload": {"key": "b"}})
+    _wait_for_calls(engine, 2)
+    _settle(client)
+    client._loop.call_soon_threadsafe(engine.release)
+
+    results = [call.result(timeout=5) for call in calls]
+    assert len(engine.calls) == 2
+    assert all(result == {"echo": {"key": "a"}} for result in results)
+    assert len({id(result) for result in results}) == len(results)
+    assert other.result(timeout=5) == {"echo": {"key": "b"}}
+
+    stats = client.get_runtime_stats()["coalescing"]
+    assert stats == {"in_flight": 0, "started": 2, "coalesced": 19}
+
+
+def test_opted_out_calls_are_sent_separately(client: III, engine: HeldEngine) -> None:
+    calls = [_start_call(client, {"function_id": "charge", "payload": 1, "coalesce": False}) for _ in range(3)]
+    _wait_for_calls(engine, 3)
+    client._loop.call_soon_threadsafe(engine.release)
+
+    assert [call.result(timeout=5) for call in calls] == [{"echo": 1}] * 3
+
+
+def test_joined_call_keeps_its_own_timeout(client: III, engine: HeldEngine) -> None:
+    leader = _start_call(client, {"function_id": "slow", "payload": 1})
+    _wait_for_calls(engine, 1)
+    follower = _start_call(client, {"function_id": "slow", "payload": 1, "timeout_ms": 20})
+
+    with pytest.raises(TimeoutError, match="'slow' timed out after 20ms"):
+        follower.result(timeout=5)
+
+    client._loop.call_soon_threadsafe(engine.release)
+    assert leader.result(timeout=5) == {"echo": 1}
+    assert len(engine.calls) == 1
+
+
+def test_joined_call_outlives_a_flight_with_an_earlier_deadline(client: III, engine: HeldEngine) -> None:
+    short = _start_call(client, {"function_id": "slow", "payload": 1, "timeout_ms": 50})
+    _wait_for_calls(engine, 1)
+    longer = _start_call(client, {"function_id": "slow", "payload": 1})
+
+    with pytest.raises(TimeoutError):
+        short.result(timeout=5)
+    _wait_for_calls(engine, 2)
+    client._loop.call_soon_threadsafe(engine.release)
+    assert longer.result(timeout=5) == {"echo": 1}
+    assert client.get_runtime_stats()["coalescing"]["started"] == 2
+
+
+def test_flight_outlives_a_cancelled_caller_and_stops_with_the_last(client: III, engine: HeldEngine) -> None:
+    first = _start_call(client, {"function_id": "slow", "payload": 1})
+    second = _start_call(client, {"function_id": "slow", "payload": 1})
+    _wait_for_calls(engine, 1)
+    _settle(client)
+
+    client._loop.call_soon_threadsafe(first.cancel)
+    _settle(client)
+    assert len(client._pending) == 1
+
+    client._loop.call_soon_threadsafe(second.cancel)
+    _settle(client)
+    assert client._pending == {} and client._calls == {}
+    assert client.get_runtime_stats()["coalescing"]["in_flight"] == 0
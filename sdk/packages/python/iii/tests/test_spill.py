@@ -0,0 +1,208 @@
+"""Tests for spilling oversized payloads and results to data channels."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import iii.iii as iii_module
+from iii import InitOptions, SpillConfig, SpilledPayload
+from iii.iii import III
+from iii.iii_types import StreamChannelRef
+from iii.spill import SPILL_KEY, spilled_ref
+from iii.types import Channel
+
+BIG = {"rows": [{"id": i, "text": "x" * 100} for i in range(100)]}
+
+
+class Pipe:
+    def __init__(self) -> None:
+        self.chunks: asyncio.Queue[bytes | None] = asyncio.Queue()
+
+
+class FakeWriter:
+    def __init__(self, pipe: Pipe) -> None:
+        self._pipe = pipe
+
+    async def write(self, data: bytes) -> None:
+        for offset in range(0, len(data), 1024):
+            self._pipe.chunks.put_nowait(data[offset : offset + 1024])
+
+    async def close_async(self) -> None:
+        self._pipe.chunks.put_nowait(None)
+
+
+class FakeReader:
+    def __init__(self, pipe: Pipe) -> None:
+        self._pipe = pipe
+
+    async def __aiter__(self) -> Any:
+        while (chunk := await self._pipe.chunks.get()) is not None:
+            yield chunk
+
+    async def read_all(self) -> bytes:
+        return b"".join([chunk async for chunk in self])
+
+
+class ChannelHub:
+    """In-memory stand-in for engine data channels."""
+
+    def __init__(self) -> None:
+        self.pipes: dict[str, Pipe] = {}
+
+    def create(self) -> Channel:
+        channel_id = f"ch-{len(self.pipes)}"
+        pipe = self.pipes[channel_id] = Pipe()
+        return Channel(
+            writer=FakeWriter(pipe),  # type: ignore[arg-type]
+            reader=FakeReader(pipe),  # type: ignore[arg-type]
+            writer_ref=StreamChannelRef(channel_id=channel_id, access_key="k", direction="write"),
+            reader_ref=StreamChannelRef(channel_id=channel_id, access_key="k", direction="read"),
+        )
+
+    def reader(self, _address: str, ref: StreamChannelRef, _options: Any = None, mux: Any = None) -> FakeReader:
+        return FakeReader(self.pipes[ref.channel_id])
+
+
+class EchoEngine:
+    """Echoes invocation data back as the result, spill markers included."""
+
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self.inbox: asyncio.Queue[str] = asyncio.Queue()
+
+    async def send(self, frame: str | bytes) -> None:
+        msg = json.loads(frame)
+        self.sent.append(msg)
+        if msg.get("type") == "invokefunction" and msg.get("invocation_id"):
+            reply = {"type": "invocationresult", "invocation_id": msg["invocation_id"], "result": msg["data"]}
+            self.inbox.put_nowait(json.dumps(reply))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "EchoEngine":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self.inbox.get()
+
+
+@pytest.fixture
+def hub() -> ChannelHub:
+    return ChannelHub()
+
+
+@pytest.fixture
+def engine() -> EchoEngine:
+    return EchoEngine()
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch, hub: ChannelHub, engine: EchoEngine):
+    async def fake_connect(_: str) -> EchoEngine:
+        return engine
+
+    async def fake_create_channel(self: III, buffer_size: int | None = None) -> Channel:
+        return hub.create()
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr(iii_module.III, "_async_create_channel", fake_create_channel)
+    monkeypatch.setattr(iii_module, "ChannelReader", hub.reader)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    c = III("ws://fake", InitOptions(spill=SpillConfig(threshold_bytes=4096)))
+    c._wait_until_connected()
+    yield c
+    c.shutdown()
+
+
+def _invocations(engine: EchoEngine) -> list[dict[str, Any]]:
+    return [m for m in engine.sent if m.get("type") == "invokefunction"]
+
+
+def _wait_for_result(engine: EchoEngine, invocation_id: str) -> dict[str, Any]:
+    deadline = time.monotonic() + 5
+    while True:
+        for msg in engine.sent:
+            if msg.get("type") == "invocationresult" and msg.get("invocation_id") == invocation_id:
+                return msg
+        assert time.monotonic() < deadline, "no invocation result"
+        time.sleep(0.005)
+
+
+def test_large_payload_and_result_travel_through_channels(client: III, engine: EchoEngine) -> None:
+    assert client.trigger({"function_id": "rows.echo", "payload": BIG}) == BIG
+
+    (sent,) = _invocations(engine)
+    assert spilled_ref(sent["data"]) is not None
+    assert sent["data"]["size"] > 4096
+    assert client.get_runtime_stats()["spill"]["spilled"] == 1
+    assert client.get_runtime_stats()["spill"]["loaded"] == 1
+
+
+def test_small_and_enqueued_payloads_stay_inline(client: III, engine: EchoEngine) -> None:
+    assert client.trigger({"function_id": "rows.echo", "payload": {"n": 1}}) == {"n": 1}
+    client.trigger({"function_id": "rows.echo", "payload": BIG, "action": {"type": "void"}})
+
+    small, void = _invocations(engine)
+    assert small["data"] == {"n": 1}
+    assert void["data"] == BIG
+
+
+def test_handler_gets_loaded_payload_and_spills_its_result(client: III, engine: EchoEngine, hub: ChannelHub) -> None:
+    seen: list[Any] = []
+
+    async def handler(data: Any) -> Any:
+        seen.append(data)
+        return {"copy": data}
+
+    client.register_function({"id": "rows.copy"}, handler)
+    channel = hub.create()
+    body = json.dumps(BIG).encode()
+    marker = {SPILL_KEY: channel.reader_ref.model_dump(), "size": len(body)}
+
+    async def deliver() -> None:
+        await channel.writer.write(body)
+        await channel.writer.close_async()
+        invoke = {"type": "invokefunction", "invocation_id": "inv-1", "function_id": "rows.copy", "data": marker}
+        engine.inbox.put_nowait(json.dumps(invoke))
+
+    asyncio.run_coroutine_threadsafe(deliver(), client._loop).result(timeout=5)
+    result = _wait_for_result(engine, "inv-1")["result"]
+
+    assert seen == [BIG]
+    ref = spilled_ref(result)
+    assert ref is not None
+    spilled = asyncio.run_coroutine_threadsafe(hub.reader("", ref).read_all(), client._loop).result(timeout=5)
+    assert json.loads(spilled) == {"copy": BIG}
+
+
+def test_streaming_handler_reads_chunks(client: III, engine: EchoEngine, hub: ChannelHub) -> None:
+    sizes: list[int] = []
+
+    async def handler(data: SpilledPayload) -> Any:
+        async for chunk in data.chunks():
+            sizes.append(len(chunk))
+        return {"size": data.size}
+
+    client.register_function({"id": "rows.count"}, handler, stream_spilled=True)
+    channel = hub.create()
+    body = json.dumps(BIG).encode()
+    marker = {SPILL_KEY: channel.reader_ref.model_dump(), "size": len(body)}
+
+    async def deliver() -> None:
+        await channel.writer.write(body)
+        await channel.writer.close_async()
+        invoke = {"type": "invokefunction", "invocation_id": "inv-2", "function_id": "rows.count", "data": marker}
+        engine.inbox.put_nowait(json.dumps(invoke))
+
+    asyncio.run_coroutine_threadsafe(deliver(), client._loop).result(timeout=5)
+
+    assert _wait_for_result(engine, "inv-2")["result"] == {"size": len(body)}
+    assert sum(sizes) == len(body) and len(sizes) > 1
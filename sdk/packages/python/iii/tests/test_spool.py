@@ -0,0 +1,109 @@
+"""Tests for the disconnected-message backlog and its disk spool."""
+
+import asyncio
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import iii.iii as iii_module
+from iii import InitOptions, SpoolConfig, TriggerAction
+from iii.codec import JsonCodec, OrjsonCodec
+from iii.iii import III
+from iii.outbound import Frame
+from iii.spool import OutboundBacklog
+
+
+def _replay(backlog: OutboundBacklog, limit: int | None = None) -> list[Any]:
+    written: list[Any] = []
+
+    async def write(frame: Frame) -> None:
+        written.append(json.loads(frame))
+
+    asyncio.run(backlog.replay(write, lambda: limit is None or len(written) < limit))
+    return written
+
+
+def test_memory_backlog_drops_oldest_when_full() -> None:
+    backlog = OutboundBacklog(JsonCodec(), max_messages=3)
+    for i in range(5):
+        backlog.push({"n": i})
+
+    assert _replay(backlog) == [{"n": 2}, {"n": 3}, {"n": 4}]
+    assert backlog.stats() == {
+        "in_memory": 0,
+        "spooled_pending": 0,
+        "spool_bytes": 0,
+        "dropped": 2,
+        "spooled": 0,
+        "replayed": 3,
+    }
+
+
+@pytest.mark.parametrize("codec", [JsonCodec(), OrjsonCodec()])
+def test_overflow_is_spooled_and_replayed_in_order(tmp_path: Path, codec: Any) -> None:
+    path = tmp_path / "spool.bin"
+    backlog = OutboundBacklog(codec, max_messages=2, spool=SpoolConfig(path=str(path)))
+    for i in range(6):
+        backlog.push({"n": i})
+
+    assert len(backlog) == 6
+    assert backlog.stats()["spooled"] == 4
+    assert [m["n"] for m in _replay(backlog, limit=3)] == [0, 1, 2]
+
+    backlog.push({"n": 6})  # joins the spool behind the unreplayed records
+    assert [m["n"] for m in _replay(backlog)] == [3, 4, 5, 6]
+    assert backlog.stats()["replayed"] == 7
+    assert len(backlog) == 0
+    assert path.stat().st_size == 0
+
+
+def test_spool_survives_restart_and_discards_torn_record(tmp_path: Path) -> None:
+    path = tmp_path / "spool.bin"
+    config = SpoolConfig(path=str(path))
+    backlog = OutboundBacklog(JsonCodec(), max_messages=0, spool=config)
+    for i in range(3):
+        backlog.push({"n": i})
+    backlog.close()
+    with open(path, "ab") as f:
+        f.write(b'\x00\x00\x00\x50\x00{"n":')  # header promises more bytes than follow
+
+    restarted = OutboundBacklog(JsonCodec(), max_messages=0, spool=config)
+
+    assert len(restarted) == 3
+    assert [m["n"] for m in _replay(restarted)] == [0, 1, 2]
+
+
+def test_full_spool_drops_new_messages(tmp_path: Path) -> None:
+    backlog = OutboundBacklog(JsonCodec(), max_messages=0, spool=SpoolConfig(path=str(tmp_path / "s"), max_bytes=40))
+    for i in range(5):
+        backlog.push({"n": i})
+
+    stats = backlog.stats()
+    assert stats["spooled"] == 3
+    assert stats["dropped"] == 2
+    assert [m["n"] for m in _replay(backlog)] == [0, 1, 2]
+
+
+def test_void_triggers_sent_while_disconnected_are_replayed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fake_client: Callable[..., III]
+) -> None:
+    monkeypatch.setattr(iii_module, "MAX_QUEUE_SIZE", 10)
+    client = fake_client(InitOptions(spool=SpoolConfig(path=str(tmp_path / "spool.bin"))))
+    ws = client._ws
+
+    client._ws = None
+    for i in range(25):
+        client.trigger({"function_id": "events::emit", "payload": {"n": i}, "action": TriggerAction.Void()})
+    assert client.get_runtime_stats()["backlog"]["spooled"] == 15
+
+    ws.sent.clear()
+    client._ws = ws
+    client._run_on_loop(client._replay_backlog())
+
+    assert [m["data"]["n"] for m in ws.sent] == list(range(25))
+    stats = client.get_runtime_stats()
+    assert stats["queued_messages"] == 0
+    assert stats["backlog"]["replayed"] == 25
@@ -4,7 +4,14 @@ import urllib.request
 
 import pytest
 
-from iii.telemetry import get_tracer, init_otel, is_initialized, shutdown_otel, shutdown_otel_async
+from iii.telemetry import (
+    get_tracer,
+    init_otel,
+    is_initialized,
+    reset_after_fork,
+    shutdown_otel,
+    shutdown_otel_async,
+)
 from iii.telemetry_types import OtelConfig
 
 # URLLibInstrumentor patches OpenerDirector.open, not urlopen directly
@@ -82,6 +89,30 @@ def test_init_is_idempotent():
     assert get_tracer() is tracer1
 
 
+def test_reset_after_fork_forgets_inherited_state(monkeypatch, caplog):
+    from opentelemetry import trace
+
+    init_otel(OtelConfig(enabled=True))
+    monkeypatch.setattr(trace, "get_tracer_provider", lambda: trace.ProxyTracerProvider())
+
+    reset_after_fork()
+
+    assert not is_initialized()
+    assert get_tracer() is None
+    assert "initialised before fork" not in caplog.text
+
+
+def test_reset_after_fork_warns_when_parent_set_global_providers(monkeypatch, caplog):
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+
+    monkeypatch.setattr(trace, "get_tracer_provider", lambda: TracerProvider())
+
+    reset_after_fork()
+
+    assert "initialised before fork" in caplog.text
+
+
 def test_shutdown_without_init_is_safe():
     shutdown_otel()  # must not raise
 
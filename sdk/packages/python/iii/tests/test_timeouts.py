@@ -0,0 +1,136 @@
+"""Tests for timer-wheel invocation timeouts."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import iii.iii as iii_module
+from iii import InitOptions
+from iii.iii import III
+from iii.timeouts import TimerWheel
+
+
+def test_wheel_expires_due_items_in_bulk_and_skips_cancelled() -> None:
+    async def main() -> tuple[list[list[str]], dict[str, Any]]:
+        batches: list[list[str]] = []
+        wheel: TimerWheel[str] = TimerWheel(asyncio.get_running_loop(), batches.append, tick_ms=5)
+        for i in range(100):
+            wheel.schedule(f"k{i}", 20, f"k{i}")
+        wheel.cancel("k7")
+        wheel.schedule("late", 500, "late")
+        await asyncio.sleep(0.1)
+        return batches, wheel.stats()
+
+    batches, stats = asyncio.run(main())
+
+    # Deadlines scheduled a few microseconds apart may straddle one slot boundary.
+    assert len(batches) <= 2
+    assert sorted(key for batch in batches for key in batch) == sorted(f"k{i}" for i in range(100) if i != 7)
+    assert stats["scheduled"] == 1
+    assert stats["expired_total"] == 99
+    assert stats["expired_per_second"] > 0
+
+
+def test_wheel_never_fires_early_and_stops_ticking_when_empty() -> None:
+    async def main() -> tuple[float, bool]:
+        loop = asyncio.get_running_loop()
+        fired: list[float] = []
+        wheel: TimerWheel[str] = TimerWheel(loop, lambda items: fired.append(loop.time()), tick_ms=10)
+        start = loop.time()
+        wheel.schedule("a", 35, "a")
+        while not fired:
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.03)
+        return fired[0] - start, wheel._handle is None
+
+    delay, idle = asyncio.run(main())
+
+    assert delay >= 0.035
+    assert idle
+
+
+class SilentEngineWebSocket:
+    """Accepts every frame and never answers, or fails sends when ``broken``."""
+
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self.broken = False
+
+    async def send(self, payload: str | bytes) -> None:
+        if self.broken:
+            raise RuntimeError("socket broke")
+        self.sent.append(json.loads(payload))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "SilentEngineWebSocket":
+        return self
+
+    async def __anext__(self) -> Any:
+        await asyncio.Event().wait()
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch):
+    ws = SilentEngineWebSocket()
+
+    async def fake_connect(_: str) -> SilentEngineWebSocket:
+        return ws
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    c = III("ws://fake", InitOptions(invocation_timeout_ms=50))
+    c._wait_until_connected()
+    yield c
+    c.shutdown()
+
+
+def test_concurrent_calls_time_out_together_without_leaking(client: Any) -> None:
+    async def fan_out() -> list[Any]:
+        calls = [client._async_trigger({"function_id": "slow", "payload": i}) for i in range(500)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = client._run_on_loop(fan_out())
+
+    assert all(isinstance(r, TimeoutError) and "50ms" in str(r) for r in results)
+    stats = client.get_runtime_stats()
+    assert stats["pending_invocations"] == 0
+    assert stats["timeouts"]["scheduled"] == 0
+    assert stats["timeouts"]["expired_total"] == 500
+
+
+def test_late_result_after_timeout_is_ignored(client: Any) -> None:
+    with pytest.raises(TimeoutError):
+        client.trigger({"function_id": "slow", "payload": None})
+    invocation_id = client._ws.sent[-1]["invocation_id"]
+
+    late = {"type": "invocationresult", "invocation_id": invocation_id, "function_id": "slow", "result": 1}
+    client._run_on_loop(client._handle_message(json.dumps(late)))
+
+    assert client.get_runtime_stats()["pending_invocations"] == 0
+
+
+def test_failed_send_and_cancellation_release_bookkeeping(client: Any) -> None:
+    client._ws.broken = True
+    with pytest.raises(RuntimeError, match="socket broke"):
+        client.trigger({"function_id": "f", "payload": None})
+    client._ws.broken = False
+
+    async def cancel_midway() -> None:
+        task = asyncio.create_task(client._async_trigger({"function_id": "f", "payload": None, "timeout_ms": 10_000}))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    client._run_on_loop(cancel_midway())
+
+    assert client._pending == {}
+    assert client.get_runtime_stats()["timeouts"]["scheduled"] == 0
@@ -0,0 +1,190 @@
+"""Tests for ``trigger_many`` batch invocation."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+import iii.iii as iii_module
+from iii import InitOptions, TriggerOutcome
+from iii.iii import III
+from iii.iii_types import TriggerRequest
+
+
+class ScriptedEngineWebSocket:
+    """Fake engine that answers invocations after ``payload["delay"]`` seconds.
+
+    Payloads with ``"fail"`` produce an error result and ``"hang"`` never get
+    a reply.  ``max_outstanding`` records the peak number of unanswered calls.
+    """
+
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.state = SimpleNamespace(name="OPEN")
+        self.outstanding = 0
+        self.max_outstanding = 0
+        self._inbox: asyncio.Queue[str] | None = None
+
+    def _queue(self) -> asyncio.Queue[str]:
+        if self._inbox is None:
+            self._inbox = asyncio.Queue()
+        return self._inbox
+
+    async def send(self, payload: str | bytes) -> None:
+        msg = json.loads(payload)
+        self.sent.append(msg)
+        if msg.get("type") != "invokefunction" or not msg.get("invocation_id"):
+            return
+        data = msg.get("data") or {}
+        if data.get("hang"):
+            return
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        asyncio.get_running_loop().call_later(data.get("delay", 0), self._reply, msg, data)
+
+    def _reply(self, msg: dict[str, Any], data: dict[str, Any]) -> None:
+        self.outstanding -= 1
+        result: dict[str, Any] = {
+            "type": "invocationresult",
+            "invocation_id": msg["invocation_id"],
+            "function_id": msg["function_id"],
+        }
+        if data.get("fail"):
+            result["error"] = {"code": "boom", "message": f"failed {data['n']}"}
+        else:
+            result["result"] = data["n"] * 10
+        self._queue().put_nowait(json.dumps(result))
+
+    async def close(self) -> None:
+        self.state = SimpleNamespace(name="CLOSED")
+
+    def __aiter__(self) -> "ScriptedEngineWebSocket":
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self._queue().get()
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch):
+    ws = ScriptedEngineWebSocket()
+
+    async def fake_connect(_: str) -> ScriptedEngineWebSocket:
+        return ws
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+
+    c = III("ws://fake", InitOptions())
+    c._wait_until_connected()
+    yield c
+    c.shutdown()
+
+
+def _req(n: int, **data: Any) -> dict[str, Any]:
+    return {"function_id": "work", "payload": {"n": n, **data}}
+
+
+def test_results_are_returned_in_input_order(client: Any) -> None:
+    requests = [_req(i, delay=(5 - i) * 0.01) for i in range(5)]
+
+    outcomes = client.trigger_many(requests)
+
+    assert [o.index for o in outcomes] == [0, 1, 2, 3, 4]
+    assert [o.result for o in outcomes] == [0, 10, 20, 30, 40]
+    assert all(o.ok and o.function_id == "work" for o in outcomes)
+    assert client._pending == {}
+
+
+def test_unordered_results_arrive_in_completion_order(client: Any) -> None:
+    outcomes = client.trigger_many([_req(0, delay=0.05), _req(1, delay=0.0)], ordered=False)
+
+    assert [o.index for o in outcomes] == [1, 0]
+
+
+def test_max_concurrency_bounds_outstanding_invocations(client: Any) -> None:
+    outcomes = client.trigger_many([_req(i, delay=0.01) for i in range(12)], max_concurrency=3)
+
+    assert len(outcomes) == 12
+    assert client._ws.max_outstanding == 3
+
+
+def test_failures_and_timeouts_are_recorded_per_request(client: Any) -> None:
+    requests = [
+        _req(0),
+        _req(1, fail=True),
+        TriggerRequest(function_id="work", payload={"n": 2, "hang": True}, timeout_ms=50),
+        _req(3, hang=True),
+    ]
+
+    outcomes = client.trigger_many(requests, timeout_ms=80)
+
+    assert outcomes[0] == TriggerOutcome(0, "work", result=0)
+    assert "failed 1" in str(outcomes[1].error)
+    assert isinstance(outcomes[2].error, TimeoutError)
+    assert "50ms" in str(outcomes[2].error)
+    assert isinstance(outcomes[3].error, TimeoutError)
+    assert "80ms" in str(outcomes[3].error)
+    assert client._pending == {}
+
+
+def test_fail_fast_raises_first_error_and_cancels_the_rest(client: Any) -> None:
+    requests = [_req(0, fail=True)] + [_req(i, hang=True) for i in range(1, 4)] + [_req(9)]
+
+    with pytest.raises(Exception, match="failed 0"):
+        client.trigger_many(requests, max_concurrency=4, fail_fast=True, timeout_ms=10_000)
+
+    sent_ns = [m["data"]["n"] for m in client._ws.sent if m.get("type") == "invokefunction"]
+    assert 9 not in sent_ns
+    assert client._pending == {}
+
+
+def test_cancelled_call_is_recorded_and_the_batch_completes(monkeypatch: pytest.MonkeyPatch) -> None:
+    ws = ScriptedEngineWebSocket()
+
+    async def fake_connect(_: str) -> ScriptedEngineWebSocket:
+        return ws
+
+    monkeypatch.setattr(iii_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr("iii.telemetry.init_otel", lambda **kwargs: None)
+    monkeypatch.setattr("iii.telemetry.attach_event_loop", lambda loop: None)
+    monkeypatch.setattr(iii_module.III, "_register_worker_metadata", lambda self: None)
+    client = III("ws://fake", InitOptions(local_dispatch=True))
+    client._wait_until_connected()
+
+    async def cancelled(data: Any) -> Any:
+        asyncio.current_task().cancel()  # type: ignore[union-attr]
+        await asyncio.sleep(0)
+
+    client.register_function({"id": "cancelled"}, cancelled)
+
+    async def main() -> list[TriggerOutcome]:
+        requests = [{"function_id": "cancelled", "payload": {}}, _req(1), _req(2)]
+        return await asyncio.wait_for(client.aio.trigger_many(requests, max_concurrency=1), 5)
+
+    try:
+        outcomes = asyncio.run(main())
+    finally:
+        client.shutdown()
+
+    assert isinstance(outcomes[0].error, asyncio.CancelledError)
+    assert [o.result for o in outcomes[1:]] == [10, 20]
+
+
+def test_aio_trigger_many_from_foreign_loop(client: Any) -> None:
+    async def main() -> list[TriggerOutcome]:
+        return await client.aio.trigger_many([_req(i) for i in range(4)], max_concurrency=2)
+
+    outcomes = asyncio.run(main())
+
+    assert [o.result for o in outcomes] == [0, 10, 20, 30]
+
+
+def test_empty_batch_returns_empty_list(client: Any) -> None:
+    assert client.trigger_many([]) == []
+    with pytest.raises(ValueError):
+        client.trigger_many([_req(0)], max_concurrency=0)
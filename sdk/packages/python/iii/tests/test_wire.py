@@ -0,0 +1,173 @@
+"""Tests for the plain-dict hot-path message builders."""
+
+import json
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import pytest
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.trace import TracerProvider
+
+import iii.wire as wire
+from iii import TriggerAction
+from iii.codec import resolve_codec
+from iii.iii import III
+from iii.iii_types import InvocationResultMessage, InvokeFunctionMessage, TriggerActionEnqueue, TriggerActionVoid
+from iii.wire import InvocationIdGenerator, invocation_result_message, invoke_function_message
+
+
+def _dump(model: Any) -> dict[str, Any]:
+    data: dict[str, Any] = model.model_dump(by_alias=True, exclude_none=True)
+    data["type"] = data["type"].value
+    return data
+
+
+def test_invocation_ids_are_unique_uuids_sharing_a_prefix() -> None:
+    next_id = InvocationIdGenerator()
+
+    ids = [next_id() for _ in range(1000)]
+
+    assert len(set(ids)) == 1000
+    assert all(str(uuid.UUID(i)) == i for i in ids)
+    assert len({i[:19] for i in ids}) == 1
+    assert InvocationIdGenerator()()[:19] != ids[0][:19]
+
+
+def test_invocation_id_counter_wraps_within_64_bits() -> None:
+    next_id = InvocationIdGenerator()
+    next_id._counter = iter([(1 << 64) - 1, 1 << 64])
+
+    assert next_id().endswith("-ffff-ffffffffffff")
+    assert next_id().endswith("-0000-000000000000")
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"function_id": "f", "data": None},
+        {"function_id": "f", "data": {"a": None}, "invocation_id": "id-1", "traceparent": "tp", "baggage": "b=1"},
+        {"function_id": "f", "data": [1], "action": TriggerActionVoid()},
+        {"function_id": "f", "data": 0, "invocation_id": "id-2", "action": TriggerActionEnqueue(queue="q")},
+    ],
+)
+def test_invoke_function_message_matches_model_dump(fields: dict[str, Any]) -> None:
+    built = invoke_function_message(**{**fields, "action": wire.action_dict(fields.get("action"))})
+
+    assert built == _dump(InvokeFunctionMessage(**fields))
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"result": {"ok": True}, "traceparent": "tp"},
+        {"result": None},
+        {"result": 0},
+        {"error": {"code": "invocation_failed", "message": "boom"}},
+    ],
+)
+def test_invocation_result_message_matches_model_dump(fields: dict[str, Any]) -> None:
+    built = invocation_result_message("id-1", "f", **fields)
+
+    assert built == _dump(InvocationResultMessage(invocation_id="id-1", function_id="f", **fields))
+
+
+@dataclass
+class Point:
+    x: int
+    tags: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Shape:
+    name: str
+    corners: list[Point]
+
+
+SHAPE = Shape("tri", [Point(0, ["a"]), Point(1)])
+SHAPE_DICT = {"name": "tri", "corners": [{"x": 0, "tags": ["a"]}, {"x": 1, "tags": []}]}
+
+
+@pytest.mark.parametrize("codec", ["json", "orjson", "msgspec"])
+def test_dataclass_results_and_payloads_encode_as_dicts(codec: str) -> None:
+    encode = resolve_codec(codec).encode
+
+    result = json.loads(encode(invocation_result_message("1", "f", result=SHAPE)))
+    payload = json.loads(encode(invoke_function_message("f", {"shape": SHAPE}, invocation_id="2")))
+
+    assert result["result"] == SHAPE_DICT
+    assert payload["data"] == {"shape": SHAPE_DICT}
+
+
+@pytest.fixture
+def client(fake_client: Callable[..., III]):
+    return fake_client()
+
+
+def test_trigger_injects_trace_context_once_per_call(client: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    injections = 0
+    real_inject = propagate.inject
+
+    def counting_inject(*args: Any, **kwargs: Any) -> None:
+        nonlocal injections
+        injections += 1
+        real_inject(*args, **kwargs)
+
+    monkeypatch.setattr(wire._otel_propagate, "inject", counting_inject)
+    tracer = TracerProvider().get_tracer("test")
+
+    async def send_in_span() -> None:
+        with trace.use_span(tracer.start_span("caller"), end_on_exit=True):
+            await client._async_trigger({"function_id": "notify", "payload": {}, "action": TriggerAction.Void()})
+
+    client._run_on_loop(send_in_span())
+
+    assert injections == 1
+    (msg,) = client._ws.sent
+    assert msg["type"] == "invokefunction"
+    assert msg["action"] == {"type": "void"}
+    assert msg["traceparent"].startswith("00-")
+    assert "invocation_id" not in msg
+
+
+def test_enqueue_trigger_sends_generated_invocation_id(client: Any) -> None:
+    async def enqueue() -> None:
+        request = {"function_id": "work", "payload": 1, "action": TriggerAction.Enqueue(queue="jobs"), "timeout_ms": 20}
+        with pytest.raises(TimeoutError):
+            await client._async_trigger(request)
+
+    client._run_on_loop(enqueue())
+
+    (msg,) = client._ws.sent
+    assert msg["action"] == {"type": "enqueue", "queue": "jobs"}
+    assert uuid.UUID(msg["invocation_id"])
+    assert client._pending == {}
+
+
+def _wait_for_sent(client: Any, msg_type: str) -> dict[str, Any]:
+    deadline = time.monotonic() + 5
+    while True:
+        for msg in client._ws.sent:
+            if msg["type"] == msg_type:
+                return msg  # type: ignore[no-any-return]
+        assert time.monotonic() < deadline, f"no {msg_type} sent"
+        time.sleep(0.005)
+
+
+def test_handler_returning_a_dataclass_succeeds(client: Any) -> None:
+    client.register_function({"id": "shapes.get"}, lambda data: SHAPE)
+
+    invoke = {"invocation_id": "inv-1", "function_id": "shapes.get", "data": {}}
+    client._run_on_loop(client._handle_message(json.dumps({"type": "invokefunction", **invoke})))
+    msg = _wait_for_sent(client, "invocationresult")
+
+    assert "error" not in msg
+    assert msg["result"] == SHAPE_DICT
+
+
+def test_dataclass_trigger_payload_is_sent_as_dict(client: Any) -> None:
+    client.trigger({"function_id": "shapes.put", "payload": SHAPE, "action": TriggerAction.Void()})
+
+    assert _wait_for_sent(client, "invokefunction")["data"] == SHAPE_DICT